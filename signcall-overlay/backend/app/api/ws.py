@@ -1,57 +1,197 @@
+import asyncio
+import functools
+import json
 import logging
+import time
 
 from fastapi import APIRouter, WebSocket, WebSocketDisconnect
 
-from app.schemas.messages import FrameIn, CorrectionIn
-from app.cv.preprocess import b64jpeg_to_bgr
-from app.pipeline.orchestrator import process_frame
-from app.nlp.profile import get_profile, apply_correction
+from app.schemas.messages import ConfigIn, FrameIn, CorrectionIn, HelloIn, LandmarksIn
+from app.schemas import binary
+from app.cv.preprocess import b64jpeg_to_bgr, jpeg_to_bgr
+from app.cv.types import LandmarkFrame
+from app import metrics
+from app.pipeline.orchestrator import (
+    configure_session, process_frame, process_landmarks, get_session, release_session,
+)
+from app.pipeline.executor import run_stage
+from app.pipeline.ingest import FrameIngest, PendingFrame
+from app.pipeline.session import session_key
+from app.nlp.profile import apply_correction
 
 logger = logging.getLogger(__name__)
 router = APIRouter()
 
 
+async def _receive(ws: WebSocket):
+    """Receive one message: ``bytes`` for binary frames, ``dict`` for JSON."""
+    message = await ws.receive()
+    if message["type"] == "websocket.disconnect":
+        raise WebSocketDisconnect(message.get("code", 1000))
+    if message.get("bytes") is not None:
+        return message["bytes"]
+    return json.loads(message["text"])
+
+
+def _binary_to_landmarks(payload, ts: int) -> LandmarkFrame:
+    # The decoded float32 views are copied straight into the frame's block
+    hands, handedness, pose = binary.decode_landmarks(payload)
+    return LandmarkFrame(ts=ts, hands=hands, handedness=handedness, pose=pose)
+
+
+def _json_to_landmarks(msg: LandmarksIn) -> LandmarkFrame:
+    return LandmarkFrame(
+        ts=msg.ts,
+        hands=msg.hands or None,
+        handedness=msg.handedness or None,
+        pose=msg.pose,
+    )
+
+
+async def _process_frames(
+    ws: WebSocket, ingest: FrameIngest, send_lock: asyncio.Lock, keys: set
+):
+    """Consumer task: decode + process the newest pending frame, forever."""
+    while True:
+        frame = await ingest.get()
+        keys.add(session_key(frame.session, frame.user))
+        try:
+            if frame.kind == "landmarks":
+                # Client ran MediaPipe – no image decode / vision stage
+                caption = await process_landmarks(
+                    frame.session, frame.user, frame.decode(frame.data),
+                    frame.ts, style=frame.style,
+                )
+            else:
+                t0 = time.perf_counter()
+                img = await run_stage("decode", frame.decode, frame.data)
+                metrics.DECODE_LATENCY.observe(time.perf_counter() - t0)
+                if img is None:
+                    continue
+                caption = await process_frame(
+                    frame.session, frame.user, img, frame.ts, style=frame.style
+                )
+            if caption:
+                async with send_lock:
+                    await ws.send_json(caption)
+        except WebSocketDisconnect:
+            return
+        except Exception:
+            # Never let a single bad frame kill the connection
+            logger.exception("Error processing frame – skipping")
+
+
 @router.websocket("/ws")
 async def ws_endpoint(ws: WebSocket):
     await ws.accept()
     logger.info("WebSocket connected")
+
+    ingest = FrameIngest()
+    send_lock = asyncio.Lock()
+    keys: set = set()   # session:user pairs fed by this connection
+    consumer = asyncio.create_task(_process_frames(ws, ingest, send_lock, keys))
     try:
         while True:
-            data = await ws.receive_json()
+            data = await _receive(ws)
+
+            # ── Binary message (binary-v1): header + JPEG or landmark payload ──
+            if isinstance(data, bytes):
+                try:
+                    msg = binary.decode_message(data)
+                    if msg.kind == binary.KIND_FRAME:
+                        ingest.put(PendingFrame(
+                            msg.session, msg.user, msg.ts, msg.style,
+                            msg.payload, jpeg_to_bgr,
+                        ))
+                    elif msg.kind == binary.KIND_LANDMARKS:
+                        ingest.put(PendingFrame(
+                            msg.session, msg.user, msg.ts, msg.style, msg.payload,
+                            functools.partial(_binary_to_landmarks, ts=msg.ts),
+                            kind="landmarks",
+                        ))
+                    else:
+                        logger.warning("Unknown binary message kind %d – skipping", msg.kind)
+                except Exception:
+                    logger.exception("Error processing binary frame – skipping")
+                continue
+
             msg_type = data.get("type")
 
-            if msg_type == "frame":
+            if msg_type == "hello":
+                # Protocol negotiation: old clients never send this and
+                # keep using JSON frames.
                 try:
-                    frame_in = FrameIn(**data)
-                    img = b64jpeg_to_bgr(frame_in.image_jpeg_b64)
-                    if img is None:
-                        continue
-                    caption = await process_frame(
-                        frame_in.session, frame_in.user, img, frame_in.ts,
-                        style=frame_in.style
+                    hello = HelloIn(**data)
+                    protocol = (
+                        binary.PROTOCOL_NAME
+                        if binary.PROTOCOL_NAME in hello.protocols
+                        else "json"
                     )
-                    if caption:
-                        await ws.send_json(caption)
+                    async with send_lock:
+                        await ws.send_json({"type": "hello", "protocol": protocol})
+                    logger.info("Negotiated frame protocol: %s", protocol)
+                except Exception:
+                    logger.exception("Error processing hello – skipping")
+
+            elif msg_type == "frame":
+                try:
+                    frame_in = FrameIn(**data)
+                    ingest.put(PendingFrame(
+                        frame_in.session, frame_in.user, frame_in.ts, frame_in.style,
+                        frame_in.image_jpeg_b64, b64jpeg_to_bgr,
+                    ))
                 except Exception:
-                    # Never let a single bad frame kill the connection
                     logger.exception("Error processing frame – skipping")
 
+            elif msg_type == "landmarks":
+                try:
+                    lm_in = LandmarksIn(**data)
+                    ingest.put(PendingFrame(
+                        lm_in.session, lm_in.user, lm_in.ts, lm_in.style,
+                        lm_in, _json_to_landmarks, kind="landmarks",
+                    ))
+                except Exception:
+                    logger.exception("Error processing landmarks – skipping")
+
+            elif msg_type == "config":
+                try:
+                    cfg = ConfigIn(**data)
+                    keys.add(session_key(cfg.session, cfg.user))
+                    applied = configure_session(cfg.session, cfg.user, cfg.landmark_mode)
+                    async with send_lock:
+                        await ws.send_json({
+                            "type": "config", "session": cfg.session, "user": cfg.user, **applied,
+                        })
+                except Exception:
+                    logger.exception("Error processing config – skipping")
+
             elif msg_type == "correction":
                 try:
                     corr = CorrectionIn(**data)
-                    profile = get_profile(corr.session, corr.user)
+                    keys.add(session_key(corr.session, corr.user))
+                    profile = get_session(corr.session, corr.user).profile
                     apply_correction(profile, corr.incorrect_token, corr.correct_token)
-                    await ws.send_json({
-                        "type": "caption",
-                        "session": corr.session,
-                        "user": corr.user,
-                        "ts": corr.ts,
-                        "caption": f"Noted correction: {corr.correct_token}",
-                        "confidence": 1.0,
-                        "mode": "template",
-                    })
+                    async with send_lock:
+                        await ws.send_json({
+                            "type": "caption",
+                            "session": corr.session,
+                            "user": corr.user,
+                            "ts": corr.ts,
+                            "caption": f"Noted correction: {corr.correct_token}",
+                            "confidence": 1.0,
+                            "mode": "template",
+                        })
                 except Exception:
                     logger.exception("Error processing correction – skipping")
 
     except WebSocketDisconnect:
         logger.info("WebSocket disconnected")
+    finally:
+        consumer.cancel()
+        for key in keys:
+            release_session(key)
+        logger.info(
+            "Frames received=%d processed=%d dropped_overflow=%d dropped_stale=%d",
+            ingest.stats["received"], ingest.stats["processed"],
+            ingest.stats["dropped_overflow"], ingest.stats["dropped_stale"],
+        )
@@ -0,0 +1,135 @@
+"""Which MediaPipe models run: declared landmark dependencies + modes.
+
+Landmark consumers declare the groups (and pose keypoints) they read:
+
+    landmark_stages.require("classifier", "hands", "pose",
+                            keypoints={"pose": (L_SHOULDER, R_SHOULDER)})
+
+and ``extract_landmarks`` only runs the models for the groups of the
+active mode; the fields of disabled groups stay None.
+
+    auto             union of the declared requirements (default)
+    hands            Hands only
+    hands+shoulders  Hands + Pose (consumers only read the shoulders)
+    full             Hands + Pose + FaceMesh
+
+The deployment default is ``LANDMARK_MODE``; a session can override it
+(``config`` WebSocket message).  Modes are resolved to a frozenset of
+groups once per session by the orchestrator.
+
+``LANDMARK_RATES`` (opt-in, e.g. ``"pose=3,face=3"``) runs Pose / FaceMesh
+on every Nth frame of a session only; ``rates()`` parses it.  Hands always
+run on every frame.
+"""
+
+from __future__ import annotations
+
+import logging
+from typing import Dict, FrozenSet, Iterable, Optional, Sequence, Set
+
+from app import settings
+
+logger = logging.getLogger(__name__)
+
+GROUPS = ("hands", "pose", "face")
+
+MODES: Dict[str, FrozenSet[str]] = {
+    "hands": frozenset({"hands"}),
+    "hands+shoulders": frozenset({"hands", "pose"}),
+    "full": frozenset(GROUPS),
+}
+
+# consumer → groups / keypoints it reads
+_groups: Dict[str, FrozenSet[str]] = {}
+_keypoints: Dict[str, Dict[str, Sequence[int]]] = {}
+_warned: Set[str] = set()
+_rates: Optional[Dict[str, int]] = None
+
+
+def require(
+    consumer: str, *groups: str, keypoints: Optional[Dict[str, Sequence[int]]] = None
+) -> None:
+    """Declare that *consumer* reads *groups* (optionally only *keypoints*)."""
+    unknown = set(groups) - set(GROUPS)
+    if unknown:
+        raise ValueError(f"unknown landmark group(s): {', '.join(sorted(unknown))}")
+    _groups[consumer] = frozenset(groups)
+    _keypoints[consumer] = dict(keypoints or {})
+
+
+def required_groups() -> FrozenSet[str]:
+    """Union of every consumer's groups (hands are always extracted)."""
+    out: Set[str] = {"hands"}
+    for groups in _groups.values():
+        out |= groups
+    return frozenset(out)
+
+
+def required_keypoints(group: str) -> Optional[FrozenSet[int]]:
+    """Keypoints of *group* that consumers read (None = all of them)."""
+    points: Set[int] = set()
+    for consumer, groups in _groups.items():
+        if group not in groups:
+            continue
+        wanted = _keypoints[consumer].get(group)
+        if wanted is None:
+            return None
+        points.update(wanted)
+    return frozenset(points)
+
+
+def resolve(mode: Optional[str] = None) -> FrozenSet[str]:
+    """Groups to extract for *mode* (default: ``LANDMARK_MODE``)."""
+    mode = (mode or settings.LANDMARK_MODE).strip().lower()
+    if mode == "auto":
+        return required_groups()
+    groups = MODES.get(mode)
+    if groups is None:
+        if mode not in _warned:
+            _warned.add(mode)
+            logger.warning("Unknown landmark mode %r – using 'full'", mode)
+        return MODES["full"]
+    missing = required_groups() - groups
+    if missing:
+        logger.debug("Landmark mode %s skips %s read by consumers", mode, sorted(missing))
+    return groups
+
+
+def parse_rates(spec: str) -> Dict[str, int]:
+    """``"pose=3,face=3"`` → ``{"pose": 3, "face": 3}`` (bad entries are ignored)."""
+    rates: Dict[str, int] = {}
+    for part in spec.split(","):
+        part = part.strip()
+        if not part:
+            continue
+        group, _, value = part.partition("=")
+        group = group.strip().lower()
+        try:
+            rate = int(value)
+        except ValueError:
+            rate = 0
+        if group not in GROUPS or rate < 1:
+            logger.warning("Ignoring bad LANDMARK_RATES entry %r", part)
+        elif group == "hands" and rate > 1:
+            logger.warning("LANDMARK_RATES: hands always run on every frame")
+        else:
+            rates[group] = rate
+    return rates
+
+
+def rates() -> Dict[str, int]:
+    """Frame interval per group from ``LANDMARK_RATES`` (missing = 1)."""
+    global _rates
+    if _rates is None:
+        _rates = parse_rates(settings.LANDMARK_RATES)
+    return _rates
+
+
+def describe(groups: Iterable[str]) -> str:
+    """``"hands+pose[11,12]"``-style summary for logs."""
+    parts = []
+    for g in GROUPS:
+        if g in groups:
+            pts = required_keypoints(g) if g != "hands" else None
+            parts.append(f"{g}{sorted(pts)}" if pts else g)
+    return "+".join(parts)
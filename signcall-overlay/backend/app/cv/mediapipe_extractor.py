@@ -1,24 +1,43 @@
 """MediaPipe landmark extraction  –  Member 2 owns this file.
 
 Extracts hand, pose, and face landmarks from BGR video frames using the
-MediaPipe *legacy solutions* API.  If MediaPipe is unavailable (wrong Python
-version etc.) the module degrades gracefully and returns empty landmarks.
+MediaPipe *legacy solutions* API.  Only the models for the landmark groups
+of the active mode run (``cv.landmark_stages``); the others are skipped
+and their ``LandmarkFrame`` fields stay None.  With
+``LANDMARK_THREADS`` > 1 the enabled models run concurrently on the same
+read-only RGB image, so a frame costs the slowest model instead of the
+sum of all of them.  Slow-changing groups (Pose, FaceMesh) can run on
+every Nth frame only (``LANDMARK_RATES``); frames in between reuse or
+extrapolate the last estimates and are flagged not fresh.  With
+``HAND_ROI`` Hands runs on padded crops around the previous frame's
+hands / pose wrists and falls back to the full frame when they find
+nothing.  If MediaPipe is unavailable (wrong Python version etc.) the
+module degrades gracefully and returns empty landmarks.
 
 All per-frame MediaPipe calls are wrapped in try/except so a single bad
 frame can never crash the WebSocket loop.
 """
 
-from typing import List, Optional, Tuple
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor, wait
+from contextlib import contextmanager
+from typing import Callable, Deque, Dict, FrozenSet, Iterator, List, Optional, Tuple
 
 import cv2
 import logging
+import threading
+import time
 
+import numpy as np
+
+from app import metrics, resources, settings
+from app.cv import landmark_stages
 from app.cv.types import LandmarkFrame
 
 logger = logging.getLogger(__name__)
 
 # ---------------------------------------------------------------------------
-# MediaPipe initialisation (one-time, at import)
+# MediaPipe availability (one-time, at import)
 # ---------------------------------------------------------------------------
 try:
     import mediapipe as mp  # type: ignore
@@ -30,95 +49,564 @@ except Exception:  # ImportError or other issues on unsupported Python
 
 
 if HAS_MEDIAPIPE:
-    _mp_hands = mp.solutions.hands
-    _mp_pose = mp.solutions.pose
-    _mp_face = mp.solutions.face_mesh
+    logger.info("MediaPipe solutions loaded successfully.")
+else:
+    logger.warning(
+        "MediaPipe is not fully available (no 'solutions'); "
+        "CV extraction will return empty landmarks. "
+        "Use Python 3.10 / 3.11 and 'pip install mediapipe' to fix this."
+    )
 
-    _hands = _mp_hands.Hands(
+
+# ---------------------------------------------------------------------------
+# Extractor instances + per-session pool
+# ---------------------------------------------------------------------------
+_GRAPH_FACTORIES: Dict[str, Callable] = {
+    "hands": lambda: mp.solutions.hands.Hands(
         static_image_mode=False,
         max_num_hands=2,
         min_detection_confidence=0.5,
         min_tracking_confidence=0.5,
-    )
-
-    _pose = _mp_pose.Pose(
+    ),
+    # HAND_ROI: one tracking graph per hand slot, fed that hand's crop
+    **{
+        name: lambda: mp.solutions.hands.Hands(
+            static_image_mode=False,
+            max_num_hands=1,
+            min_detection_confidence=0.5,
+            min_tracking_confidence=0.5,
+        )
+        for name in ("hands_roi_0", "hands_roi_1")
+    },
+    "pose": lambda: mp.solutions.pose.Pose(
         static_image_mode=False,
         model_complexity=1,
         enable_segmentation=False,
         min_detection_confidence=0.5,
         min_tracking_confidence=0.5,
-    )
-
-    _face = _mp_face.FaceMesh(
+    ),
+    "face": lambda: mp.solutions.face_mesh.FaceMesh(
         static_image_mode=False,
         max_num_faces=1,
         refine_landmarks=False,
         min_detection_confidence=0.5,
         min_tracking_confidence=0.5,
-    )
-    logger.info("MediaPipe solutions loaded successfully.")
-else:
-    _hands = None
-    _pose = None
-    _face = None
-    logger.warning(
-        "MediaPipe is not fully available (no 'solutions'); "
-        "CV extraction will return empty landmarks. "
-        "Use Python 3.10 / 3.11 and 'pip install mediapipe' to fix this."
-    )
+    ),
+}
+
+
+class Extractor:
+    """One set of Hands / Pose / FaceMesh graphs, i.e. one tracking stream.
+
+    With ``static_image_mode=False`` each graph tracks from the previous
+    frame, so an extractor must only ever see one session's frames in
+    order (``ExtractorPool`` guarantees that) and is reset before it is
+    handed to another session.  Graphs are built on first use, so a
+    model no mode enables (FaceMesh by default) is never loaded.
+
+    ``threads`` is the extractor's own small thread group for running its
+    models in parallel (created on first parallel frame).  It only ever
+    serves this extractor, so the pool's one-session-at-a-time guarantee
+    still covers every graph.
+
+    ``frame_no`` / ``history`` drive ``LANDMARK_RATES``: the frame index of
+    this stream and the last two measurements of each rate-limited group.
+    ``roi_source`` holds the previous frame's (hands, pose) for ``HAND_ROI``,
+    ``roi_slots`` the crop centre each ROI graph is tracking (None = idle)
+    and ``roi_backoff`` the full-frame frames left after a miss.
+    """
+
+    __slots__ = ("_graphs", "_threads", "frame_no", "history", "roi_source", "roi_slots",
+                 "roi_backoff", "owner", "busy", "needs_reset")
+
+    def __init__(self):
+        self._graphs: Dict[str, object] = {}
+        self._threads: Optional[ThreadPoolExecutor] = None
+        self.frame_no = 0
+        self.history: Dict[str, Deque[Tuple[int, Optional[np.ndarray]]]] = {}
+        self.roi_source: Tuple[Optional[np.ndarray], Optional[np.ndarray]] = (None, None)
+        self.roi_slots: List[Optional[np.ndarray]] = [None, None]
+        self.roi_backoff = 0
+        self.owner: Optional[str] = None   # session key (pool bookkeeping)
+        self.busy = False
+        self.needs_reset = False
+
+    def graph(self, group: str):
+        g = self._graphs.get(group)
+        if g is None:
+            g = self._graphs[group] = _GRAPH_FACTORIES[group]()
+        return g
+
+    def threads(self) -> ThreadPoolExecutor:
+        if self._threads is None:
+            # The calling thread runs one model itself
+            self._threads = ThreadPoolExecutor(
+                max_workers=len(landmark_stages.GROUPS) - 1, thread_name_prefix="mp-model"
+            )
+        return self._threads
+
+    def stop_threads(self) -> None:
+        """Shut down the model thread group (recreated on next use)."""
+        if self._threads is not None:
+            self._threads.shutdown(wait=False)
+            self._threads = None
+
+    def reset(self) -> None:
+        """Drop all tracking state (graphs restart on the next frame)."""
+        for graph in self._graphs.values():
+            graph.reset()
+        self.stop_threads()
+        self.frame_no = 0
+        self.history.clear()
+        self.roi_source = (None, None)
+        self.roi_slots = [None, None]
+        self.roi_backoff = 0
+        self.needs_reset = False
+
+
+class ExtractorPool:
+    """Bounded pool of ``Extractor``s checked out per session.
+
+    A session keeps the same extractor across frames (tracking
+    continuity) and its frames are serialised on it; different sessions
+    run on different extractors concurrently.  Extractors are created on
+    demand up to *capacity*; past that a new session takes the
+    least-recently-used idle one, which is reset first so no tracking
+    state crosses sessions.  If every extractor is busy, the caller
+    waits.
+    """
+
+    def __init__(self, capacity: int, factory: Callable[[], Extractor] = Extractor):
+        self.capacity = max(1, capacity)
+        self._factory = factory
+        self._owners: "OrderedDict[str, Extractor]" = OrderedDict()   # LRU order
+        self._free: List[Extractor] = []      # idle, no owner
+        self._creating: set = set()           # keys whose extractor is being built
+        self._created = 0
+        self._cond = threading.Condition()
+
+    def __len__(self) -> int:
+        return self._created
+
+    def _assign(self, key: str, ext: Extractor) -> Extractor:
+        self._owners[key] = ext
+        ext.owner = key
+        ext.busy = True
+        return ext
+
+    def _steal_lru(self) -> Optional[Extractor]:
+        for owner, ext in self._owners.items():
+            if not ext.busy:
+                del self._owners[owner]
+                ext.needs_reset = True
+                logger.debug("Extractor reassigned from %s", owner)
+                return ext
+        return None
+
+    def _acquire(self, key: str) -> Extractor:
+        with self._cond:
+            while True:
+                ext = self._owners.get(key)
+                if ext is not None:
+                    if not ext.busy:
+                        self._owners.move_to_end(key)
+                        metrics.EXTRACTOR_HIT.inc()
+                        return self._assign(key, ext)
+                elif key in self._creating:
+                    pass
+                elif self._free:
+                    metrics.EXTRACTOR_FREE.inc()
+                    return self._assign(key, self._free.pop())
+                elif self._created < self.capacity:
+                    self._created += 1
+                    self._creating.add(key)
+                    break
+                else:
+                    ext = self._steal_lru()
+                    if ext is not None:
+                        metrics.EXTRACTOR_REASSIGNED.inc()
+                        return self._assign(key, ext)
+                self._cond.wait()
+
+        # Building the graphs takes ~0.3 s – outside the lock
+        try:
+            ext = self._factory()
+        except BaseException:
+            with self._cond:
+                self._created -= 1
+                self._creating.discard(key)
+                self._cond.notify_all()
+            raise
+        metrics.EXTRACTOR_CREATED.inc()
+        with self._cond:
+            self._creating.discard(key)
+            return self._assign(key, ext)
+
+    def _checkin(self, ext: Extractor) -> None:
+        with self._cond:
+            ext.busy = False
+            if ext.owner is None:          # session released while busy
+                ext.stop_threads()
+                self._free.append(ext)
+            self._cond.notify_all()
+
+    @contextmanager
+    def checkout(self, key: str) -> Iterator[Extractor]:
+        """Exclusive use of *key*'s extractor for one frame."""
+        ext = self._acquire(key)
+        try:
+            if ext.needs_reset:
+                ext.reset()
+            yield ext
+        finally:
+            self._checkin(ext)
+
+    def release(self, key: str) -> None:
+        """Session ended: its extractor becomes free (reset on next use).
+
+        Its model threads are shut down once no frame is using them.
+        Never blocks, so it is safe to call from the event loop.
+        """
+        with self._cond:
+            ext = self._owners.pop(key, None)
+            if ext is None:
+                return
+            ext.owner = None
+            ext.needs_reset = True
+            if not ext.busy:
+                ext.stop_threads()
+                self._free.append(ext)
+                self._cond.notify_all()
+
+    def stats(self) -> Dict[str, int]:
+        with self._cond:
+            return {
+                "capacity": self.capacity,
+                "created": self._created,
+                "sessions": len(self._owners),
+                "busy": sum(ext.busy for ext in self._owners.values()),
+            }
+
+
+_pool: Optional[ExtractorPool] = None
+_pool_lock = threading.Lock()
+DEFAULT_KEY = "_default"   # callers without a session (calibration, warm-up)
+
+
+def get_pool() -> ExtractorPool:
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = ExtractorPool(resources.get_plan().mediapipe_pool)
+                metrics.EXTRACTOR_POOL.set_function(lambda: len(_pool))
+                logger.info("MediaPipe extractor pool: up to %d instances", _pool.capacity)
+    return _pool
+
+
+def release(key: str) -> None:
+    """Return *key*'s extractor to the pool (session closed / evicted)."""
+    if _pool is not None:
+        _pool.release(key)
 
 
 # ---------------------------------------------------------------------------
 # Helpers
 # ---------------------------------------------------------------------------
-def _to_xyz_list(landmarks) -> List[List[float]]:
-    """Convert a MediaPipe NormalizedLandmarkList → [[x, y, z], ...]."""
-    return [[lm.x, lm.y, lm.z] for lm in landmarks]
+def _to_xyz_array(landmarks) -> np.ndarray:
+    """Convert a MediaPipe NormalizedLandmarkList → float32 array (N, 3)."""
+    return np.array([(lm.x, lm.y, lm.z) for lm in landmarks], dtype=np.float32)
 
 
-def _extract_hands(
-    image_rgb,
-) -> Tuple[Optional[List[List[List[float]]]], Optional[List[str]]]:
-    """Return (hands, handedness).  hands shape: [H][21][3]."""
-    if _hands is None:
-        return None, None
-    results = _hands.process(image_rgb)
+def _hands_result(results) -> Tuple[Optional[np.ndarray], Optional[List[str]]]:
     if not results.multi_hand_landmarks:
         return None, None
 
-    hands = [_to_xyz_list(hl.landmark) for hl in results.multi_hand_landmarks]
+    hands = np.stack([_to_xyz_array(hl.landmark) for hl in results.multi_hand_landmarks])
     # Handedness labels ("Left" / "Right") – useful for Member 3
     handedness: List[str] = []
     if results.multi_handedness:
         for h in results.multi_handedness:
             handedness.append(h.classification[0].label)
-    return hands or None, handedness or None
+    return hands, handedness or None
+
+
+# Pose keypoints of each hand: wrist, pinky, index, thumb (+ elbow for scale)
+_POSE_HAND_POINTS = ((15, 17, 19, 21), (16, 18, 20, 22))
+_POSE_ELBOWS = (13, 14)
+_ROI_MIN_PX = 64
+# One tracking graph per hand slot; frames of full-frame only after a miss
+_ROI_SLOTS = ("hands_roi_0", "hands_roi_1")
+_ROI_BACKOFF_FRAMES = 5
+
+
+def _hand_rois(
+    hands: Optional[np.ndarray], pose: Optional[np.ndarray], width: int, height: int
+) -> List[Tuple[int, int, int, int]]:
+    """Padded square crops ``(x0, y0, x1, y1)`` in pixels, one per hand (max 2).
+
+    Boxes come from the previous frame's hand landmarks, plus the pose
+    wrists that no hand box covers (a hand entering the frame).  Pose
+    boxes are at least a forearm wide.
+    """
+    scale = np.array([width, height], dtype=np.float32)
+    boxes = []   # (centre, side) in pixels
+    if hands is not None:
+        for pts in hands:
+            px = pts[:, :2] * scale
+            lo, hi = px.min(axis=0), px.max(axis=0)
+            boxes.append(((lo + hi) / 2, float((hi - lo).max())))
+    if pose is not None:
+        for points, elbow in zip(_POSE_HAND_POINTS, _POSE_ELBOWS):
+            px = pose[list(points), :2] * scale
+            wrist = px[0]
+            if not (0 <= wrist[0] < width and 0 <= wrist[1] < height):
+                continue
+            if any((np.abs(wrist - c) <= s / 2).all() for c, s in boxes):
+                continue
+            lo, hi = px.min(axis=0), px.max(axis=0)
+            forearm = float(np.linalg.norm(wrist - pose[elbow, :2] * scale))
+            boxes.append(((lo + hi) / 2, max(float((hi - lo).max()), forearm)))
 
+    rects = []
+    for centre, side in boxes[: len(_ROI_SLOTS)]:
+        half = max(side * (1 + 2 * settings.HAND_ROI_PADDING), _ROI_MIN_PX) / 2
+        x0, y0 = np.maximum(centre - half, 0).astype(int)
+        x1, y1 = np.minimum(centre + half, scale).astype(int)
+        if x1 - x0 >= _ROI_MIN_PX // 2 and y1 - y0 >= _ROI_MIN_PX // 2:
+            rects.append((int(x0), int(y0), int(x1), int(y1)))
+    return rects
 
-def _extract_pose(image_rgb) -> Optional[List[List[float]]]:
-    """Return pose landmarks shape [33][3] or None."""
-    if _pose is None:
+
+def _assign_slots(
+    previous: List[Optional[np.ndarray]], centres: List[np.ndarray]
+) -> List[int]:
+    """Slot per crop: nearest previous slot centre first, then free slots."""
+    slots: List[Optional[int]] = [None] * len(centres)
+    free = list(range(len(previous)))
+    pairs = sorted(
+        (float(np.linalg.norm(c - p)), i, s)
+        for i, c in enumerate(centres) for s, p in enumerate(previous) if p is not None
+    )
+    for _, i, s in pairs:
+        if slots[i] is None and s in free:
+            slots[i] = s
+            free.remove(s)
+    return [s if s is not None else free.pop(0) for s in slots]
+
+
+def _extract_hands_roi(
+    ext: Extractor, image_rgb,
+) -> Optional[Tuple[np.ndarray, Optional[List[str]]]]:
+    """Hands found in the ROI crops (full-frame coordinates), or None.
+
+    Each crop goes to its slot's tracking Hands graph: the crop follows
+    the hand, so the graph keeps tracking inside it and only re-detects
+    when it loses the hand.  Slots without a crop are reset.  After a
+    miss the next ``_ROI_BACKOFF_FRAMES`` frames use the full frame only,
+    so wrists with no visible hand don't pay for crops + fallback.
+    """
+    if ext.roi_backoff:
+        ext.roi_backoff -= 1
+        metrics.HAND_ROI["backoff"].inc()
         return None
-    results = _pose.process(image_rgb)
-    if not results.pose_landmarks:
+    height, width = image_rgb.shape[:2]
+    rects = _hand_rois(*ext.roi_source, width, height)
+    centres = [np.array([(x0 + x1) / 2, (y0 + y1) / 2]) for x0, y0, x1, y1 in rects]
+    slots = _assign_slots(ext.roi_slots, centres)
+    for s, name in enumerate(_ROI_SLOTS):
+        if s not in slots and ext.roi_slots[s] is not None:
+            ext.graph(name).reset()
+            ext.roi_slots[s] = None
+    if not rects:
+        metrics.HAND_ROI["none"].inc()
         return None
-    return _to_xyz_list(results.pose_landmarks.landmark) or None
 
+    found: List[np.ndarray] = []
+    labels: List[Optional[str]] = []
+    for (x0, y0, x1, y1), centre, s in zip(rects, centres, slots):
+        ext.roi_slots[s] = centre
+        crop = np.ascontiguousarray(image_rgb[y0:y1, x0:x1])
+        hands, handedness = _hands_result(ext.graph(_ROI_SLOTS[s]).process(crop))
+        if hands is None:
+            continue
+        # crop-normalised → frame-normalised (z is scaled like x)
+        pts = hands[0]
+        pts[:, 0] = (x0 + pts[:, 0] * (x1 - x0)) / width
+        pts[:, 1] = (y0 + pts[:, 1] * (y1 - y0)) / height
+        pts[:, 2] *= (x1 - x0) / width
+        # Overlapping crops can both lock onto the same hand
+        if any(np.abs(pts[0, :2] - f[0, :2]).max() < 0.02 for f in found):
+            continue
+        found.append(pts)
+        labels.append(handedness[0] if handedness else None)
+    if not found:
+        metrics.HAND_ROI["miss"].inc()
+        ext.roi_backoff = _ROI_BACKOFF_FRAMES
+        return None
+    metrics.HAND_ROI["hit"].inc()
+    return np.stack(found), (labels if None not in labels else None)
+
+
+def _extract_hands(
+    ext: Extractor, image_rgb,
+) -> Tuple[Optional[np.ndarray], Optional[List[str]]]:
+    """Return (hands, handedness).  hands shape: (H, 21, 3)."""
+    if settings.HAND_ROI:
+        found = _extract_hands_roi(ext, image_rgb)
+        if found is not None:
+            return found
+    return _hands_result(ext.graph("hands").process(image_rgb))
 
-def _extract_face(image_rgb) -> Optional[List[List[float]]]:
-    """Return face mesh shape [468][3] or None (first face only)."""
-    if _face is None:
+
+def _extract_pose(ext: Extractor, image_rgb) -> Optional[np.ndarray]:
+    """Return pose landmarks shape (33, 3) or None."""
+    results = ext.graph("pose").process(image_rgb)
+    if not results.pose_landmarks:
         return None
-    results = _face.process(image_rgb)
+    return _to_xyz_array(results.pose_landmarks.landmark)
+
+
+def _extract_face(ext: Extractor, image_rgb) -> Optional[np.ndarray]:
+    """Return face mesh shape (468, 3) or None (first face only)."""
+    results = ext.graph("face").process(image_rgb)
     if not results.multi_face_landmarks:
         return None
-    return _to_xyz_list(results.multi_face_landmarks[0].landmark) or None
+    return _to_xyz_array(results.multi_face_landmarks[0].landmark)
+
+
+_STAGES = (("hands", _extract_hands), ("pose", _extract_pose), ("face", _extract_face))
+
+# Running mean latency per model (s) – what skipping it saves.  Seeded by
+# warmup() so models a mode never runs still have a baseline.
+_model_mean_s: Dict[str, float] = {}
+
+
+def _baseline_latency(group: str, image_rgb, graph=None) -> Optional[float]:
+    """Seconds of one warm ``process`` call of *group*'s graph.
+
+    Without *graph* a throwaway graph is built and closed again, so a
+    disabled model is timed without staying loaded.
+    """
+    owned = graph is None
+    try:
+        if owned:
+            graph = _GRAPH_FACTORIES[group]()
+        graph.process(image_rgb)          # first call initialises the graph
+        t0 = time.perf_counter()
+        graph.process(image_rgb)
+        return time.perf_counter() - t0
+    except Exception:
+        logger.exception("MediaPipe %s baseline timing failed", group)
+        return None
+    finally:
+        if owned and graph is not None:
+            graph.close()
+
+
+def _observe_model(group: str, seconds: float) -> None:
+    metrics.LANDMARK_MODEL_LATENCY[group].observe(seconds)
+    mean = _model_mean_s.get(group)
+    _model_mean_s[group] = seconds if mean is None else mean + 0.05 * (seconds - mean)
+
+
+def _skip_model(group: str) -> None:
+    metrics.LANDMARK_MODEL_SKIPPED[group].inc()
+    mean = _model_mean_s.get(group)
+    if mean is not None:
+        metrics.LANDMARK_SKIPPED_SECONDS[group].inc(mean)
+
+
+def _reuse_model(group: str) -> None:
+    metrics.LANDMARK_MODEL_REUSED[group].inc()
+    mean = _model_mean_s.get(group)
+    if mean is not None:
+        metrics.LANDMARK_SKIPPED_SECONDS[group].inc(mean)
+
+
+def _is_due(ext: Extractor, group: str, rate: int) -> bool:
+    history = ext.history.get(group)
+    return rate <= 1 or not history or ext.frame_no - history[-1][0] >= rate
+
+
+def _fill(ext: Extractor, group: str) -> Optional[np.ndarray]:
+    """Estimate for a skipped frame: last value, or linear extrapolation."""
+    history = ext.history[group]
+    n1, x1 = history[-1]
+    if x1 is None:
+        return None
+    if settings.LANDMARK_FILL == "linear" and len(history) == 2 and history[0][1] is not None:
+        n0, x0 = history[0]
+        return x1 + (x1 - x0) * ((ext.frame_no - n1) / (n1 - n0))
+    return x1.copy()
+
+
+def _timed(fn, ext: Extractor, image_rgb) -> Tuple[object, float]:
+    t0 = time.perf_counter()
+    return fn(ext, image_rgb), time.perf_counter() - t0
+
+
+def _run_models(
+    ext: Extractor, image_rgb, groups: FrozenSet[str]
+) -> Tuple[Dict[str, object], FrozenSet[str]]:
+    """Run the enabled models on *image_rgb*.
+
+    Returns ``({group: result}, reused groups)``.  Groups not due under
+    ``LANDMARK_RATES`` are filled from the extractor's history instead.
+    Sequential, or – with ``LANDMARK_THREADS`` > 1 and several models
+    due – all but the first on the extractor's thread group while the
+    calling thread runs the first.  The slowest model of a parallel frame
+    is counted as its critical path.
+    """
+    ext.frame_no += 1
+    rates = landmark_stages.rates()
+    enabled, reused = [], []
+    for group, fn in _STAGES:
+        if group not in groups:
+            _skip_model(group)
+        elif _is_due(ext, group, rates.get(group, 1)):
+            enabled.append((group, fn))
+        else:
+            reused.append(group)
+
+    timings: Dict[str, Tuple[object, float]] = {}
+    if resources.get_plan().landmark_threads > 1 and len(enabled) > 1:
+        pool = ext.threads()
+        futures = [(g, pool.submit(_timed, fn, ext, image_rgb)) for g, fn in enabled[1:]]
+        try:
+            group, fn = enabled[0]
+            timings[group] = _timed(fn, ext, image_rgb)
+        finally:
+            # Never hand the extractor back while one of its graphs still runs
+            wait([f for _, f in futures])
+        for group, future in futures:
+            timings[group] = future.result()
+        slowest = max(timings, key=lambda g: timings[g][1])
+        metrics.LANDMARK_CRITICAL_PATH[slowest].inc()
+    else:
+        for group, fn in enabled:
+            timings[group] = _timed(fn, ext, image_rgb)
+
+    out: Dict[str, object] = {}
+    for group, (result, seconds) in timings.items():
+        _observe_model(group, seconds)
+        out[group] = result
+        if rates.get(group, 1) > 1:
+            ext.history.setdefault(group, deque(maxlen=2)).append((ext.frame_no, result))
+    for group in reused:
+        out[group] = _fill(ext, group)
+        _reuse_model(group)
+    if settings.HAND_ROI:
+        ext.roi_source = ((out.get("hands") or (None, None))[0], out.get("pose"))
+    return out, frozenset(reused)
 
 
 # ---------------------------------------------------------------------------
 # Public API  –  called by orchestrator; signature must not change
 # ---------------------------------------------------------------------------
-def extract_landmarks(frame_bgr, ts: int) -> LandmarkFrame:
+def extract_landmarks(
+    frame_bgr, ts: int, session: Optional[str] = None, groups: Optional[FrozenSet[str]] = None,
+) -> LandmarkFrame:
     """Run MediaPipe on a BGR frame and return a LandmarkFrame.
 
     Parameters
@@ -127,42 +615,110 @@ def extract_landmarks(frame_bgr, ts: int) -> LandmarkFrame:
         OpenCV-style BGR image (H × W × 3, uint8).
     ts : int
         Timestamp in ms from the frontend.
+    session : str, optional
+        Session key; frames of one session always go to the same pooled
+        extractor, so tracking continues across frames.
+    groups : frozenset, optional
+        Landmark groups to extract (``landmark_stages.resolve``); default
+        is the deployment's ``LANDMARK_MODE``.
 
     Returns
     -------
     LandmarkFrame
         Always returns a valid object (never raises).
     """
-    if frame_bgr is None:
+    if frame_bgr is None or not HAS_MEDIAPIPE:
         return LandmarkFrame(ts=ts)
 
     try:
         image_rgb = cv2.cvtColor(frame_bgr, cv2.COLOR_BGR2RGB)
         image_rgb.flags.writeable = False
 
-        hands, handedness = _extract_hands(image_rgb)
-        pose = _extract_pose(image_rgb)
-        face = _extract_face(image_rgb)
+        groups = landmark_stages.resolve() if groups is None else groups
+        with get_pool().checkout(session or DEFAULT_KEY) as ext:
+            out, reused = _run_models(ext, image_rgb, groups)
+        hands, handedness = out.get("hands") or (None, None)
+        pose = out.get("pose")
+        face = out.get("face")
 
         # ---- Quick sanity-check logging (Member 2 definition-of-done) ----
-        n_hands = len(hands) if hands else 0
+        n_hands = len(hands) if hands is not None else 0
         logger.debug(
             "ts=%d  hands_detected=%d  pose=%s  face=%s",
             ts,
             n_hands,
-            "yes" if pose else "no",
-            "yes" if face else "no",
+            "yes" if pose is not None else "no",
+            "yes" if face is not None else "no",
         )
 
-        return LandmarkFrame(
+        frame = LandmarkFrame(
             ts=ts,
             hands=hands,
             handedness=handedness,
             pose=pose,
             face=face,
         )
+        frame.pose_fresh = "pose" not in reused
+        frame.face_fresh = "face" not in reused
+        return frame
 
     except Exception:
         # A single bad frame must never kill the WS connection
         logger.exception("MediaPipe extraction failed for ts=%d – returning empty frame", ts)
         return LandmarkFrame(ts=ts)
+
+
+def warmup() -> Dict[str, float]:
+    """Run the default mode's MediaPipe graphs once on a blank frame.
+
+    Returns times in ms.  Creates the first pooled extractor; other
+    instances are created (and warmed by their first frame) on demand.
+    The extractor is released afterwards, so it is reset before the first
+    real session uses it.  Every model is also timed once (disabled ones
+    on a throwaway graph) to seed the skipped-time estimate.
+
+    Raises
+    ------
+    RuntimeError
+        If any enabled model fails (after all of them were tried), so the
+        worker is not reported ready.
+    """
+    times: Dict[str, float] = {}
+    if not HAS_MEDIAPIPE:
+        return times
+    image_rgb = np.zeros((480, 640, 3), dtype=np.uint8)
+    image_rgb.flags.writeable = False
+    pool = get_pool()
+    failed: List[str] = []
+    t0 = time.perf_counter()
+    with pool.checkout(DEFAULT_KEY) as ext:
+        times["mediapipe_init"] = (time.perf_counter() - t0) * 1000
+        groups = landmark_stages.resolve()
+        logger.info("Landmark mode %s → %s", settings.LANDMARK_MODE, landmark_stages.describe(groups))
+        for name, fn in _STAGES:
+            if name not in groups:
+                continue
+            t0 = time.perf_counter()
+            try:
+                fn(ext, image_rgb)
+            except Exception:
+                logger.exception("MediaPipe %s warm-up failed", name)
+                failed.append(name)
+                continue
+            times[f"mediapipe_{name}"] = (time.perf_counter() - t0) * 1000
+        for name, _ in _STAGES:
+            if name in failed:
+                continue
+            graph = ext.graph(name) if name in groups else None
+            seconds = _baseline_latency(name, image_rgb, graph)
+            if seconds is not None:
+                _model_mean_s.setdefault(name, seconds)
+        if settings.HAND_ROI and "hands" in groups:
+            t0 = time.perf_counter()
+            for name in _ROI_SLOTS:
+                ext.graph(name).process(np.ascontiguousarray(image_rgb[:256, :256]))
+            times["mediapipe_hands_roi"] = (time.perf_counter() - t0) * 1000
+    pool.release(DEFAULT_KEY)
+    if failed:
+        raise RuntimeError(f"MediaPipe warm-up failed for {', '.join(failed)}")
+    return times
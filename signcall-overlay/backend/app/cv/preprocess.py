@@ -1,11 +1,113 @@
+"""Frame decoding and model-input preprocessing (no TF dependency).
+
+Raw decoded frames are only needed until landmarks are extracted and the
+PoseNet input is built; after that the session keeps just the 257×257
+uint8 input in a preallocated ``InputRing``.
+"""
+
 import base64
+from typing import Optional
+
 import numpy as np
 import cv2
 
+POSENET_INPUT_SIZE = 257  # PoseNet MobileNetV1 input resolution
+
+
 def b64jpeg_to_bgr(image_jpeg_b64: str):
     if not image_jpeg_b64:
         return None
     raw = base64.b64decode(image_jpeg_b64)
-    arr = np.frombuffer(raw, dtype=np.uint8)
+    return jpeg_to_bgr(raw)
+
+def jpeg_to_bgr(jpeg):
+    """Decode JPEG bytes (bytes / memoryview) without copying the buffer."""
+    if jpeg is None or len(jpeg) == 0:
+        return None
+    arr = np.frombuffer(jpeg, dtype=np.uint8)
     img = cv2.imdecode(arr, cv2.IMREAD_COLOR)
     return img
+
+
+def posenet_input(frame_bgr: np.ndarray, out: Optional[np.ndarray] = None) -> np.ndarray:
+    """BGR frame → (257, 257, 3) uint8 RGB PoseNet input.
+
+    Replicates Teachable Machine / PoseNet's ``padAndResizeTo`` exactly:
+    the image is zero-padded to a square (preserving aspect ratio) THEN
+    resized bilinearly.  A raw ``cv2.resize`` would stretch a 16:9 webcam
+    frame into a square, distorting the pose and producing wrong heatmaps.
+    The BGR→RGB swap is done after the resize, on the small image.
+
+    When *out* is given (e.g. an ``InputRing`` slot) the result is written
+    into it and no new array is allocated.
+
+    Reference: tensorflow/tfjs-models posenet/src/util.ts  padAndResizeTo()
+    """
+    size = POSENET_INPUT_SIZE
+    h, w = frame_bgr.shape[:2]
+    if w < h:
+        # Image is taller than wide → pad width (left + right)
+        pad_l = pad_r = round(0.5 * (h - w))
+        pad_t = pad_b = 0
+    else:
+        # Image is wider than tall → pad height (top + bottom)
+        pad_t = pad_b = round(0.5 * (w - h))
+        pad_l = pad_r = 0
+
+    # Pad with zeros (black) — matches tf.pad3d default
+    padded = cv2.copyMakeBorder(
+        frame_bgr, pad_t, pad_b, pad_l, pad_r,
+        cv2.BORDER_CONSTANT, value=(0, 0, 0),
+    )
+    # Resize (bilinear interpolation — matches tf.image.resizeBilinear)
+    resized = cv2.resize(padded, (size, size), interpolation=cv2.INTER_LINEAR)
+    if out is None:
+        return cv2.cvtColor(resized, cv2.COLOR_BGR2RGB)
+    cv2.cvtColor(resized, cv2.COLOR_BGR2RGB, dst=out)
+    return out
+
+
+class InputRing:
+    """Preallocated per-session ring of preprocessed PoseNet inputs.
+
+    Holds ``capacity`` uint8 (257, 257, 3) images (~198 KB each) in one
+    array allocated up front, so a session's footprint does not depend on
+    the camera resolution and never grows.  Inputs are written in place
+    (``next_slot`` → ``posenet_input(..., out=slot)`` → ``commit``).
+    Returned arrays are views, valid until the slot is reused.
+    """
+
+    __slots__ = ("capacity", "_buf", "_count")
+
+    def __init__(self, capacity: int = 1):
+        self.capacity = max(1, capacity)
+        self._buf = np.zeros(
+            (self.capacity, POSENET_INPUT_SIZE, POSENET_INPUT_SIZE, 3), dtype=np.uint8
+        )
+        self._count = 0
+
+    def __len__(self) -> int:
+        return min(self._count, self.capacity)
+
+    @property
+    def nbytes(self) -> int:
+        return self._buf.nbytes
+
+    def next_slot(self) -> np.ndarray:
+        """The slot the next input should be written into."""
+        return self._buf[self._count % self.capacity]
+
+    def commit(self) -> np.ndarray:
+        """Mark ``next_slot()`` as filled; returns it."""
+        slot = self.next_slot()
+        self._count += 1
+        return slot
+
+    def latest(self) -> Optional[np.ndarray]:
+        """The newest input, or None when empty."""
+        if not self._count:
+            return None
+        return self._buf[(self._count - 1) % self.capacity]
+
+    def clear(self) -> None:
+        self._count = 0
@@ -0,0 +1,35 @@
+"""Recorded frames for the offline scripts (no TF dependency).
+
+``export_tm_model.py`` calibrates int8 models on them and
+``bench_landmarks.py`` times MediaPipe on them; keeping the loader here
+lets the landmark benchmark run without importing TensorFlow.
+"""
+
+from pathlib import Path
+
+import cv2
+
+_IMAGE_EXTS = {".jpg", ".jpeg", ".png", ".bmp"}
+
+
+def load_frames(path: str, max_frames: int) -> list:
+    """Recorded BGR frames from an image directory or a video file."""
+    p = Path(path)
+    frames = []
+    if p.is_dir():
+        for f in sorted(p.iterdir()):
+            if f.suffix.lower() in _IMAGE_EXTS:
+                img = cv2.imread(str(f), cv2.IMREAD_COLOR)
+                if img is not None:
+                    frames.append(img)
+            if len(frames) >= max_frames:
+                break
+    else:
+        cap = cv2.VideoCapture(str(p))
+        while len(frames) < max_frames:
+            ok, img = cap.read()
+            if not ok:
+                break
+            frames.append(img)
+        cap.release()
+    return frames
@@ -1,14 +1,31 @@
-from dataclasses import dataclass, field
-from typing import Optional, List
+"""Landmark containers shared by the CV and recognition modules.
+
+Landmarks are stored in preallocated float32 NumPy arrays with presence
+masks rather than nested Python lists, so feature code can work on whole
+arrays.  The list-shaped ``hands`` / ``pose`` / ``face`` accessors are
+kept for existing callers and return the same nested lists as before.
+"""
+
+from typing import Iterator, List, Optional, Sequence
+
+import numpy as np
+
+N_HANDS = 2
+N_HAND_POINTS = 21
+N_POSE_POINTS = 33
+N_FACE_POINTS = 468
+
+_HAND_END = N_HANDS * N_HAND_POINTS
+_POSE_END = _HAND_END + N_POSE_POINTS
+_N_POINTS = _POSE_END + N_FACE_POINTS
 
 
-@dataclass
 class LandmarkFrame:
     """One frame of MediaPipe landmark data.
 
     Populated by ``cv.mediapipe_extractor.extract_landmarks``.
 
-    Field shapes (when not None):
+    List-shaped accessors (None when absent):
         hands : List[List[List[float]]]
             Shape  [num_hands][21][3]  –  up to 2 hands, 21 keypoints each,
             each keypoint is [x, y, z] normalised to [0,1] relative to the
@@ -21,17 +38,103 @@ class LandmarkFrame:
         face : List[List[float]]
             Shape  [468][3]  –  468 FaceMesh keypoints.
 
+    Array storage (one contiguous float32 block, always allocated):
+        hand_xyz  (2, 21, 3)   hand_mask (2,) bool – detected hands first
+        pose_xyz  (33, 3)      pose_mask  bool
+        face_xyz  (468, 3)     face_mask  bool
+
     Member 3 can rely on these shapes being stable.
+
+    ``pose_fresh`` / ``face_fresh`` are False when that group was not
+    measured on this frame but carried over / extrapolated from earlier
+    ones (``LANDMARK_RATES``); the values are still in the arrays.
     """
 
-    ts: int
-    hands: Optional[List[List[List[float]]]] = None
-    handedness: Optional[List[str]] = None
-    pose: Optional[List[List[float]]] = None
-    face: Optional[List[List[float]]] = None
+    __slots__ = (
+        "ts",
+        "handedness",
+        "xyz",
+        "hand_xyz",
+        "pose_xyz",
+        "face_xyz",
+        "hand_mask",
+        "pose_mask",
+        "face_mask",
+        "pose_fresh",
+        "face_fresh",
+    )
+
+    def __init__(
+        self,
+        ts: int,
+        hands=None,
+        handedness: Optional[List[str]] = None,
+        pose=None,
+        face=None,
+    ):
+        self.ts = ts
+        self.handedness = handedness
+        self.xyz = np.zeros((_N_POINTS, 3), dtype=np.float32)
+        self.hand_xyz = self.xyz[:_HAND_END].reshape(N_HANDS, N_HAND_POINTS, 3)
+        self.pose_xyz = self.xyz[_HAND_END:_POSE_END]
+        self.face_xyz = self.xyz[_POSE_END:]
+        self.hand_mask = np.zeros(N_HANDS, dtype=bool)
+        self.pose_mask = False
+        self.face_mask = False
+        self.pose_fresh = True
+        self.face_fresh = True
+        self.hands = hands
+        self.pose = pose
+        self.face = face
+
+    # ── list-shaped accessors ──────────────────────────────────────────────
+
+    @property
+    def n_hands(self) -> int:
+        return int(self.hand_mask.sum())
+
+    @property
+    def hands(self) -> Optional[List[List[List[float]]]]:
+        n = self.n_hands
+        return self.hand_xyz[:n].tolist() if n else None
+
+    @hands.setter
+    def hands(self, value) -> None:
+        self.hand_mask[:] = False
+        if value is None or len(value) == 0:
+            return
+        # MediaPipe is configured for max_num_hands=2
+        arr = np.asarray(value, dtype=np.float32)[:N_HANDS]
+        self.hand_xyz[: len(arr)] = arr
+        self.hand_mask[: len(arr)] = True
+
+    @property
+    def pose(self) -> Optional[List[List[float]]]:
+        return self.pose_xyz.tolist() if self.pose_mask else None
+
+    @pose.setter
+    def pose(self, value) -> None:
+        self.pose_mask = value is not None and len(value) > 0
+        if self.pose_mask:
+            self.pose_xyz[:] = value
+
+    @property
+    def face(self) -> Optional[List[List[float]]]:
+        return self.face_xyz.tolist() if self.face_mask else None
+
+    @face.setter
+    def face(self, value) -> None:
+        self.face_mask = value is not None and len(value) > 0
+        if self.face_mask:
+            self.face_xyz[:] = value
+
+    def __repr__(self) -> str:
+        return (
+            f"LandmarkFrame(ts={self.ts}, hands={self.n_hands}, "
+            f"pose={self.pose_mask}, face={self.face_mask})"
+        )
 
 
-@dataclass
 class LandmarkWindow:
     """A sliding window of consecutive LandmarkFrames.
 
@@ -39,8 +142,139 @@ class LandmarkWindow:
         frames   – the last N LandmarkFrame objects (default N=10)
         ts_start – timestamp of the earliest frame
         ts_end   – timestamp of the latest frame
+
+    Stacked arrays for whole-window feature code:
+        hand_xyz  (T, 2, 21, 3)   hand_mask (T, 2)
+        pose_xyz  (T, 33, 3)      pose_mask (T,)
+
+    Windows taken from a ``LandmarkRing`` get these as zero-copy views;
+    otherwise they are stacked from ``frames`` on first access.
+    ``pose_fresh`` (T,) marks the frames whose pose was actually measured.
+
+    ``features`` optionally carries the window's 7-D classifier features
+    when they were already computed incrementally (``IncrementalFeatures``).
     """
 
-    frames: List[LandmarkFrame] = field(default_factory=list)
-    ts_start: int = 0
-    ts_end: int = 0
+    __slots__ = ("frames", "ts_start", "ts_end", "features", "_arrays")
+
+    def __init__(
+        self,
+        frames: Optional[List[LandmarkFrame]] = None,
+        ts_start: int = 0,
+        ts_end: int = 0,
+        arrays: Optional[Sequence[np.ndarray]] = None,
+    ):
+        self.frames = [] if frames is None else frames
+        self.ts_start = ts_start
+        self.ts_end = ts_end
+        self.features: Optional[np.ndarray] = None
+        self._arrays = arrays   # (hand_xyz, hand_mask, pose_xyz, pose_mask)
+
+    def __len__(self) -> int:
+        return len(self.frames)
+
+    def _stacked(self) -> Sequence[np.ndarray]:
+        if self._arrays is None:
+            f = self.frames
+            self._arrays = (
+                np.array([x.hand_xyz for x in f], dtype=np.float32).reshape(
+                    len(f), N_HANDS, N_HAND_POINTS, 3),
+                np.array([x.hand_mask for x in f], dtype=bool).reshape(len(f), N_HANDS),
+                np.array([x.pose_xyz for x in f], dtype=np.float32).reshape(
+                    len(f), N_POSE_POINTS, 3),
+                np.array([x.pose_mask for x in f], dtype=bool),
+            )
+        return self._arrays
+
+    @property
+    def hand_xyz(self) -> np.ndarray:
+        return self._stacked()[0]
+
+    @property
+    def hand_mask(self) -> np.ndarray:
+        return self._stacked()[1]
+
+    @property
+    def pose_xyz(self) -> np.ndarray:
+        return self._stacked()[2]
+
+    @property
+    def pose_mask(self) -> np.ndarray:
+        return self._stacked()[3]
+
+    @property
+    def pose_fresh(self) -> np.ndarray:
+        return np.array([x.pose_fresh for x in self.frames], dtype=bool)
+
+
+class LandmarkRing:
+    """Fixed-capacity ring buffer of LandmarkFrames with contiguous windows.
+
+    Every frame's arrays are written twice (slot ``i`` and ``i + capacity``),
+    so the newest ``n`` frames always form one contiguous slice and
+    ``window(n)`` returns views, never copies.  Those views are only valid
+    until the next ``append`` overwrites the slots.
+
+    Face landmarks stay on the frames and are not mirrored here.
+    """
+
+    def __init__(self, capacity: int):
+        self.capacity = capacity
+        size = 2 * capacity
+        self._frames = np.empty(size, dtype=object)
+        self._hand_xyz = np.zeros((size, N_HANDS, N_HAND_POINTS, 3), dtype=np.float32)
+        self._hand_mask = np.zeros((size, N_HANDS), dtype=bool)
+        self._pose_xyz = np.zeros((size, N_POSE_POINTS, 3), dtype=np.float32)
+        self._pose_mask = np.zeros(size, dtype=bool)
+        self._count = 0
+
+    def __len__(self) -> int:
+        return min(self._count, self.capacity)
+
+    @property
+    def nbytes(self) -> int:
+        return (self._frames.nbytes + self._hand_xyz.nbytes + self._hand_mask.nbytes
+                + self._pose_xyz.nbytes + self._pose_mask.nbytes)
+
+    def _end(self) -> int:
+        """Exclusive end of the contiguous slice holding the newest frames."""
+        return (self._count - 1) % self.capacity + self.capacity + 1
+
+    def append(self, frame: LandmarkFrame) -> None:
+        i = self._count % self.capacity
+        for j in (i, i + self.capacity):
+            self._frames[j] = frame
+            self._hand_xyz[j] = frame.hand_xyz
+            self._hand_mask[j] = frame.hand_mask
+            self._pose_xyz[j] = frame.pose_xyz
+            self._pose_mask[j] = frame.pose_mask
+        self._count += 1
+
+    def __iter__(self) -> Iterator[LandmarkFrame]:
+        """Frames oldest → newest."""
+        if not self._count:
+            return iter(())
+        end = self._end()
+        return iter(self._frames[end - len(self) : end].tolist())
+
+    def window(self, n: int) -> LandmarkWindow:
+        """The newest ``min(n, len(self))`` frames as a LandmarkWindow."""
+        n = min(n, len(self))
+        if n == 0:
+            return LandmarkWindow()
+        end = self._end()
+        s = slice(end - n, end)
+        frames = self._frames[s].tolist()
+        return LandmarkWindow(
+            frames=frames,
+            ts_start=frames[0].ts,
+            ts_end=frames[-1].ts,
+            arrays=(self._hand_xyz[s], self._hand_mask[s],
+                    self._pose_xyz[s], self._pose_mask[s]),
+        )
+
+    def clear(self) -> None:
+        self._frames[:] = None
+        self._hand_mask[:] = False
+        self._pose_mask[:] = False
+        self._count = 0
@@ -1,7 +1,11 @@
+import asyncio
 import logging
+import time
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse, PlainTextResponse
+from app import metrics, settings
 from app.api.ws import router as ws_router
 
 # Configure root logger so our app messages are visible
@@ -26,13 +30,113 @@ app.add_middleware(
 
 app.include_router(ws_router)
 
+# Readiness state, filled in by _warm_up()
+app.state.ready = False
+app.state.warmup_ms = {}
+app.state.warmup_error = None
+
+
+@app.get("/metrics", response_class=PlainTextResponse)
+async def metrics_endpoint():
+    """Prometheus text-format scrape endpoint."""
+    return PlainTextResponse(
+        metrics.render(), media_type="text/plain; version=0.0.4; charset=utf-8"
+    )
+
+
+@app.get("/healthz")
+async def healthz():
+    """Liveness: the process is up and the event loop is responsive."""
+    return {"status": "ok"}
+
+
+@app.get("/readyz")
+async def readyz():
+    """Readiness: models are loaded and warmed; route sessions here.
+
+    A worker whose warm-up failed stays unready (``status: "failed"``).
+    """
+    if app.state.ready:
+        status = "ready"
+    else:
+        status = "failed" if app.state.warmup_error else "warming"
+    body = {"ready": app.state.ready, "status": status, "components_ms": app.state.warmup_ms}
+    if app.state.warmup_error:
+        body["error"] = app.state.warmup_error
+    return JSONResponse(body, status_code=200 if app.state.ready else 503)
+
+
+@app.get("/sessions/memory")
+async def sessions_memory():
+    """Per-session buffer bytes, for sizing hosts against SESSION_MEMORY_CAP_MB."""
+    from app.pipeline.orchestrator import _sessions
+
+    return _sessions.memory_report()
+
+
+async def _warm_up():
+    """Load + warm MediaPipe and the TM model off the event loop."""
+    from app.cv import mediapipe_extractor
+    from app.pipeline.executor import run_stage
+    from app.recognition import classifier
+
+    logger = logging.getLogger("app.startup")
+    t0 = time.perf_counter()
+    timings: dict = {}
+    try:
+        timings.update(await run_stage("landmarks", mediapipe_extractor.warmup))
+        if classifier._check_tm_available():
+            from app.recognition import tm_model
+
+            timings.update(await run_stage("recognition", tm_model.warmup))
+    except Exception as exc:
+        logger.exception("Model warm-up failed – worker stays unready")
+        app.state.warmup_error = f"{type(exc).__name__}: {exc}"
+    timings["total"] = (time.perf_counter() - t0) * 1000
+    app.state.warmup_ms = {k: round(v, 1) for k, v in timings.items()}
+    if app.state.warmup_error:
+        return
+    app.state.ready = True
+    logger.info(
+        "Warm-up complete: %s",
+        "  ".join(f"{k}={v:.0f}ms" for k, v in app.state.warmup_ms.items()),
+    )
+
 
 @app.on_event("startup")
 async def _startup():
+    from app import resources
+    from app.pipeline.executor import get_executor
+
+    # Pin + size thread pools before any TF / executor thread exists
+    resources.apply()
+    logging.getLogger("app.startup").info(
+        "Thread topology: %s", resources.topology_report(get_executor().limits)
+    )
+
     from app.cv.mediapipe_extractor import HAS_MEDIAPIPE
+    from app.pipeline.orchestrator import _sessions
+    from app.pipeline.session import run_idle_sweeper
+
+    app.state.session_sweeper = asyncio.create_task(run_idle_sweeper(_sessions))
+    if settings.WARMUP:
+        app.state.warmup_task = asyncio.create_task(_warm_up())
+    else:
+        app.state.ready = True
 
     logger = logging.getLogger("app.startup")
     if HAS_MEDIAPIPE:
         logger.info("✅ MediaPipe solutions available – CV extraction is LIVE")
     else:
         logger.warning("⚠️  MediaPipe solutions NOT available – CV returns empty landmarks")
+
+
+@app.on_event("shutdown")
+async def _shutdown():
+    from app.pipeline import executor
+
+    for name in ("session_sweeper", "warmup_task"):
+        task = getattr(app.state, name, None)
+        if task is not None:
+            task.cancel()
+    executor.shutdown()
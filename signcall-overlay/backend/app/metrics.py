@@ -0,0 +1,296 @@
+"""Minimal Prometheus-style metrics (no external dependency).
+
+Counters, gauges and fixed-bucket histograms rendered in the Prometheus
+text exposition format by ``render()`` and served at ``GET /metrics``.
+
+Recording is meant to stay on at full frame rate: label children are
+resolved once at import (``STAGE_LATENCY.labels(stage="decode")``) and an
+observation is a ``bisect`` plus two additions under a lock.
+"""
+
+from __future__ import annotations
+
+import threading
+from bisect import bisect_left
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+# Latency buckets in seconds: 1 ms … 5 s
+LATENCY_BUCKETS: Tuple[float, ...] = (
+    0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0,
+)
+
+_registry: List["_Metric"] = []
+
+
+def _fmt_labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    parts = [f'{n}="{v}"' for n, v in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+def _fmt_value(v: float) -> str:
+    if v == float("inf"):
+        return "+Inf"
+    return repr(float(v)) if isinstance(v, float) else str(v)
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, doc: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.doc = doc
+        self.labelnames = tuple(labelnames)
+        self._children: Dict[Tuple[str, ...], object] = {}
+        self._lock = threading.Lock()
+        _registry.append(self)
+
+    def labels(self, **labels: str):
+        key = tuple(str(labels[n]) for n in self.labelnames)
+        child = self._children.get(key)
+        if child is None:
+            with self._lock:
+                child = self._children.setdefault(key, self._new_child())
+        return child
+
+    def _new_child(self):
+        raise NotImplementedError
+
+    def _samples(self) -> List[str]:
+        raise NotImplementedError
+
+    def render(self) -> str:
+        head = f"# HELP {self.name} {self.doc}\n# TYPE {self.name} {self.kind}\n"
+        return head + "".join(line + "\n" for line in self._samples())
+
+
+class _CounterChild:
+    __slots__ = ("value", "_lock")
+
+    def __init__(self):
+        self.value = 0.0
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1.0) -> None:
+        with self._lock:
+            self.value += amount
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def __init__(self, name: str, doc: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, doc, labelnames)
+        if not self.labelnames:
+            self.labels()   # export 0 before the first increment
+
+    def _new_child(self):
+        return _CounterChild()
+
+    def inc(self, amount: float = 1.0) -> None:
+        self.labels().inc(amount)
+
+    def _samples(self) -> List[str]:
+        return [
+            f"{self.name}{_fmt_labels(self.labelnames, key)} {_fmt_value(child.value)}"
+            for key, child in list(self._children.items())
+        ]
+
+
+class Gauge(_Metric):
+    """Gauge whose value is read from a callback at scrape time."""
+
+    kind = "gauge"
+
+    def __init__(self, name: str, doc: str, fn: Optional[Callable[[], float]] = None):
+        super().__init__(name, doc)
+        self._fn = fn
+        self.value = 0.0
+
+    def set(self, value: float) -> None:
+        self.value = value
+
+    def set_function(self, fn: Callable[[], float]) -> None:
+        self._fn = fn
+
+    def _samples(self) -> List[str]:
+        value = self.value
+        if self._fn is not None:
+            try:
+                value = self._fn()
+            except Exception:
+                pass
+        return [f"{self.name} {_fmt_value(float(value))}"]
+
+
+class _HistogramChild:
+    __slots__ = ("bounds", "counts", "sum", "_lock")
+
+    def __init__(self, bounds: Tuple[float, ...]):
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)   # last slot = +Inf
+        self.sum = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, value: float) -> None:
+        idx = bisect_left(self.bounds, value)
+        with self._lock:
+            self.counts[idx] += 1
+            self.sum += value
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        doc: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = LATENCY_BUCKETS,
+    ):
+        super().__init__(name, doc, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        if not self.labelnames:
+            self.labels()
+
+    def _new_child(self):
+        return _HistogramChild(self.buckets)
+
+    def observe(self, value: float) -> None:
+        self.labels().observe(value)
+
+    def _samples(self) -> List[str]:
+        lines: List[str] = []
+        for key, child in list(self._children.items()):
+            with child._lock:
+                counts = list(child.counts)
+                total = child.sum
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += count
+                le = 'le="%s"' % _fmt_value(bound)
+                lines.append(
+                    f"{self.name}_bucket{_fmt_labels(self.labelnames, key, le)} {cumulative}"
+                )
+            labels = _fmt_labels(self.labelnames, key)
+            lines.append(f"{self.name}_sum{labels} {_fmt_value(total)}")
+            lines.append(f"{self.name}_count{labels} {cumulative}")
+        return lines
+
+
+def render() -> str:
+    """All registered metrics in Prometheus text format."""
+    return "".join(m.render() for m in _registry)
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# Pipeline metrics
+# ═══════════════════════════════════════════════════════════════════════════
+
+STAGE_LATENCY = Histogram(
+    "signcall_stage_latency_seconds",
+    "Latency of each pipeline stage (including executor queueing).",
+    ["stage"],
+)
+DECODE_LATENCY = STAGE_LATENCY.labels(stage="decode")
+LANDMARKS_LATENCY = STAGE_LATENCY.labels(stage="landmarks")
+DETECTOR_LATENCY = STAGE_LATENCY.labels(stage="is_signing")
+CLASSIFY_LATENCY = STAGE_LATENCY.labels(stage="classify")
+SMOOTHING_LATENCY = STAGE_LATENCY.labels(stage="smoothing")
+TRANSLATE_LATENCY = STAGE_LATENCY.labels(stage="translate")
+LLM_LATENCY = STAGE_LATENCY.labels(stage="llm")
+PIPELINE_LATENCY = STAGE_LATENCY.labels(stage="pipeline")
+
+FRAMES_RECEIVED = Counter(
+    "signcall_frames_received_total", "Frames received over WebSocket."
+)
+FRAMES_PROCESSED = Counter(
+    "signcall_frames_processed_total", "Frames taken off the ingest queue for processing."
+)
+FRAMES_DROPPED = Counter(
+    "signcall_frames_dropped_total", "Frames dropped before processing.", ["reason"]
+)
+FRAMES_DROPPED_OVERFLOW = FRAMES_DROPPED.labels(reason="overflow")
+FRAMES_DROPPED_STALE = FRAMES_DROPPED.labels(reason="stale")
+FRAMES_GATED = Counter(
+    "signcall_frames_gated_total", "Windows not captioned by a pipeline gate.", ["reason"]
+)
+GATED_NOT_SIGNING = FRAMES_GATED.labels(reason="not_signing")
+GATED_LOW_CONFIDENCE = FRAMES_GATED.labels(reason="low_confidence")
+GATED_SCHEDULER = FRAMES_GATED.labels(reason="scheduler")
+CASCADE_DECISIONS = Counter(
+    "signcall_cascade_decisions_total",
+    "Windows classified by each cascade stage (CASCADE=1).",
+    ["stage"],
+)
+CASCADE_PROTOTYPE = CASCADE_DECISIONS.labels(stage="prototype")
+CASCADE_POSENET = CASCADE_DECISIONS.labels(stage="posenet")
+CASCADE_AGREEMENT = Counter(
+    "signcall_cascade_agreement_total",
+    "Prototype vs TM token agreement on windows where both ran.",
+    ["result"],
+)
+CASCADE_AGREE = CASCADE_AGREEMENT.labels(result="agree")
+CASCADE_DISAGREE = CASCADE_AGREEMENT.labels(result="disagree")
+CAPTIONS_SENT = Counter("signcall_captions_total", "Captions produced.")
+
+EXTRACTOR_CHECKOUTS = Counter(
+    "signcall_extractor_checkouts_total",
+    "MediaPipe extractor checkouts by how the session got its instance.",
+    ["result"],
+)
+EXTRACTOR_HIT = EXTRACTOR_CHECKOUTS.labels(result="hit")
+EXTRACTOR_FREE = EXTRACTOR_CHECKOUTS.labels(result="free")
+EXTRACTOR_CREATED = EXTRACTOR_CHECKOUTS.labels(result="created")
+EXTRACTOR_REASSIGNED = EXTRACTOR_CHECKOUTS.labels(result="reassigned")
+EXTRACTOR_POOL = Gauge(
+    "signcall_extractor_pool_instances", "MediaPipe extractor instances created."
+)
+
+_HAND_ROI = Counter(
+    "signcall_hand_roi_total",
+    "HAND_ROI frames: hands found in the crops (hit), crops empty → full frame "
+    "(miss), no previous hand / wrist to crop around (none), full frame after "
+    "a recent miss (backoff).",
+    ["result"],
+)
+HAND_ROI = {r: _HAND_ROI.labels(result=r) for r in ("hit", "miss", "none", "backoff")}
+
+_LANDMARK_MODELS = ("hands", "pose", "face")
+_LANDMARK_LATENCY = Histogram(
+    "signcall_landmark_model_latency_seconds",
+    "Latency of each MediaPipe model that ran.",
+    ["model"],
+)
+_LANDMARK_SKIPPED = Counter(
+    "signcall_landmark_models_skipped_total",
+    "Frames on which a MediaPipe model was disabled by the landmark mode.",
+    ["model"],
+)
+_LANDMARK_SKIPPED_SECONDS = Counter(
+    "signcall_landmark_skipped_seconds_total",
+    "Estimated MediaPipe time saved by disabled or rate-limited models (mean latency per skip).",
+    ["model"],
+)
+_LANDMARK_REUSED = Counter(
+    "signcall_landmark_models_reused_total",
+    "Frames on which a model's landmarks were carried over under LANDMARK_RATES.",
+    ["model"],
+)
+_LANDMARK_CRITICAL = Counter(
+    "signcall_landmark_critical_path_total",
+    "Parallel landmark frames on which this model finished last.",
+    ["model"],
+)
+LANDMARK_CRITICAL_PATH = {m: _LANDMARK_CRITICAL.labels(model=m) for m in _LANDMARK_MODELS}
+LANDMARK_MODEL_LATENCY = {m: _LANDMARK_LATENCY.labels(model=m) for m in _LANDMARK_MODELS}
+LANDMARK_MODEL_SKIPPED = {m: _LANDMARK_SKIPPED.labels(model=m) for m in _LANDMARK_MODELS}
+LANDMARK_SKIPPED_SECONDS = {m: _LANDMARK_SKIPPED_SECONDS.labels(model=m) for m in _LANDMARK_MODELS}
+LANDMARK_MODEL_REUSED = {m: _LANDMARK_REUSED.labels(model=m) for m in _LANDMARK_MODELS}
+
+ACTIVE_SESSIONS = Gauge("signcall_active_sessions", "Sessions with live state.")
+BUFFER_BYTES = Gauge(
+    "signcall_session_buffer_bytes", "Bytes held by per-session frame buffers."
+)
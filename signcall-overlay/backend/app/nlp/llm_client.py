@@ -3,7 +3,7 @@
 import logging
 import time
 from openai import OpenAI
-from app import settings
+from app import metrics, settings
 
 logger = logging.getLogger(__name__)
 
@@ -66,7 +66,9 @@ def gloss_to_english(gloss: str, style: str = "concise") -> str | None:
             temperature=0.2,
             max_tokens=50,
         )
-        llm_ms = (time.perf_counter() - t0) * 1000
+        llm_s = time.perf_counter() - t0
+        metrics.LLM_LATENCY.observe(llm_s)
+        llm_ms = llm_s * 1000
         caption = resp.choices[0].message.content.strip()
         logger.info("LLM latency=%.0fms  caption=%r", llm_ms, caption)
         _llm_cache[cache_key] = (time.perf_counter(), caption)
@@ -0,0 +1,103 @@
+"""Executor layer — runs blocking pipeline stages off the asyncio event loop.
+
+Every stage (JPEG decode, MediaPipe, PoseNet/Keras, LLM call) is blocking
+code.  Awaiting it directly inside ``process_frame`` stalls every other
+WebSocket served by the worker, so each stage gets its own bounded pool:
+
+    decode       cv2.imdecode                      (threads)
+    landmarks    MediaPipe extract_landmarks       (threads)
+    recognition  PoseNet + TM head / prototype     (threads)
+    translate    templates + OpenAI round-trip     (threads)
+
+The pool size of a stage is its concurrency limit, so a burst of slow LLM
+calls can never starve landmark extraction and vice versa.  Limits come
+from ``settings.STAGE_CONCURRENCY``; stages not listed there are sized
+from the worker's CPU budget (``app.resources``).
+"""
+
+from __future__ import annotations
+
+import asyncio
+import functools
+import logging
+from concurrent.futures import Executor, ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional
+
+from app import resources, settings
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_STAGE_CONCURRENCY: Dict[str, int] = {
+    "decode": 4,
+    # Each call checks out its session's extractor from the MediaPipe
+    # pool (cv.mediapipe_extractor), so sessions run concurrently.
+    "landmarks": 1,
+    "recognition": 2,
+    "translate": 8,
+}
+
+def _parse_concurrency(spec: str) -> Dict[str, int]:
+    """Parse ``"stage=n,stage=n"`` into a dict (bad entries are ignored)."""
+    limits: Dict[str, int] = {}
+    for part in spec.split(","):
+        name, sep, value = part.partition("=")
+        if not sep:
+            continue
+        try:
+            limits[name.strip()] = max(1, int(value))
+        except ValueError:
+            logger.warning("Ignoring bad STAGE_CONCURRENCY entry %r", part)
+    return limits
+
+
+class StageExecutor:
+    """Per-stage bounded executors, created lazily on first use."""
+
+    def __init__(self, limits: Optional[Dict[str, int]] = None):
+        self.limits = dict(DEFAULT_STAGE_CONCURRENCY)
+        self.limits.update(limits or {})
+        self._pools: Dict[str, Executor] = {}
+
+    def _pool(self, stage: str) -> Executor:
+        pool = self._pools.get(stage)
+        if pool is None:
+            workers = self.limits.get(stage, 1)
+            pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix=f"stage-{stage}")
+            self._pools[stage] = pool
+            logger.info("Stage %-12s → threads × %d", stage, workers)
+        return pool
+
+    async def run(self, stage: str, fn: Callable[..., Any], *args, **kwargs) -> Any:
+        """Run ``fn(*args, **kwargs)`` on the pool for *stage* and await it."""
+        loop = asyncio.get_running_loop()
+        call = functools.partial(fn, *args, **kwargs)
+        return await loop.run_in_executor(self._pool(stage), call)
+
+    def shutdown(self) -> None:
+        for pool in self._pools.values():
+            pool.shutdown(wait=False, cancel_futures=True)
+        self._pools.clear()
+
+
+_executor: Optional[StageExecutor] = None
+
+
+def get_executor() -> StageExecutor:
+    global _executor
+    if _executor is None:
+        limits = dict(resources.get_plan().stage_concurrency)
+        limits.update(_parse_concurrency(settings.STAGE_CONCURRENCY))
+        _executor = StageExecutor(limits=limits)
+    return _executor
+
+
+async def run_stage(stage: str, fn: Callable[..., Any], *args, **kwargs) -> Any:
+    """Await ``fn(*args, **kwargs)`` on the bounded executor for *stage*."""
+    return await get_executor().run(stage, fn, *args, **kwargs)
+
+
+def shutdown() -> None:
+    global _executor
+    if _executor is not None:
+        _executor.shutdown()
+        _executor = None
@@ -0,0 +1,106 @@
+"""Per-connection frame ingestion — latest-frame-wins with deadline dropping.
+
+The WebSocket receive loop only enqueues frames; a separate consumer task
+decodes and processes them.  When inference is slower than the client's
+capture rate the queue keeps only the newest ``max_pending`` frames
+(older ones are dropped on arrival), and frames whose client ``ts`` is
+older than ``deadline_ms`` by the time they are dequeued are dropped too,
+so captions never describe gestures from seconds ago.
+
+Client and server clocks differ, so age is measured against an estimated
+clock offset: the smallest ``server_ms - client_ts`` seen so far on the
+connection (i.e. the fastest delivery observed counts as zero age).
+
+Drop counts are kept per connection (``FrameIngest.stats``) and summed
+over all connections in the ``signcall_frames_*`` metrics.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, Callable, Deque, Dict, Optional
+
+from app import metrics, settings
+
+# Per-connection stat name → process-wide metric
+_METRICS = {
+    "received": metrics.FRAMES_RECEIVED.labels(),
+    "dropped_overflow": metrics.FRAMES_DROPPED_OVERFLOW,
+    "dropped_stale": metrics.FRAMES_DROPPED_STALE,
+    "processed": metrics.FRAMES_PROCESSED.labels(),
+}
+
+
+def _now_ms() -> float:
+    return time.time() * 1000.0
+
+
+@dataclass
+class PendingFrame:
+    """A received but not yet decoded frame."""
+
+    session: str
+    user: str
+    ts: int
+    style: str
+    data: Any                                # JPEG bytes / memoryview / base64 str
+    decode: Callable[[Any], Any]             # data → BGR ndarray | None
+    kind: str = "image"                      # "landmarks": decode → LandmarkFrame
+
+
+class FrameIngest:
+    """Bounded latest-frame-wins queue for one WebSocket connection."""
+
+    def __init__(
+        self,
+        max_pending: Optional[int] = None,
+        deadline_ms: Optional[float] = None,
+    ):
+        self.max_pending = max(1, max_pending or settings.INGEST_MAX_PENDING)
+        self.deadline_ms = settings.INGEST_DEADLINE_MS if deadline_ms is None else deadline_ms
+        self._frames: Deque[PendingFrame] = deque()
+        self._ready = asyncio.Event()
+        self._offset_ms: Optional[float] = None
+        self.stats: Dict[str, int] = dict.fromkeys(_METRICS, 0)
+
+    def _count(self, name: str) -> None:
+        self.stats[name] += 1
+        _METRICS[name].inc()
+
+    def age_ms(self, frame: PendingFrame, now_ms: Optional[float] = None) -> float:
+        """Estimated time since the client captured *frame*."""
+        if self._offset_ms is None:
+            return 0.0
+        now_ms = _now_ms() if now_ms is None else now_ms
+        return now_ms - (frame.ts + self._offset_ms)
+
+    def put(self, frame: PendingFrame) -> None:
+        """Enqueue *frame*, evicting the oldest pending one when full."""
+        self._count("received")
+        offset = _now_ms() - frame.ts
+        if self._offset_ms is None or offset < self._offset_ms:
+            self._offset_ms = offset
+        if len(self._frames) >= self.max_pending:
+            self._frames.popleft()
+            self._count("dropped_overflow")
+        self._frames.append(frame)
+        self._ready.set()
+
+    async def get(self) -> PendingFrame:
+        """Wait for the newest frame that is still within the deadline."""
+        while True:
+            while not self._frames:
+                self._ready.clear()
+                await self._ready.wait()
+            frame = self._frames.popleft()
+            if self.deadline_ms > 0 and self.age_ms(frame) > self.deadline_ms:
+                self._count("dropped_stale")
+                continue
+            self._count("processed")
+            return frame
+
+    def pending(self) -> int:
+        return len(self._frames)
@@ -1,106 +1,175 @@
 import logging
 import time
+from typing import Optional
 
-from app import settings
-from app.cv.types import LandmarkWindow
+from app import metrics, settings
+from app.cv.types import LandmarkFrame
+from app.cv import landmark_stages, mediapipe_extractor
 from app.cv.mediapipe_extractor import extract_landmarks
-from app.recognition.detector import is_signing
-from app.recognition.classifier import predict, predict_with_tm
+from app.recognition.classifier import (
+    cache_tm_probs, predict, predict_with_tm_async, prepare_tm_input,
+)
+from app.recognition.fusion import active_method as fusion_method
 from app.recognition.smoothing import smooth
 from app.nlp.translator import translate
-from app.nlp.profile import get_profile
+from app.pipeline.executor import run_stage
+from app.pipeline.session import WINDOW_SIZE, SessionRegistry, SessionState
 
 logger = logging.getLogger(__name__)
 
-# Per-session sliding buffer of LandmarkFrames + raw BGR frames
-_buffers: dict[str, list] = {}
-_frame_buffers: dict[str, list] = {}   # raw BGR frames for TM model
-WINDOW_SIZE = 10       # number of frames in one recognition window
-MAX_BUF_LEN = 30       # cap to prevent unbounded memory growth
+# All per-session state (buffers, EMA, smoothing history, profile)
+# (released sessions hand their MediaPipe extractor back to the pool)
+_sessions = SessionRegistry(window_size=WINDOW_SIZE, on_release=mediapipe_extractor.release)
 
 # ── Debug token rotation (enabled by DEBUG_TOKENS=1 in .env) ──
 _DEBUG_TOKENS = ["HELLO", "THANKS", "REPEAT", "SLOW"]
 _DEBUG_CONFS  = [0.90, 0.65, 0.30, 0.85]  # high, med, low, high
-_debug_counter: dict[str, int] = {}
 
+metrics.ACTIVE_SESSIONS.set_function(lambda: len(_sessions))
+metrics.BUFFER_BYTES.set_function(lambda: _sessions.total_bytes)
 
-def _get_buf_key(session: str, user: str) -> str:
-    return f"{session}:{user}"
+
+def get_session(session: str, user: str) -> SessionState:
+    """Look up (or create) the per-session state container."""
+    return _sessions.get(session, user)
+
+
+def configure_session(session: str, user: str, landmark_mode: Optional[str] = None) -> dict:
+    """Apply per-session options; returns the effective settings."""
+    state = _sessions.get(session, user)
+    if landmark_mode is not None:
+        state.landmark_groups = landmark_stages.resolve(landmark_mode)
+    groups = state.landmark_groups or landmark_stages.resolve()
+    return {"landmarks": sorted(groups)}
+
+
+def release_session(key: str) -> None:
+    """Free all state for a ``session:user`` key (called on disconnect)."""
+    if _sessions.release(key):
+        logger.info("Released session state for %s", key)
+
+
+async def _debug_caption(state: SessionState, session: str, user: str, ts: int, style: str):
+    """Debug mode: cycle through tokens every ~2s (16 frames at 8fps)."""
+    state.debug_counter += 1
+    # Emit a caption every 16 frames (~2 seconds)
+    if state.debug_counter % 16 != 0:
+        return None
+    idx = (state.debug_counter // 16) % len(_DEBUG_TOKENS)
+    token = _DEBUG_TOKENS[idx]
+    conf = _DEBUG_CONFS[idx]
+    pred = {"token": token, "confidence": conf, "top2": [token, _DEBUG_TOKENS[(idx+1) % len(_DEBUG_TOKENS)]], "ts": ts}
+    out = await run_stage("translate", translate, pred, state.profile, style=style)
+    logger.info(
+        "[DEBUG] token=%s  conf=%.2f  mode=%s  caption=%s",
+        token, conf, out["mode"], out["caption"],
+    )
+    return {
+        "type": "caption", "session": session, "user": user, "ts": ts,
+        "caption": out["caption"], "confidence": out["confidence"],
+        "mode": out["mode"], "hands_detected": -1,
+    }
 
 
 async def process_frame(session: str, user: str, frame_bgr, ts: int, style: str = "concise"):
     t_start = time.perf_counter()
+    state = _sessions.get(session, user)
 
-    # ── Debug mode: cycle through tokens every ~2s (16 frames at 8fps) ──
     if settings.DEBUG_TOKENS:
-        key = _get_buf_key(session, user)
-        _debug_counter[key] = _debug_counter.get(key, 0) + 1
-        # Emit a caption every 16 frames (~2 seconds)
-        if _debug_counter[key] % 16 != 0:
-            return None
-        idx = (_debug_counter[key] // 16) % len(_DEBUG_TOKENS)
-        token = _DEBUG_TOKENS[idx]
-        conf = _DEBUG_CONFS[idx]
-        pred = {"token": token, "confidence": conf, "top2": [token, _DEBUG_TOKENS[(idx+1) % len(_DEBUG_TOKENS)]], "ts": ts}
-        profile = get_profile(session, user)
-        out = translate(pred, profile, style=style)
-        logger.info(
-            "[DEBUG] token=%s  conf=%.2f  mode=%s  caption=%s",
-            token, conf, out["mode"], out["caption"],
-        )
-        return {
-            "type": "caption", "session": session, "user": user, "ts": ts,
-            "caption": out["caption"], "confidence": out["confidence"],
-            "mode": out["mode"], "hands_detected": -1,
-        }
-
-    key = _get_buf_key(session, user)
-    buf = _buffers.setdefault(key, [])
-    fbuf = _frame_buffers.setdefault(key, [])
-
-    lf = extract_landmarks(frame_bgr, ts)
-    buf.append(lf)
-    fbuf.append(frame_bgr)
-
-    # Keep buffers bounded
-    if len(buf) > MAX_BUF_LEN:
-        _buffers[key] = buf[-MAX_BUF_LEN:]
-        buf = _buffers[key]
-    if len(fbuf) > MAX_BUF_LEN:
-        _frame_buffers[key] = fbuf[-MAX_BUF_LEN:]
-        fbuf = _frame_buffers[key]
+        return await _debug_caption(state, session, user, ts, style)
+
+    t0 = time.perf_counter()
+    # The session's groups if the client set a mode, else the deployment default
+    groups = state.landmark_groups or landmark_stages.resolve()
+    lf = await run_stage(
+        "landmarks", extract_landmarks, frame_bgr, ts, session=state.key, groups=groups
+    )
+    metrics.LANDMARKS_LATENCY.observe(time.perf_counter() - t0)
+    # Keep only the 257×257 PoseNet input; the raw frame is dropped here
+    tm_input = await prepare_tm_input(frame_bgr, state)
+    return await _recognize(state, session, user, lf, tm_input, ts, style, t_start)
+
+
+async def process_landmarks(
+    session: str, user: str, lf: LandmarkFrame, ts: int, style: str = "concise"
+):
+    """Like ``process_frame`` for clients that run MediaPipe themselves.
+
+    No image decode or MediaPipe call; the frame goes straight into the
+    window buffer and recognition uses the landmark (prototype) path.
+    """
+    t_start = time.perf_counter()
+    state = _sessions.get(session, user)
+
+    if settings.DEBUG_TOKENS:
+        return await _debug_caption(state, session, user, ts, style)
+
+    return await _recognize(state, session, user, lf, None, ts, style, t_start)
+
+
+async def _recognize(
+    state: SessionState,
+    session: str,
+    user: str,
+    lf: LandmarkFrame,
+    tm_input,
+    ts: int,
+    style: str,
+    t_start: float,
+):
+    _sessions.push(state, lf)
+    # Multi-frame fusion: every image gets one TM pass, cached per session
+    if tm_input is not None and fusion_method() != "last":
+        await cache_tm_probs(tm_input, state)
 
     # Need at least WINDOW_SIZE frames before running recognition
-    if len(buf) < WINDOW_SIZE:
+    if len(state.landmarks) < WINDOW_SIZE:
         return None
 
-    frames = buf[-WINDOW_SIZE:]
-    raw_frames = fbuf[-WINDOW_SIZE:]
-    window = LandmarkWindow(
-        frames=frames,
-        ts_start=frames[0].ts,
-        ts_end=frames[-1].ts,
-    )
-
-    # Skip classification when hands are idle / absent
-    if not is_signing(window):
-        logger.debug("ts=%d  not signing – skipping recognition", ts)
+    # Motion was updated incrementally when the frame was pushed
+    t0 = time.perf_counter()
+    signing = state.features.is_signing()
+    t1 = time.perf_counter()
+    metrics.DETECTOR_LATENCY.observe(t1 - t0)
+    # Scheduler: hop / onset-offset events; skips most idle windows too
+    if not state.scheduler.should_classify(ts, signing):
+        if signing:
+            metrics.GATED_SCHEDULER.inc()
+        else:
+            metrics.GATED_NOT_SIGNING.inc()
+            logger.debug("ts=%d  not signing – skipping recognition", ts)
         return None
 
-    pred = predict_with_tm(window, raw_frames, session_id=key, ts=ts)
+    window = state.landmarks.window(WINDOW_SIZE)
+    window.features = state.features.vector()
+    # Only the current frame's PoseNet input is needed; landmark-only
+    # frames (or no TM model) carry none → TM path is skipped
+    tm_inputs = [tm_input] if tm_input is not None else []
+
+    pred = await predict_with_tm_async(
+        window, tm_inputs, session_id=state.key, ts=ts, state=state
+    )
+    t2 = time.perf_counter()
+    metrics.CLASSIFY_LATENCY.observe(t2 - t1)
     # Gate: suppress very low-confidence predictions (noise)
     if pred["confidence"] < 0.35:
+        metrics.GATED_LOW_CONFIDENCE.inc()
         logger.debug("ts=%d  low confidence %.2f – skipping", ts, pred["confidence"])
         return None
-    # Pass session:user as session_id for per-session smoothing history
-    pred = smooth(pred, session_id=key)
-    profile = get_profile(session, user)
-    out = translate(pred, profile, style=style)
+    # Per-session smoothing history lives on the session state
+    pred = smooth(pred, session_id=state.key, history=state.history)
+    t3 = time.perf_counter()
+    metrics.SMOOTHING_LATENCY.observe(t3 - t2)
+    out = await run_stage("translate", translate, pred, state.profile, style=style)
+    metrics.TRANSLATE_LATENCY.observe(time.perf_counter() - t3)
 
     # Count how many frames in the window had at least one hand
-    hands_count = sum(1 for f in frames if f.hands)
+    hands_count = int(window.hand_mask[:, 0].sum())
 
-    pipeline_ms = (time.perf_counter() - t_start) * 1000
+    pipeline_s = time.perf_counter() - t_start
+    metrics.PIPELINE_LATENCY.observe(pipeline_s)
+    metrics.CAPTIONS_SENT.inc()
+    pipeline_ms = pipeline_s * 1000
     logger.info(
         "pipeline latency=%.0fms  token=%s  conf=%.2f  mode=%s  hands=%d",
         pipeline_ms, pred["token"], out["confidence"], out["mode"], hands_count,
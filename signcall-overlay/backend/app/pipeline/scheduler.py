@@ -0,0 +1,76 @@
+"""Per-session recognition scheduling.
+
+Running PoseNet → smoothing → translate on every frame of a full window
+mostly re-emits the same token.  A ``RecognitionScheduler`` decides, per
+frame, whether the window should be classified:
+
+``hop``    while signing, classify every ``hop_frames`` frames and at most
+           once per ``hop_ms`` (client-ts milliseconds).  The first signing
+           frame after an idle stretch always classifies, so captions for
+           a new sign are not delayed by the hop.
+``event``  classify at motion onset and at motion offset (the window then
+           still holds the end of the sign), plus a forced refresh every
+           ``refresh_ms`` while signing continues.
+
+``hop`` with ``hop_frames=1, hop_ms=0`` is the old every-frame behaviour.
+"""
+
+from __future__ import annotations
+
+import logging
+from typing import Optional
+
+from app import settings
+
+logger = logging.getLogger(__name__)
+
+MODES = ("hop", "event")
+
+
+class RecognitionScheduler:
+    """Decides which frames of one session get classified."""
+
+    __slots__ = ("mode", "hop_frames", "hop_ms", "refresh_ms",
+                 "_since_run", "_last_run_ts", "_was_signing")
+
+    def __init__(
+        self,
+        mode: Optional[str] = None,
+        hop_frames: Optional[int] = None,
+        hop_ms: Optional[float] = None,
+        refresh_ms: Optional[float] = None,
+    ):
+        self.mode = (mode or settings.RECOGNITION_MODE).strip().lower()
+        if self.mode not in MODES:
+            logger.warning("Unknown RECOGNITION_MODE %r – using 'hop'", self.mode)
+            self.mode = "hop"
+        self.hop_frames = max(1, settings.RECOGNITION_HOP_FRAMES if hop_frames is None else hop_frames)
+        self.hop_ms = settings.RECOGNITION_HOP_MS if hop_ms is None else hop_ms
+        self.refresh_ms = settings.RECOGNITION_REFRESH_MS if refresh_ms is None else refresh_ms
+        self._since_run = 0
+        self._last_run_ts: Optional[int] = None
+        self._was_signing = False
+
+    def should_classify(self, ts: int, signing: bool) -> bool:
+        """Called once per full window; True when it should be classified."""
+        self._since_run += 1
+        onset = signing and not self._was_signing
+        offset = self._was_signing and not signing
+        self._was_signing = signing
+
+        if self.mode == "event":
+            run = onset or offset or (signing and self._elapsed(ts) >= self.refresh_ms)
+        else:
+            run = signing and (
+                onset
+                or (self._since_run >= self.hop_frames and self._elapsed(ts) >= self.hop_ms)
+            )
+        if run:
+            self._since_run = 0
+            self._last_run_ts = ts
+        return run
+
+    def _elapsed(self, ts: int) -> float:
+        if self._last_run_ts is None:
+            return float("inf")
+        return ts - self._last_run_ts
@@ -0,0 +1,204 @@
+"""Per-session state container and its lifecycle.
+
+All mutable per-(session, user) state lives in one ``SessionState``:
+the landmark ring, incremental features, recognition scheduler, cached
+preprocessed PoseNet inputs and TM probabilities, the classifier's EMA
+feature state, the smoothing vote history, the correction profile and the
+debug counter.  The orchestrator looks it up ONCE per frame and passes it
+down.  No raw frames are kept (only the 257×257 PoseNet input, in a
+preallocated ring), so each session's footprint is fixed once created
+and independent of the camera resolution; ``memory_report`` breaks it
+down per buffer.
+
+``SessionRegistry`` owns every ``SessionState`` and frees it when
+    * the WebSocket that fed it disconnects (``release``),
+    * it has been idle for ``SESSION_IDLE_TTL_S`` (``evict_idle``), or
+    * the buffers of all sessions exceed ``SESSION_MEMORY_CAP_MB``
+      (least-recently-used sessions are evicted first).
+
+``on_release`` lets per-session resources held outside ``SessionState``
+(the session's pooled MediaPipe extractor) be returned on every path.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from collections import OrderedDict, deque
+from typing import Callable, Deque, Dict, Optional
+
+from app import settings
+from app.cv.preprocess import InputRing
+from app.cv.types import LandmarkRing
+from app.pipeline.scheduler import RecognitionScheduler
+from app.recognition.fusion import ProbRing
+from app.recognition.incremental import IncrementalFeatures
+from app.recognition.smoothing import SMOOTH_WINDOW_SIZE
+
+logger = logging.getLogger(__name__)
+
+MAX_BUF_LEN = 30       # cap to prevent unbounded memory growth
+WINDOW_SIZE = 10       # default frames per recognition window
+
+
+def session_key(session: str, user: str) -> str:
+    return f"{session}:{user}"
+
+
+class SessionState:
+    """Everything the pipeline keeps for one (session, user) pair."""
+
+    __slots__ = (
+        "key",
+        "landmarks",        # LandmarkRing  (contiguous window views)
+        "features",         # IncrementalFeatures over the recognition window
+        "scheduler",        # RecognitionScheduler  (which windows get classified)
+        "tm_inputs",        # InputRing  preprocessed 257×257 PoseNet inputs
+        "tm_probs",         # ProbRing  per-frame TM probabilities (TM_FUSION)
+        "ema",              # Optional[np.ndarray]  classifier EMA features
+        "history",          # deque[(token, confidence)]  smoothing votes
+        "profile",          # {"style": ..., "bias": {...}}
+        "debug_counter",
+        "landmark_groups",  # Optional[frozenset]  per-session landmark mode
+        "last_seen",        # time.monotonic() of the last frame
+    )
+
+    def __init__(self, key: str, max_len: int = MAX_BUF_LEN, window_size: int = WINDOW_SIZE):
+        self.key = key
+        self.landmarks = LandmarkRing(max_len)
+        self.features = IncrementalFeatures(window_size)
+        self.scheduler = RecognitionScheduler()
+        self.tm_inputs = InputRing(settings.TM_INPUT_RING_LEN)
+        self.tm_probs = ProbRing(window_size)
+        self.ema = None
+        self.history: Deque = deque(maxlen=SMOOTH_WINDOW_SIZE)
+        self.profile: Dict = {"style": "concise", "bias": {}}
+        self.debug_counter = 0
+        self.landmark_groups = None      # None = LANDMARK_MODE
+        self.last_seen = time.monotonic()
+
+    def push(self, landmark_frame) -> None:
+        """Append one frame's landmarks and update the running features."""
+        self.landmarks.append(landmark_frame)
+        self.features.push(landmark_frame)
+
+    @property
+    def nbytes(self) -> int:
+        """Bytes held by this session's per-frame buffers."""
+        return self.landmarks.nbytes + self.tm_inputs.nbytes + self.tm_probs.nbytes
+
+    def memory_report(self) -> Dict[str, int]:
+        """Per-buffer byte counts (for host sizing)."""
+        return {
+            "landmarks": self.landmarks.nbytes,
+            "tm_inputs": self.tm_inputs.nbytes,
+            "tm_probs": self.tm_probs.nbytes,
+            "total": self.nbytes,
+        }
+
+
+class SessionRegistry:
+    """LRU-ordered map of session key → SessionState with eviction."""
+
+    def __init__(
+        self,
+        idle_ttl_s: Optional[float] = None,
+        memory_cap_bytes: Optional[int] = None,
+        window_size: int = WINDOW_SIZE,
+        on_release: Optional[Callable[[str], None]] = None,
+    ):
+        self.idle_ttl_s = settings.SESSION_IDLE_TTL_S if idle_ttl_s is None else idle_ttl_s
+        self.memory_cap_bytes = (
+            int(settings.SESSION_MEMORY_CAP_MB * 1024 * 1024)
+            if memory_cap_bytes is None else memory_cap_bytes
+        )
+        self.window_size = window_size
+        self.on_release = on_release
+        self._states: "OrderedDict[str, SessionState]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._states)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._states
+
+    @property
+    def total_bytes(self) -> int:
+        return sum(state.nbytes for state in self._states.values())
+
+    def get(self, session: str, user: str) -> SessionState:
+        """Return (creating if needed) the state for *session*/*user* and mark it used."""
+        key = session_key(session, user)
+        state = self._states.get(key)
+        if state is None:
+            state = self._states[key] = SessionState(key, window_size=self.window_size)
+            # Buffers are preallocated → the cap only needs checking here
+            if self.memory_cap_bytes > 0:
+                self._evict_lru(keep=key)
+        else:
+            self._states.move_to_end(key)
+        state.last_seen = time.monotonic()
+        return state
+
+    def memory_report(self) -> Dict:
+        """Per-session buffer bytes plus the registry total and cap."""
+        return {
+            "sessions": {key: state.memory_report() for key, state in self._states.items()},
+            "total_bytes": self.total_bytes,
+            "cap_bytes": self.memory_cap_bytes,
+        }
+
+    def push(self, state: SessionState, landmark_frame) -> None:
+        """Buffer one frame's landmarks for *state*."""
+        state.push(landmark_frame)
+
+    def release(self, key: str) -> bool:
+        """Drop the state for *key* (e.g. on disconnect).  Returns True if found."""
+        if self._states.pop(key, None) is None:
+            return False
+        if self.on_release is not None:
+            self.on_release(key)
+        return True
+
+    def evict_idle(self, now: Optional[float] = None) -> int:
+        """Release every session idle for longer than the TTL."""
+        if self.idle_ttl_s <= 0:
+            return 0
+        now = time.monotonic() if now is None else now
+        evicted = 0
+        # OrderedDict is in LRU order → stop at the first fresh entry
+        while self._states:
+            key, state = next(iter(self._states.items()))
+            if now - state.last_seen <= self.idle_ttl_s:
+                break
+            self.release(key)
+            evicted += 1
+        if evicted:
+            logger.info("Evicted %d idle session(s); %d active", evicted, len(self._states))
+        return evicted
+
+    def _evict_lru(self, keep: str) -> None:
+        total = self.total_bytes
+        for key in list(self._states):
+            if total <= self.memory_cap_bytes:
+                break
+            if key == keep:
+                continue
+            total -= self._states[key].nbytes
+            self.release(key)
+            logger.warning("Session memory cap reached – evicted %s", key)
+
+    def clear(self) -> None:
+        for key in list(self._states):
+            self.release(key)
+
+
+async def run_idle_sweeper(registry: SessionRegistry, interval_s: float = 10.0) -> None:
+    """Background task: periodically evict idle sessions."""
+    while True:
+        await asyncio.sleep(interval_s)
+        try:
+            registry.evict_idle()
+        except Exception:
+            logger.exception("Idle session sweep failed")
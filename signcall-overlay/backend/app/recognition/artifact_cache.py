@@ -0,0 +1,127 @@
+"""On-disk cache of the compiled TM graph (``TM_BACKEND=tf``).
+
+Building the fused graph from its source files dominates a cold worker
+start: the TF.js topology JSON is parsed into a GraphDef, the weight
+shards are sliced into one tensor proto per Const node, the Keras head
+is loaded from HDF5 and everything is re-imported around the uint8
+input.  The result only depends on those files, so it is written once
+to ``<TM_GRAPH_CACHE_DIR>/<key>/`` as a frozen, pruned GraphDef (weights
+are Consts inside it) and later workers memory-map that file and import
+it directly.
+
+The key is a SHA-256 over the contents of every source file, the TF
+version and ``FORMAT_VERSION``; replacing any of them gives a new key,
+so the next start rebuilds and older entries are removed.
+
+This module does not import TensorFlow.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import mmap
+import os
+import shutil
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterator, List, Optional
+
+from app import settings
+from app.recognition.backends import (
+    CLASSIFIER_H5, METADATA_JSON, POSENET_DIR, POSENET_SAVED, TM_DIR,
+)
+
+logger = logging.getLogger(__name__)
+
+# Bump when the cached graph layout / manifest changes
+FORMAT_VERSION = 1
+GRAPH_FILE = "tm_fused.pb"
+MANIFEST_FILE = "manifest.json"
+
+
+def cache_dir() -> Path:
+    return Path(settings.TM_GRAPH_CACHE_DIR) if settings.TM_GRAPH_CACHE_DIR else TM_DIR / "cache"
+
+
+def source_files() -> List[Path]:
+    """Every existing file the compiled graph is built from."""
+    paths = [METADATA_JSON, TM_DIR / "model.json", TM_DIR / "weights.bin", CLASSIFIER_H5]
+    posenet_json = POSENET_DIR / "model.json"
+    if posenet_json.exists():
+        paths.append(posenet_json)
+        with open(posenet_json) as f:
+            for group in json.load(f)["weightsManifest"]:
+                paths.extend(POSENET_DIR / p for p in group["paths"])
+    paths.append(POSENET_SAVED / "saved_model.pb")
+    # SavedModel weights live next to the graph, not inside it
+    variables = POSENET_SAVED / "variables"
+    if variables.is_dir():
+        paths.extend(sorted(p for p in variables.iterdir() if p.is_file()))
+    return [p for p in paths if p.exists()]
+
+
+def cache_key(paths: Optional[List[Path]] = None, extra: str = "") -> str:
+    """Content hash of *paths* (default: ``source_files()``)."""
+    h = hashlib.sha256(f"v{FORMAT_VERSION}:{extra}".encode())
+    for path in paths if paths is not None else source_files():
+        h.update(path.name.encode())
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(1 << 20), b""):
+                h.update(chunk)
+    return h.hexdigest()[:16]
+
+
+def lookup(key: str, root: Optional[Path] = None) -> Optional[dict]:
+    """Manifest of the entry for *key*, or None on a miss."""
+    entry = (root or cache_dir()) / key
+    try:
+        manifest = json.loads((entry / MANIFEST_FILE).read_text())
+    except (OSError, ValueError):
+        return None
+    if manifest.get("key") != key or not (entry / GRAPH_FILE).exists():
+        return None
+    return manifest
+
+
+def graph_path(key: str, root: Optional[Path] = None) -> Path:
+    return (root or cache_dir()) / key / GRAPH_FILE
+
+
+@contextmanager
+def mapped(path: Path) -> Iterator[memoryview]:
+    """Read-only memory map of *path* (parsed without an extra copy)."""
+    with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        view = memoryview(mm)
+        try:
+            yield view
+        finally:
+            view.release()
+
+
+def store(key: str, graph_bytes: bytes, manifest: dict, root: Optional[Path] = None) -> bool:
+    """Write the entry for *key* and drop older ones.
+
+    The entry is written to a temp dir and renamed, so concurrent workers
+    never see a partial entry (the first rename wins).  Returns False if
+    the cache dir isn't writable.
+    """
+    root = root or cache_dir()
+    tmp = root / f".tmp-{key}-{os.getpid()}"
+    try:
+        tmp.mkdir(parents=True, exist_ok=True)
+        (tmp / GRAPH_FILE).write_bytes(graph_bytes)
+        (tmp / MANIFEST_FILE).write_text(json.dumps(dict(manifest, key=key), indent=2))
+        try:
+            os.rename(tmp, root / key)
+        except OSError:
+            shutil.rmtree(tmp, ignore_errors=True)   # another worker stored it first
+    except OSError as exc:
+        logger.warning("TM graph cache not written to %s: %s", root, exc)
+        shutil.rmtree(tmp, ignore_errors=True)
+        return False
+    for old in root.iterdir():
+        if old.is_dir() and old.name != key and not old.name.startswith(".tmp-"):
+            shutil.rmtree(old, ignore_errors=True)
+    return True
@@ -0,0 +1,204 @@
+"""Pluggable inference backends for the TM pose model.
+
+A backend turns preprocessed uint8 (B, 257, 257, 3) PoseNet inputs into
+TM features and class probabilities.  ``tm_model`` owns labels and the
+public predict API and delegates the numeric work to one backend, chosen
+by ``TM_BACKEND``:
+
+``tf``      PoseNet SavedModel / TF.js graph + Keras head, fused into one
+            TF1 graph (``tf_graph.TFBackend``).  Imports TensorFlow.
+``tflite``  The PoseNet and head ``.tflite`` files written by
+            ``export_tm_model.py`` / ``quantize_tm_model.py``, run by the
+            standalone LiteRT interpreter (``ai-edge-litert`` or
+            ``tflite-runtime``).  Does NOT import TensorFlow, so worker
+            startup and per-process RSS drop sharply; if neither runtime
+            is installed it falls back to ``tf.lite``.
+
+This module itself never imports TensorFlow.
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from pathlib import Path
+from typing import Callable, Dict, Optional
+
+import numpy as np
+
+from app import resources, settings
+
+logger = logging.getLogger(__name__)
+
+# ── Paths ──────────────────────────────────────────────────────────────────
+BASE_DIR = Path(__file__).resolve().parent.parent.parent  # backend/
+TM_DIR = BASE_DIR / "tm_model"
+POSENET_DIR = TM_DIR / "posenet"
+POSENET_SAVED = TM_DIR / "posenet_saved"
+CLASSIFIER_H5 = TM_DIR / "tm_classifier.h5"
+METADATA_JSON = TM_DIR / "metadata.json"
+QUANT_DIR = TM_DIR / "quantized"  # written by export / quantize tools
+
+QUANT_VARIANTS = ("float32", "float16", "int8")
+FEATURE_DIM = 14739  # 17×17×17 heatmaps + 17×17×34 offsets
+
+
+def tflite_path(model: str, variant: str) -> Path:
+    """Where the export tools write *model* ("posenet" / "head")."""
+    return QUANT_DIR / f"{model}_{variant}.tflite"
+
+
+class TMBackend:
+    """Interface every TM inference backend implements."""
+
+    name = ""
+
+    def __init__(self):
+        # Per-component load times in ms (merged into /readyz)
+        self.load_times_ms: Dict[str, float] = {}
+
+    @staticmethod
+    def available() -> bool:
+        """True if this backend's model files exist (without loading them)."""
+        raise NotImplementedError
+
+    def features(self, inputs_u8: np.ndarray) -> np.ndarray:
+        """(B, 257, 257, 3) uint8 → (B, 14739) float32 TM features."""
+        raise NotImplementedError
+
+    def probs(self, inputs_u8: np.ndarray) -> np.ndarray:
+        """(B, 257, 257, 3) uint8 → (B, num_classes) class probabilities."""
+        raise NotImplementedError
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# TFLite (LiteRT) backend
+# ═══════════════════════════════════════════════════════════════════════════
+
+def _interpreter_class():
+    """Standalone LiteRT interpreter if installed, else ``tf.lite``."""
+    try:
+        from ai_edge_litert.interpreter import Interpreter
+        return Interpreter
+    except ImportError:
+        pass
+    try:
+        from tflite_runtime.interpreter import Interpreter
+        return Interpreter
+    except ImportError:
+        pass
+    logger.warning("ai-edge-litert / tflite-runtime not installed – using tf.lite (imports TensorFlow)")
+    import tensorflow as tf
+    return tf.lite.Interpreter
+
+
+class TFLiteRunner:
+    """One single-input / single-output TFLite model.
+
+    The batch dimension is resized on demand (tensors are only
+    re-allocated when the batch size changes).  Interpreters are not
+    thread-safe, so ``__call__`` is serialised.
+    """
+
+    def __init__(self, path: Path):
+        self.path = path
+        self._interp = _interpreter_class()(
+            model_path=str(path), num_threads=resources.get_plan().tflite_threads
+        )
+        self._input = self._interp.get_input_details()[0]
+        self._output = self._interp.get_output_details()[0]["index"]
+        self._batch = 0
+        self._lock = threading.Lock()
+
+    def __call__(self, batch: np.ndarray) -> np.ndarray:
+        batch = np.ascontiguousarray(batch, dtype=self._input["dtype"])
+        with self._lock:
+            if len(batch) != self._batch:
+                self._interp.resize_tensor_input(self._input["index"], batch.shape)
+                self._interp.allocate_tensors()
+                self._batch = len(batch)
+            self._interp.set_tensor(self._input["index"], batch)
+            self._interp.invoke()
+            return self._interp.get_tensor(self._output)
+
+
+class TFLiteBackend(TMBackend):
+    """PoseNet + head as two TFLite models (TM_TFLITE_POSENET / TM_TFLITE_HEAD)."""
+
+    name = "tflite"
+
+    def __init__(self, posenet_variant: Optional[str] = None, head_variant: Optional[str] = None):
+        super().__init__()
+        t0 = time.perf_counter()
+        paths = self._paths(posenet_variant, head_variant)
+        self.posenet, self.head = (TFLiteRunner(p) for p in paths)
+        self.load_times_ms["tflite_load"] = (time.perf_counter() - t0) * 1000
+        logger.info("TM TFLite backend: %s + %s", *(p.name for p in paths))
+
+    @staticmethod
+    def _paths(posenet_variant: Optional[str] = None, head_variant: Optional[str] = None):
+        return (
+            tflite_path("posenet", posenet_variant or settings.TM_TFLITE_POSENET),
+            tflite_path("head", head_variant or settings.TM_TFLITE_HEAD),
+        )
+
+    @staticmethod
+    def available() -> bool:
+        return all(p.exists() for p in TFLiteBackend._paths())
+
+    def features(self, inputs_u8: np.ndarray) -> np.ndarray:
+        return self.posenet(inputs_u8)
+
+    def probs(self, inputs_u8: np.ndarray) -> np.ndarray:
+        return self.head(self.posenet(inputs_u8))
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# Registry
+# ═══════════════════════════════════════════════════════════════════════════
+
+def _tf_backend() -> TMBackend:
+    from app.recognition.tf_graph import TFBackend
+    return TFBackend()
+
+
+def _tf_available() -> bool:
+    return CLASSIFIER_H5.exists() and (
+        POSENET_SAVED.exists() or (POSENET_DIR / "model.json").exists()
+    )
+
+
+BACKENDS: Dict[str, Callable[[], TMBackend]] = {
+    "tf": _tf_backend,
+    "tflite": TFLiteBackend,
+}
+_AVAILABLE: Dict[str, Callable[[], bool]] = {
+    "tf": _tf_available,
+    "tflite": TFLiteBackend.available,
+}
+
+
+def resolve_backend(name: Optional[str] = None) -> str:
+    """The backend ``load_backend(name)`` will use (``tf`` as fallback)."""
+    name = (name or settings.TM_BACKEND).strip().lower()
+    if name not in BACKENDS:
+        logger.warning("Unknown TM_BACKEND %r – using 'tf'", name)
+        return "tf"
+    if name != "tf" and not _AVAILABLE[name]():
+        logger.warning(
+            "TM_BACKEND=%s but its model files are missing (run export_tm_model.py) – using 'tf'",
+            name,
+        )
+        return "tf"
+    return name
+
+
+def is_available(name: Optional[str] = None) -> bool:
+    """True if the model files for the resolved backend exist."""
+    return METADATA_JSON.exists() and _AVAILABLE[resolve_backend(name)]()
+
+
+def load_backend(name: Optional[str] = None) -> TMBackend:
+    """Instantiate the configured backend (falls back to ``tf``)."""
+    return BACKENDS[resolve_backend(name)]()
@@ -0,0 +1,126 @@
+"""Cross-session micro-batching for TM pose-model inference.
+
+Every session awaiting a TM prediction submits its preprocessed PoseNet
+input (``cv.preprocess.posenet_input``) here.  Pending inputs are
+collected for a short window (``TM_BATCH_WINDOW_MS``) or until
+``TM_BATCH_MAX`` are queued, then run as ONE batched PoseNet
+``session.run`` + ONE classifier-head call on the "recognition" executor
+stage.  Each submitter's future is resolved with its own result.
+
+On CPU a batch of B MobileNet inputs costs far less than B single-frame
+runs, so this is what lets one core serve many concurrent signers.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from typing import Any, Callable, Coroutine, List, Optional, Set, Tuple
+
+from app import settings
+from app.pipeline.executor import run_stage
+
+logger = logging.getLogger(__name__)
+
+
+class InferenceBatcher:
+    """Collects items across coroutines and runs them as one batch."""
+
+    def __init__(
+        self,
+        infer_batch: Callable[[list], list],
+        max_batch: int = 8,
+        window_ms: float = 10.0,
+        stage: str = "recognition",
+    ):
+        self.infer_batch = infer_batch
+        self.max_batch = max(1, max_batch)
+        self.window_s = max(0.0, window_ms) / 1000.0
+        self.stage = stage
+        self._pending: List[Tuple[Any, asyncio.Future]] = []
+        self._timer: Optional[asyncio.Task] = None
+        # The loop only keeps weak references to tasks
+        self._tasks: Set[asyncio.Task] = set()
+        # Simple counters for sizing the window
+        self.batches = 0
+        self.items = 0
+
+    async def submit(self, item: Any) -> Any:
+        """Queue *item* and wait for its result from the next batch."""
+        fut = asyncio.get_running_loop().create_future()
+        self._pending.append((item, fut))
+        if len(self._pending) >= self.max_batch:
+            self._flush_now()
+        elif self._timer is None:
+            self._timer = self._spawn(self._flush_later())
+        return await fut
+
+    def _spawn(self, coro: Coroutine) -> asyncio.Task:
+        task = asyncio.create_task(coro)
+        self._tasks.add(task)
+        task.add_done_callback(self._task_done)
+        return task
+
+    def _task_done(self, task: asyncio.Task) -> None:
+        self._tasks.discard(task)
+        if not task.cancelled() and task.exception() is not None:
+            logger.error("TM batch task failed", exc_info=task.exception())
+
+    async def _flush_later(self) -> None:
+        await asyncio.sleep(self.window_s)
+        self._timer = None
+        if self._pending:
+            await self._run(self._take())
+
+    def _flush_now(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        self._spawn(self._run(self._take()))
+
+    def _take(self) -> List[Tuple[Any, asyncio.Future]]:
+        batch = self._pending[: self.max_batch]
+        self._pending = self._pending[self.max_batch :]
+        if self._pending and self._timer is None:
+            self._timer = self._spawn(self._flush_later())
+        return batch
+
+    async def _run(self, batch: List[Tuple[Any, asyncio.Future]]) -> None:
+        items = [item for item, _ in batch]
+        try:
+            results = await run_stage(self.stage, self.infer_batch, items)
+        except Exception as exc:
+            for _, fut in batch:
+                if not fut.done():
+                    fut.set_exception(exc)
+            return
+        self.batches += 1
+        self.items += len(items)
+        for (_, fut), result in zip(batch, results):
+            if not fut.done():
+                fut.set_result(result)
+
+
+_tm_batcher: Optional[InferenceBatcher] = None
+
+
+def get_tm_batcher() -> InferenceBatcher:
+    """Shared batcher for ``tm_model.input_probs`` (created lazily).
+
+    ``submit(tm_input)`` takes a preprocessed uint8 PoseNet input and
+    resolves to its probability vector.
+    """
+    global _tm_batcher
+    if _tm_batcher is None:
+        from app.recognition.tm_model import input_probs
+
+        _tm_batcher = InferenceBatcher(
+            input_probs,
+            max_batch=settings.TM_BATCH_MAX,
+            window_ms=settings.TM_BATCH_WINDOW_MS,
+        )
+        logger.info(
+            "TM micro-batcher: max_batch=%d window=%.0fms",
+            settings.TM_BATCH_MAX, settings.TM_BATCH_WINDOW_MS,
+        )
+    return _tm_batcher
@@ -16,8 +16,10 @@ from __future__ import annotations
 
 import logging
 import numpy as np
-from typing import TYPE_CHECKING, List, Optional
+from itertools import count
+from typing import TYPE_CHECKING, List, Optional, Tuple
 
+from app.cv import landmark_stages
 from app.recognition.phrase_set import PHRASES
 
 if TYPE_CHECKING:
@@ -46,6 +48,11 @@ MCP_JOINTS   = [INDEX_MCP, MIDDLE_MCP, RING_MCP, PINKY_MCP]
 L_SHOULDER   = 11
 R_SHOULDER   = 12
 
+# Prototype features read the hands and the two shoulder points only
+landmark_stages.require(
+    "classifier", "hands", "pose", keypoints={"pose": (L_SHOULDER, R_SHOULDER)}
+)
+
 # ── Prototype feature vectors (7-D, every dim in 0-1) ─────────────────────
 # Dimensions:
 #   0  inter_hand_dist   – wrist-to-wrist distance (0 = overlapping, 1 = full frame width)
@@ -83,196 +90,126 @@ _EMA_ALPHA = 0.4      # blend factor: 0 = fully smooth, 1 = no smoothing
 _ema_state: dict[str, np.ndarray] = {}     # session_id → smoothed features
 
 
-def _ema_smooth(features: np.ndarray, session_id: str = "default") -> np.ndarray:
-    """Apply EMA smoothing to a feature vector."""
-    if session_id not in _ema_state or np.allclose(features, 0.0):
-        _ema_state[session_id] = features.copy()
-        return features
-    prev = _ema_state[session_id]
-    smoothed = _EMA_ALPHA * features + (1.0 - _EMA_ALPHA) * prev
-    _ema_state[session_id] = smoothed
-    return smoothed
+def _ema_smooth(
+    features: np.ndarray, session_id: str = "default", state=None
+) -> np.ndarray:
+    """Apply EMA smoothing to a feature vector.
+
+    When *state* (a ``SessionState``) is given its ``ema`` slot holds the
+    running value instead of the module-level ``_ema_state`` dict.
+    """
+    prev = _ema_state.get(session_id) if state is None else state.ema
+    if prev is None or np.allclose(features, 0.0):
+        smoothed = features.copy()
+        result = features
+    else:
+        smoothed = result = _EMA_ALPHA * features + (1.0 - _EMA_ALPHA) * prev
+    if state is None:
+        _ema_state[session_id] = smoothed
+    else:
+        state.ema = smoothed
+    return result
 
 
 # ═══════════════════════════════════════════════════════════════════════════
-# Helpers
+# Feature extraction
 # ═══════════════════════════════════════════════════════════════════════════
 
-def _kp_xy(hand: list, idx: int) -> Optional[np.ndarray]:
-    """Return [x, y] for a keypoint index, or None."""
-    try:
-        kp = hand[idx]
-        return np.array([kp[0], kp[1]], dtype=np.float64)
-    except (IndexError, TypeError):
-        return None
+N_FEAT = 7
 
+_PALM_IDX = [WRIST] + MCP_JOINTS
+# Each finger is 4 consecutive keypoints: MCP, PIP, DIP, TIP
+_FINGER_IDX = np.array([[b, b + 1, b + 2, b + 3] for b in MCP_JOINTS])
 
-def _avg_fingertip_spread(hand: list) -> float:
-    """Average distance from each fingertip to wrist, normalised ~0-1."""
-    wrist = _kp_xy(hand, WRIST)
-    if wrist is None:
-        return 0.0
-    dists: list[float] = []
-    for tip_idx in FINGERTIPS:
-        tip = _kp_xy(hand, tip_idx)
-        if tip is not None:
-            dists.append(float(np.linalg.norm(tip - wrist)))
-    return float(np.mean(dists)) if dists else 0.0
 
+def _norm(v: np.ndarray) -> np.ndarray:
+    return np.sqrt(np.sum(v * v, axis=-1))
 
-def _finger_curl(hand: list) -> float:
-    """Average finger curl (0 = straight / extended, 1 = fully curled).
 
-    Measured as  1 - (tip_to_mcp / max_finger_len)  per finger.
-    max_finger_len is the sum of bone lengths MCP→PIP→DIP→TIP when the finger
-    is fully extended.  When curled the tip folds back towards the MCP, so
-    tip_to_mcp shrinks.  This avoids the wrist-reference problem where the
-    tip is always further from the wrist than the MCP.
-    """
-    curls: list[float] = []
-    # Each finger is 4 consecutive keypoints: MCP, PIP, DIP, TIP
-    # Index: 5-8, Middle: 9-12, Ring: 13-16, Pinky: 17-20
-    for base in [5, 9, 13, 17]:
-        pts = []
-        for j in range(4):
-            p = _kp_xy(hand, base + j)
-            if p is None:
-                break
-            pts.append(p)
-        if len(pts) < 4:
-            continue
-        # max_len = sum of bone lengths (fully extended straight line)
-        max_len = sum(
-            float(np.linalg.norm(pts[i + 1] - pts[i])) for i in range(3)
-        )
-        if max_len < 1e-6:
-            continue
-        # tip_to_mcp = straight-line distance MCP→TIP
-        tip_to_mcp = float(np.linalg.norm(pts[3] - pts[0]))
-        # When straight: tip_to_mcp ≈ max_len → curl ≈ 0
-        # When curled:   tip_to_mcp << max_len → curl → 1
-        curls.append(np.clip(1.0 - tip_to_mcp / max_len, 0.0, 1.0))
-    return float(np.mean(curls)) if curls else 0.5
-
-
-def _palm_centre(hand: list) -> Optional[np.ndarray]:
-    """Return [x, y] of the palm centre (avg of wrist + 4 MCP joints).
-
-    More stable than wrist alone because it averages out tracking jitter.
-    """
-    pts: list[np.ndarray] = []
-    for idx in [WRIST] + MCP_JOINTS:
-        p = _kp_xy(hand, idx)
-        if p is not None:
-            pts.append(p)
-    if not pts:
-        return None
-    return np.mean(pts, axis=0)
+def _masked_mean(values: np.ndarray, mask: np.ndarray, default: float, axis) -> np.ndarray:
+    count = mask.sum(axis=axis)
+    total = np.where(mask, values, 0.0).sum(axis=axis)
+    return np.where(count > 0, total / np.maximum(count, 1), default)
 
 
-def _shoulder_midpoint_y(frame: "LandmarkFrame") -> Optional[float]:
-    """Return Y of the midpoint between left and right shoulder, or None."""
-    if frame.pose is None or len(frame.pose) < 13:
-        return None
-    try:
-        ly = frame.pose[L_SHOULDER][1]
-        ry = frame.pose[R_SHOULDER][1]
-        return (ly + ry) / 2.0
-    except (IndexError, TypeError):
-        return None
-
-
-# ═══════════════════════════════════════════════════════════════════════════
-# Feature extraction
-# ═══════════════════════════════════════════════════════════════════════════
+def features_from_arrays(
+    hand_xyz: np.ndarray,
+    hand_mask: np.ndarray,
+    pose_xyz: np.ndarray,
+    pose_mask: np.ndarray,
+) -> np.ndarray:
+    """Vectorized 7-D features for a stack of N windows of T frames.
 
-def extract_features(window: "LandmarkWindow") -> np.ndarray:
-    """Extract a 7-D normalised feature vector from a LandmarkWindow.
+    Parameters
+    ----------
+    hand_xyz  : (N, T, 2, 21, 3)    hand_mask : (N, T, 2) bool
+    pose_xyz  : (N, T, 33, 3)       pose_mask : (N, T) bool
 
-    Returns np.zeros(7) when there is no usable hand data.
+    Returns
+    -------
+    np.ndarray  (N, 7) – same values as the per-frame loop; rows for
+    windows without any hand data are zeros.
     """
-    N_FEAT = 7
-    if not window or not window.frames:
-        return np.zeros(N_FEAT)
+    mask = np.asarray(hand_mask, dtype=bool)
+    n, t = mask.shape[:2]
+    if n == 0 or t == 0:
+        return np.zeros((n, N_FEAT))
 
-    frames_with_hands = [
-        f for f in window.frames
-        if f.hands is not None and len(f.hands) >= 1
-    ]
-    if not frames_with_hands:
-        return np.zeros(N_FEAT)
+    xy = np.asarray(hand_xyz)[..., :2].astype(np.float64)      # (N, T, 2, 21, 2)
+    hand_frames = mask[..., 0]                                  # (N, T) ≥ 1 hand
+    mask = mask & hand_frames[..., None]
 
-    # ── Feature 0: inter-hand distance (wrist-to-wrist, avg over window) ──
-    inter_dists: list[float] = []
-    for f in frames_with_hands:
-        if len(f.hands) >= 2:
-            w0 = _kp_xy(f.hands[0], WRIST)
-            w1 = _kp_xy(f.hands[1], WRIST)
-            if w0 is not None and w1 is not None:
-                inter_dists.append(float(np.linalg.norm(w1 - w0)))
-    feat_inter_hand = float(np.mean(inter_dists)) if inter_dists else 0.0
-    feat_inter_hand = np.clip(feat_inter_hand, 0.0, 1.0)
+    # ── Feature 0: inter-hand distance (frames with two hands) ────────────
+    inter = _norm(xy[:, :, 1, WRIST] - xy[:, :, 0, WRIST])
+    feat_inter_hand = np.clip(_masked_mean(inter, mask[..., 1], 0.0, axis=1), 0.0, 1.0)
 
     # ── Feature 1: hand height relative to shoulders ──────────────────────
-    # lower value = hands above shoulders, higher = below
-    rel_heights: list[float] = []
-    for f in frames_with_hands:
-        shoulder_y = _shoulder_midpoint_y(f)
-        for hand in f.hands[:2]:
-            wrist = _kp_xy(hand, WRIST)
-            if wrist is not None:
-                if shoulder_y is not None:
-                    # positive = hands below shoulder
-                    rel_heights.append(wrist[1] - shoulder_y + 0.5)
-                else:
-                    # fallback: raw Y (0 = top of frame, 1 = bottom)
-                    rel_heights.append(wrist[1])
-    feat_hand_height = float(np.mean(rel_heights)) if rel_heights else 0.5
-    feat_hand_height = np.clip(feat_hand_height, 0.0, 1.0)
-
-    # ── Feature 2: fingertip spread (open hand vs fist) ───────────────────
-    spreads: list[float] = []
-    for f in frames_with_hands:
-        for hand in f.hands[:2]:
-            spreads.append(_avg_fingertip_spread(hand))
-    feat_spread = float(np.mean(spreads)) if spreads else 0.0
-    # Spread is already in 0-~0.4 range for normalised coords; rescale
-    feat_spread = np.clip(feat_spread / 0.35, 0.0, 1.0)
-
-    # ── Feature 3 & 4: motion magnitude & speed ──────────────────────────
-    # Use palm centre (avg wrist+MCPs) for more stable tracking than wrist alone
-    displacements: list[float] = []
-    dy_fracs: list[float] = []
-    for i in range(len(frames_with_hands) - 1):
-        curr_hands = frames_with_hands[i].hands
-        next_hands = frames_with_hands[i + 1].hands
-        for h_idx in range(min(len(curr_hands), len(next_hands))):
-            cp = _palm_centre(curr_hands[h_idx])
-            np_ = _palm_centre(next_hands[h_idx])
-            if cp is not None and np_ is not None:
-                diff = np_ - cp
-                d = float(np.linalg.norm(diff))
-                displacements.append(d)
-                if d > 1e-6:
-                    dy_fracs.append(abs(diff[1]) / d)
-
-    total_motion = sum(displacements)
-    feat_motion = np.clip(total_motion / 1.2, 0.0, 1.0)   # wider range for real data
-
-    n_steps = max(1, len(displacements))
+    pose_y = np.asarray(pose_xyz)[..., 1].astype(np.float64)   # (N, T, 33)
+    shoulder_y = (pose_y[..., L_SHOULDER] + pose_y[..., R_SHOULDER]) / 2.0
+    wrist_y = xy[..., WRIST, 1]                                 # (N, T, 2)
+    rel = np.where(
+        np.asarray(pose_mask, dtype=bool)[..., None],
+        wrist_y - shoulder_y[..., None] + 0.5,
+        wrist_y,
+    )
+    feat_hand_height = np.clip(_masked_mean(rel, mask, 0.5, axis=(1, 2)), 0.0, 1.0)
+
+    # ── Feature 2: fingertip spread ───────────────────────────────────────
+    spread = _norm(xy[..., FINGERTIPS, :] - xy[..., WRIST:WRIST + 1, :]).mean(axis=-1)
+    feat_spread = np.clip(_masked_mean(spread, mask, 0.0, axis=(1, 2)) / 0.35, 0.0, 1.0)
+
+    # ── Feature 3, 4, 5: palm-centre motion between consecutive hand-frames
+    palm = xy[..., _PALM_IDX, :].mean(axis=-2)                 # (N, T, 2, 2)
+    frame_idx = np.where(hand_frames, np.arange(t), t)
+    # next hand-frame after each frame (t = none)
+    nxt = np.minimum.accumulate(frame_idx[:, ::-1], axis=1)[:, ::-1]
+    nxt = np.concatenate([nxt[:, 1:], np.full((n, 1), t)], axis=1)
+    nxt_c = np.minimum(nxt, t - 1)
+    palm_next = np.take_along_axis(palm, nxt_c[:, :, None, None], axis=1)
+    mask_next = np.take_along_axis(mask, nxt_c[:, :, None], axis=1)
+    pairs = mask & mask_next & (nxt < t)[..., None]             # (N, T, 2)
+
+    diff = palm_next - palm
+    disp = _norm(diff)
+    total_motion = np.where(pairs, disp, 0.0).sum(axis=(1, 2))
+    n_steps = np.maximum(1, pairs.sum(axis=(1, 2)))
+    feat_motion = np.clip(total_motion / 1.2, 0.0, 1.0)
     feat_speed = np.clip((total_motion / n_steps) / 0.15, 0.0, 1.0)
 
-    # ── Feature 5: vertical-motion fraction ───────────────────────────────
-    feat_vert = float(np.mean(dy_fracs)) if dy_fracs else 0.5
+    moving = pairs & (disp > 1e-6)
+    dy_frac = np.abs(diff[..., 1]) / np.where(moving, disp, 1.0)
+    feat_vert = _masked_mean(dy_frac, moving, 0.5, axis=(1, 2))
 
-    # ── Feature 6: finger curl (replaces noisy symmetry metric) ───────────
-    curls: list[float] = []
-    for f in frames_with_hands:
-        for hand in f.hands[:2]:
-            curls.append(_finger_curl(hand))
-    feat_curl = float(np.mean(curls)) if curls else 0.5
+    # ── Feature 6: finger curl ────────────────────────────────────────────
+    fingers = xy[..., _FINGER_IDX, :]                          # (N, T, 2, 4, 4, 2)
+    max_len = _norm(np.diff(fingers, axis=-2)).sum(axis=-1)    # (N, T, 2, 4)
+    tip_to_mcp = _norm(fingers[..., 3, :] - fingers[..., 0, :])
+    ok = max_len >= 1e-6
+    curl = np.clip(1.0 - tip_to_mcp / np.where(ok, max_len, 1.0), 0.0, 1.0)
+    hand_curl = _masked_mean(curl, ok, 0.5, axis=-1)           # (N, T, 2)
+    feat_curl = _masked_mean(hand_curl, mask, 0.5, axis=(1, 2))
 
-    return np.array([
+    out = np.stack([
         feat_inter_hand,
         feat_hand_height,
         feat_spread,
@@ -280,23 +217,54 @@ def extract_features(window: "LandmarkWindow") -> np.ndarray:
         feat_speed,
         feat_vert,
         feat_curl,
-    ])
+    ], axis=1)
+    out[~hand_frames.any(axis=1)] = 0.0
+    return out
 
 
-def _wrist_disp(hand_a: list, hand_b: list) -> Optional[float]:
-    """Wrist displacement between two hand snapshots."""
-    wa = _kp_xy(hand_a, WRIST)
-    wb = _kp_xy(hand_b, WRIST)
-    if wa is None or wb is None:
-        return None
-    return float(np.linalg.norm(wb - wa))
+def extract_features(window: "LandmarkWindow") -> np.ndarray:
+    """Extract a 7-D normalised feature vector from a LandmarkWindow.
+
+    Returns np.zeros(7) when there is no usable hand data.  Uses the
+    window's precomputed ``features`` when present.
+    """
+    if not window or not window.frames:
+        return np.zeros(N_FEAT)
+    if window.features is not None:
+        return window.features.copy()
+    return features_from_arrays(
+        window.hand_xyz[None], window.hand_mask[None],
+        window.pose_xyz[None], window.pose_mask[None],
+    )[0]
+
+
+def extract_features_batch(windows: List["LandmarkWindow"]) -> np.ndarray:
+    """Features for many windows at once (offline calibration / evaluation).
+
+    Windows of different lengths are padded with hand-less frames, which
+    does not change their features.  Returns an (N, 7) array.
+    """
+    t = max((len(w.frames) for w in windows), default=0)
+    n = len(windows)
+    hand_xyz = np.zeros((n, t, 2, 21, 3), dtype=np.float32)
+    hand_mask = np.zeros((n, t, 2), dtype=bool)
+    pose_xyz = np.zeros((n, t, 33, 3), dtype=np.float32)
+    pose_mask = np.zeros((n, t), dtype=bool)
+    for i, w in enumerate(windows):
+        k = len(w.frames)
+        if k:
+            hand_xyz[i, :k] = w.hand_xyz
+            hand_mask[i, :k] = w.hand_mask
+            pose_xyz[i, :k] = w.pose_xyz
+            pose_mask[i, :k] = w.pose_mask
+    return features_from_arrays(hand_xyz, hand_mask, pose_xyz, pose_mask)
 
 
 # ═══════════════════════════════════════════════════════════════════════════
 # Classification
 # ═══════════════════════════════════════════════════════════════════════════
 
-def predict(window: "LandmarkWindow", session_id: str = "default") -> dict:
+def predict(window: "LandmarkWindow", session_id: str = "default", state=None) -> dict:
     """Classify a LandmarkWindow into one of the known phrase tokens.
 
     Returns
@@ -304,10 +272,17 @@ def predict(window: "LandmarkWindow", session_id: str = "default") -> dict:
     dict  with keys  token, confidence, top2, ts
         Exactly the interface Member 4 / the translator expects.
     """
+    return _predict_prototype(window, session_id=session_id, state=state)[0]
+
+
+def _predict_prototype(
+    window: "LandmarkWindow", session_id: str = "default", state=None
+) -> Tuple[dict, float]:
+    """``predict`` plus the top-2 distance margin (used by the cascade)."""
     features = extract_features(window)
 
     # Apply EMA temporal smoothing on the feature vector
-    features = _ema_smooth(features, session_id=session_id)
+    features = _ema_smooth(features, session_id=session_id, state=state)
 
     # Weighted Euclidean distance — discriminative features count more
     distances = {
@@ -325,17 +300,16 @@ def predict(window: "LandmarkWindow", session_id: str = "default") -> dict:
     confidence = max(0.10, 1.0 - norm_dist)
 
     # Penalise when top two are very close (ambiguous)
-    if len(sorted_preds) >= 2:
-        gap = sorted_preds[1][1] - top_dist
-        if gap < 0.05:  # nearly tied
-            confidence *= 0.75
+    gap = sorted_preds[1][1] - top_dist if len(sorted_preds) >= 2 else float("inf")
+    if gap < 0.05:  # nearly tied
+        confidence *= 0.75
 
     return {
         "token": top_token,
         "confidence": round(confidence, 4),
         "top2": [top_token, second_token],
         "ts": window.ts_end,
-    }
+    }, gap
 
 
 # ═══════════════════════════════════════════════════════════════════════════
@@ -358,41 +332,162 @@ def _check_tm_available() -> bool:
     return _tm_available
 
 
-def predict_with_tm(
+async def prepare_tm_input(frame_bgr, state) -> Optional[np.ndarray]:
+    """Preprocess *frame_bgr* into the session's PoseNet input ring.
+
+    Returns the filled ``InputRing`` slot (a view), or None when the TM
+    model is unavailable.  After this the raw frame is no longer needed.
+    """
+    if frame_bgr is None or not _check_tm_available():
+        return None
+    from app.cv.preprocess import posenet_input
+    from app.pipeline.executor import run_stage
+
+    await run_stage("decode", posenet_input, frame_bgr, state.tm_inputs.next_slot())
+    return state.tm_inputs.commit()
+
+
+async def _tm_input_probs(tm_input: np.ndarray) -> np.ndarray:
+    """TM class probabilities for one preprocessed input, batched across sessions."""
+    from app import settings
+    from app.pipeline.executor import run_stage
+
+    if settings.TM_BATCH_MAX <= 1:
+        from app.recognition.tm_model import input_probs
+        return (await run_stage("recognition", input_probs, [tm_input]))[0]
+    from app.recognition.batcher import get_tm_batcher
+    return await get_tm_batcher().submit(tm_input)
+
+
+async def cache_tm_probs(tm_input: np.ndarray, state) -> None:
+    """Run TM on one incoming frame and cache its probabilities (TM_FUSION).
+
+    Called for every frame with an image, so each frame costs exactly one
+    PoseNet pass no matter how many overlapping windows it ends up in.
+    """
+    if not _check_tm_available():
+        return
+    try:
+        state.tm_probs.append(await _tm_input_probs(tm_input))
+    except Exception as exc:
+        logger.warning("TM model failed on frame, not cached: %s", exc)
+
+
+async def _predict_tm_async(tm_inputs: list, ts: int, state=None) -> Optional[dict]:
+    """TM prediction for the window; None if it fails.
+
+    With ``TM_FUSION`` = mean / max / recency and a session *state*, the
+    session's cached per-frame probabilities are fused; otherwise the
+    newest input is classified.
+    """
+    from app import settings
+    from app.recognition.fusion import active_method, fuse_probs
+    from app.recognition.tm_model import result_from_probs
+
+    try:
+        method = active_method()
+        if method != "last" and state is not None and len(state.tm_probs):
+            probs = fuse_probs(state.tm_probs.latest(), method, settings.TM_FUSION_DECAY)
+        else:
+            probs = await _tm_input_probs(tm_inputs[-1])
+        result = result_from_probs(probs)
+    except Exception as exc:
+        logger.warning("TM model failed, falling back to prototype: %s", exc)
+        return None
+    result["ts"] = ts
+    logger.debug(
+        "TM predict: token=%s  conf=%.3f",
+        result["token"], result["confidence"],
+    )
+    return result
+
+
+async def predict_with_tm_async(
     window: "LandmarkWindow",
-    frames_bgr: list,
+    tm_inputs: list,
     session_id: str = "default",
     ts: int = 0,
+    state=None,
 ) -> dict:
     """Classify using the TM pose model (primary) with prototype fallback.
 
-    Parameters
-    ----------
-    window : LandmarkWindow
-        Landmark data from MediaPipe (used for prototype fallback).
-    frames_bgr : list[np.ndarray]
-        Raw BGR frames from the same window (used by TM model).
-    session_id : str
-        Per-session identifier for EMA state.
-    ts : int
-        Timestamp for the prediction.
-
-    Returns
-    -------
-    dict  with keys  token, confidence, top2, ts
+    *tm_inputs* are preprocessed PoseNet inputs (``prepare_tm_input``);
+    the newest is submitted to the cross-session micro-batcher
+    (``app.recognition.batcher``) so PoseNet batches are shared across
+    sessions, or run directly on the "recognition" executor stage when
+    ``TM_BATCH_MAX=1``; the prototype fallback runs on that stage too.  With ``TM_FUSION`` the session's cached per-frame
+    probabilities are fused instead, and with ``CASCADE=1`` the prototype
+    classifier goes first (see ``_predict_cascade``).
     """
-    if _check_tm_available() and frames_bgr:
-        try:
-            from app.recognition.tm_model import predict_window
-            result = predict_window(frames_bgr)
-            result["ts"] = ts
-            logger.debug(
-                "TM predict: token=%s  conf=%.3f",
-                result["token"], result["confidence"],
-            )
+    from app import settings
+    from app.pipeline.executor import run_stage
+
+    use_tm = _check_tm_available() and bool(tm_inputs)
+    if use_tm and settings.CASCADE:
+        return await _predict_cascade(window, tm_inputs, session_id, ts, state)
+
+    if use_tm:
+        result = await _predict_tm_async(tm_inputs, ts, state)
+        if result is not None:
             return result
-        except Exception as exc:
-            logger.warning("TM model failed, falling back to prototype: %s", exc)
 
-    # Fallback to prototype-based classifier
-    return predict(window, session_id=session_id)
+    return await run_stage(
+        "recognition", predict, window, session_id=session_id, state=state
+    )
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# Cascade: landmark prototype first, PoseNet only when it is unsure
+# ═══════════════════════════════════════════════════════════════════════════
+
+_audit_counter = count(1)
+
+
+async def _predict_cascade(
+    window: "LandmarkWindow",
+    tm_inputs: list,
+    session_id: str,
+    ts: int,
+    state,
+) -> dict:
+    """Accept the prototype prediction when it is confident, else run TM.
+
+    The prototype is accepted when its confidence is at least
+    ``CASCADE_MIN_CONFIDENCE`` and its top-2 distance margin at least
+    ``CASCADE_MIN_MARGIN``.  Every ``CASCADE_AUDIT_EVERY``-th accepted
+    window also runs TM (result discarded) so agreement between the two
+    stages stays measurable; escalated windows are always compared.
+    """
+    from app import metrics, settings
+
+    # Features come from the incremental engine → this is microseconds
+    cheap, margin = _predict_prototype(window, session_id=session_id, state=state)
+    cheap["ts"] = ts
+    accept = (
+        cheap["confidence"] >= settings.CASCADE_MIN_CONFIDENCE
+        and margin >= settings.CASCADE_MIN_MARGIN
+    )
+    audit = (
+        accept
+        and settings.CASCADE_AUDIT_EVERY > 0
+        and next(_audit_counter) % settings.CASCADE_AUDIT_EVERY == 0
+    )
+    if accept and not audit:
+        metrics.CASCADE_PROTOTYPE.inc()
+        return cheap
+
+    tm = await _predict_tm_async(tm_inputs, ts, state)
+    if tm is None:
+        metrics.CASCADE_PROTOTYPE.inc()
+        return cheap
+    agree = tm["token"] == cheap["token"]
+    (metrics.CASCADE_AGREE if agree else metrics.CASCADE_DISAGREE).inc()
+    if accept:
+        metrics.CASCADE_PROTOTYPE.inc()
+        return cheap
+    metrics.CASCADE_POSENET.inc()
+    logger.debug(
+        "cascade escalated: prototype=%s (conf=%.2f margin=%.3f) → TM=%s",
+        cheap["token"], cheap["confidence"], margin, tm["token"],
+    )
+    return tm
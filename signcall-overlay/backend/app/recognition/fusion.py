@@ -0,0 +1,102 @@
+"""Multi-frame fusion of cached TM class probabilities.
+
+With ``TM_FUSION`` set to ``mean`` / ``max`` / ``recency`` every incoming
+frame is run through PoseNet + TM head once and its probability vector is
+stored in the session's ``ProbRing``.  A window prediction is then a cheap
+aggregate over the cached rows, so overlapping windows reuse work and no
+raw frames have to be kept.  ``last`` keeps the original behaviour
+(classify only the newest frame, nothing cached).
+
+Caching runs TM on every frame before any gate, which would cancel the
+savings of ``CASCADE=1``; with the cascade on, ``active_method()`` is
+therefore always ``last``.
+"""
+
+from __future__ import annotations
+
+import logging
+from typing import Optional
+
+import numpy as np
+
+from app import settings
+
+logger = logging.getLogger(__name__)
+
+FUSION_METHODS = ("last", "mean", "max", "recency")
+_warned = False
+
+
+def active_method() -> str:
+    """Effective ``TM_FUSION`` (``last`` while ``CASCADE=1``)."""
+    global _warned
+    method = settings.TM_FUSION
+    if method != "last" and settings.CASCADE:
+        if not _warned:
+            _warned = True
+            logger.warning(
+                "TM_FUSION=%s runs TM on every frame, defeating CASCADE=1 – using 'last'", method
+            )
+        return "last"
+    return method
+
+
+def fuse_probs(probs: np.ndarray, method: str = "mean", decay: float = 0.7) -> np.ndarray:
+    """Aggregate (T, C) per-frame probabilities (oldest first) → (C,).
+
+    ``recency`` weights frame *i* by ``decay ** age`` (newest has age 0).
+    The result is renormalised to sum to 1.
+    """
+    if method == "last":
+        fused = probs[-1]
+    elif method == "max":
+        fused = probs.max(axis=0)
+    elif method == "recency":
+        weights = decay ** np.arange(len(probs) - 1, -1, -1, dtype=np.float32)
+        fused = weights @ probs
+    else:
+        fused = probs.mean(axis=0)
+    total = float(fused.sum())
+    return fused / total if total > 0 else fused
+
+
+class ProbRing:
+    """Fixed-capacity ring of float32 probability vectors, one per frame.
+
+    Rows are written twice (slot ``i`` and ``i + capacity``) so the newest
+    rows are always a contiguous slice.  Storage is allocated on the first
+    ``append`` because the class count comes from the loaded model.
+    """
+
+    __slots__ = ("capacity", "_probs", "_count")
+
+    def __init__(self, capacity: int):
+        self.capacity = capacity
+        self._probs: Optional[np.ndarray] = None
+        self._count = 0
+
+    def __len__(self) -> int:
+        return min(self._count, self.capacity)
+
+    @property
+    def nbytes(self) -> int:
+        return 0 if self._probs is None else self._probs.nbytes
+
+    def append(self, probs: np.ndarray) -> None:
+        if self._probs is None:
+            self._probs = np.zeros((2 * self.capacity, len(probs)), dtype=np.float32)
+        i = self._count % self.capacity
+        self._probs[i] = probs
+        self._probs[i + self.capacity] = probs
+        self._count += 1
+
+    def latest(self, n: Optional[int] = None) -> np.ndarray:
+        """View of the newest ``n`` rows (all cached rows by default), oldest first."""
+        n = len(self) if n is None else min(n, len(self))
+        if n == 0:
+            return np.zeros((0, 0), dtype=np.float32)
+        end = (self._count - 1) % self.capacity + self.capacity + 1
+        return self._probs[end - n : end]
+
+    def clear(self) -> None:
+        self._count = 0
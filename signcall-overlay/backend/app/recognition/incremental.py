@@ -0,0 +1,193 @@
+"""Incremental sliding-window features for the prototype classifier.
+
+``extract_features`` and ``is_signing`` rescan the whole window on every
+frame although only one frame entered and one left.  ``IncrementalFeatures``
+computes the per-frame quantities (wrist, palm centre, spread, curl,
+shoulder midpoint) once when a frame arrives and keeps running sums, so
+the 7-D feature vector and the signing decision for the current window
+are O(1) per frame regardless of the window length.
+
+Motion features pair each hand-frame with the previous hand-frame *in the
+window*; when the oldest hand-frame leaves, the pair it anchored is
+subtracted again.  Sums are rebuilt from the stored per-frame values every
+few windows so floating-point drift never accumulates.
+
+Results match ``classifier.extract_features`` / ``detector.is_signing``
+on the same window (up to float rounding).
+"""
+
+from __future__ import annotations
+
+from collections import deque
+from typing import Deque
+
+import numpy as np
+
+from app.cv import landmark_stages
+from app.cv.types import LandmarkFrame
+from app.recognition.classifier import (
+    FINGERTIPS, L_SHOULDER, N_FEAT, R_SHOULDER, WRIST, _FINGER_IDX, _PALM_IDX,
+)
+from app.recognition.detector import MIN_HAND_COVERAGE, MOTION_THRESHOLD
+
+# Per-frame stat vector layout (summed over the window)
+_FRAMES, _HAND_FRAMES = 0, 1
+_INTER, _INTER_N = 2, 3
+_HEIGHT, _HANDS = 4, 5
+_SPREAD, _CURL = 6, 7
+# Pair stats (this hand-frame vs the previous hand-frame in the window)
+_DISP, _DISP_N, _DY, _DY_N, _WRIST_MOTION = 8, 9, 10, 11, 12
+_PAIR = slice(_DISP, _WRIST_MOTION + 1)
+_N_STATS = 13
+
+_RESUM_WINDOWS = 8     # rebuild sums from scratch every N windows' worth of frames
+
+landmark_stages.require(
+    "incremental", "hands", "pose", keypoints={"pose": (L_SHOULDER, R_SHOULDER)}
+)
+
+
+def _norm(v: np.ndarray) -> np.ndarray:
+    return np.sqrt(np.sum(v * v, axis=-1))
+
+
+class _Entry:
+    __slots__ = ("stats", "mask", "palm", "wrist")
+
+    def __init__(self, stats: np.ndarray, mask, palm, wrist):
+        self.stats = stats
+        self.mask = mask
+        self.palm = palm
+        self.wrist = wrist
+
+
+class IncrementalFeatures:
+    """Running feature state for the newest ``window_size`` frames."""
+
+    def __init__(self, window_size: int):
+        self.window_size = window_size
+        self._entries: Deque[_Entry] = deque()
+        self._hand_entries: Deque[_Entry] = deque()
+        self._sums = np.zeros(_N_STATS)
+        self._pushes = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._hand_entries.clear()
+        self._sums[:] = 0.0
+
+    # ── per-frame work ────────────────────────────────────────────────────
+
+    @staticmethod
+    def _frame_entry(frame: LandmarkFrame) -> _Entry:
+        stats = np.zeros(_N_STATS)
+        stats[_FRAMES] = 1.0
+        mask = frame.hand_mask & frame.hand_mask[0]
+        if not mask[0]:
+            return _Entry(stats, mask, None, None)
+
+        xy = frame.hand_xyz[mask, :, :2].astype(np.float64)      # (H, 21, 2)
+        wrist = xy[:, WRIST]
+        stats[_HAND_FRAMES] = 1.0
+        stats[_HANDS] = len(xy)
+        if len(xy) > 1:
+            stats[_INTER] = _norm(wrist[1] - wrist[0])
+            stats[_INTER_N] = 1.0
+
+        if frame.pose_mask:
+            pose_y = frame.pose_xyz[:, 1].astype(np.float64)
+            shoulder_y = (pose_y[L_SHOULDER] + pose_y[R_SHOULDER]) / 2.0
+            stats[_HEIGHT] = (wrist[:, 1] - shoulder_y + 0.5).sum()
+        else:
+            stats[_HEIGHT] = wrist[:, 1].sum()
+
+        stats[_SPREAD] = _norm(xy[:, FINGERTIPS] - xy[:, WRIST:WRIST + 1]).mean(axis=-1).sum()
+
+        fingers = xy[:, _FINGER_IDX]                               # (H, 4, 4, 2)
+        max_len = _norm(np.diff(fingers, axis=-2)).sum(axis=-1)     # (H, 4)
+        tip_to_mcp = _norm(fingers[..., 3, :] - fingers[..., 0, :])
+        ok = max_len >= 1e-6
+        curl = np.clip(1.0 - tip_to_mcp / np.where(ok, max_len, 1.0), 0.0, 1.0)
+        n_ok = ok.sum(axis=-1)
+        hand_curl = np.where(n_ok > 0, np.where(ok, curl, 0.0).sum(axis=-1) / np.maximum(n_ok, 1), 0.5)
+        stats[_CURL] = hand_curl.sum()
+
+        return _Entry(stats, mask, xy[:, _PALM_IDX].mean(axis=-2), wrist)
+
+    @staticmethod
+    def _pair_stats(prev: _Entry, cur: _Entry) -> None:
+        """Fill *cur*'s pair stats from the hands present in both frames."""
+        n = min(len(prev.palm), len(cur.palm))
+        if n == 0:
+            return
+        diff = cur.palm[:n] - prev.palm[:n]
+        disp = _norm(diff)
+        moving = disp > 1e-6
+        s = cur.stats
+        s[_DISP] = disp.sum()
+        s[_DISP_N] = n
+        s[_DY] = (np.abs(diff[moving, 1]) / disp[moving]).sum()
+        s[_DY_N] = moving.sum()
+        s[_WRIST_MOTION] = _norm(cur.wrist[:n] - prev.wrist[:n]).sum()
+
+    def push(self, frame: LandmarkFrame) -> None:
+        """Slide the window forward by one frame."""
+        if len(self._entries) == self.window_size:
+            old = self._entries.popleft()
+            self._sums -= old.stats
+            if old.stats[_HAND_FRAMES]:
+                self._hand_entries.popleft()
+                if self._hand_entries:
+                    # The next hand-frame lost its predecessor
+                    nxt = self._hand_entries[0]
+                    self._sums[_PAIR] -= nxt.stats[_PAIR]
+                    nxt.stats[_PAIR] = 0.0
+
+        entry = self._frame_entry(frame)
+        if entry.stats[_HAND_FRAMES]:
+            if self._hand_entries:
+                self._pair_stats(self._hand_entries[-1], entry)
+            self._hand_entries.append(entry)
+        self._entries.append(entry)
+        self._sums += entry.stats
+
+        self._pushes += 1
+        if self._pushes % (_RESUM_WINDOWS * self.window_size) == 0:
+            self._sums = np.sum([e.stats for e in self._entries], axis=0)
+
+    # ── window results ────────────────────────────────────────────────────
+
+    def vector(self) -> np.ndarray:
+        """7-D features of the current window (see ``classifier.extract_features``)."""
+        s = self._sums
+        if not s[_HAND_FRAMES]:
+            return np.zeros(N_FEAT)
+
+        def mean(total: int, count: int, default: float) -> float:
+            return s[total] / s[count] if s[count] else default
+
+        total_motion = s[_DISP]
+        return np.array([
+            np.clip(mean(_INTER, _INTER_N, 0.0), 0.0, 1.0),
+            np.clip(mean(_HEIGHT, _HANDS, 0.5), 0.0, 1.0),
+            np.clip(mean(_SPREAD, _HANDS, 0.0) / 0.35, 0.0, 1.0),
+            np.clip(total_motion / 1.2, 0.0, 1.0),
+            np.clip((total_motion / max(1.0, s[_DISP_N])) / 0.15, 0.0, 1.0),
+            mean(_DY, _DY_N, 0.5),
+            mean(_CURL, _HANDS, 0.5),
+        ])
+
+    def is_signing(self) -> bool:
+        """Same decision as ``detector.is_signing`` on the current window."""
+        s = self._sums
+        n_frames = round(s[_FRAMES])
+        if n_frames < 2:
+            return False
+        if round(s[_HAND_FRAMES]) < max(2, int(n_frames * MIN_HAND_COVERAGE)):
+            return False
+        if not s[_DISP_N]:
+            return False
+        return s[_WRIST_MOTION] / s[_DISP_N] > MOTION_THRESHOLD
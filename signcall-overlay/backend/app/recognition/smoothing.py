@@ -6,9 +6,10 @@ exponential recency weighting.
 """
 
 from collections import deque
-from typing import Dict, Optional, Tuple
+from typing import Deque, Dict, Optional, Tuple
 
-# Global smoothing state (in production, should be per-session)
+# Global smoothing state, used when the caller does not pass its own
+# history (the orchestrator keeps one per SessionState)
 _prediction_history: Dict[str, deque] = {}   # stores (token, confidence) pairs
 SMOOTH_WINDOW_SIZE = 5  # Weighted vote over last 5 predictions
 
@@ -16,17 +17,22 @@ SMOOTH_WINDOW_SIZE = 5  # Weighted vote over last 5 predictions
 _RECENCY_WEIGHTS = [0.5, 0.6, 0.75, 0.9, 1.0]   # oldest → newest
 
 
-def smooth(pred: dict, session_id: str = "default") -> dict:
+def smooth(
+    pred: dict, session_id: str = "default", history: Optional[Deque] = None
+) -> dict:
     """
     Apply confidence-weighted majority-vote smoothing.
 
     Each past prediction votes with weight = confidence × recency_factor.
     The token with the highest total weighted vote wins.
-    """
-    if session_id not in _prediction_history:
-        _prediction_history[session_id] = deque(maxlen=SMOOTH_WINDOW_SIZE)
 
-    history = _prediction_history[session_id]
+    *history* (a ``deque(maxlen=SMOOTH_WINDOW_SIZE)``) overrides the
+    module-level per-session history when given.
+    """
+    if history is None:
+        if session_id not in _prediction_history:
+            _prediction_history[session_id] = deque(maxlen=SMOOTH_WINDOW_SIZE)
+        history = _prediction_history[session_id]
     current_token = pred["token"]
     current_conf  = pred["confidence"]
 
@@ -0,0 +1,360 @@
+"""TensorFlow backend for the TM pose model: one fused TF1 graph.
+
+The PoseNet graph (SavedModel, or TF.js ``model.json`` + shards) is
+re-imported with a batch-agnostic uint8 input, and the [-1, 1]
+normalisation, sigmoid(heatmaps) ‖ offsets feature layout and the Keras
+head's Dense layers are added around it, so ``TFBackend.probs`` is a
+single ``session.run`` from uint8 input to class probabilities with no
+NumPy round-trips.  ``TFBackend.reference_probs`` keeps the original
+step-by-step path (NumPy features + Keras head) for parity checks.
+
+The fused graph is cached on disk (``artifact_cache``); a warm start
+imports it directly and only loads the Keras head if something asks for
+it.
+
+Only imported when ``TM_BACKEND=tf`` (the default) or by the export tools.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+import time
+from pathlib import Path
+from typing import Optional
+
+import numpy as np
+
+os.environ["TF_CPP_MIN_LOG_LEVEL"] = "3"
+
+import tensorflow as tf
+from google.protobuf import json_format
+from tensorflow.core.framework import graph_pb2
+
+from app import resources, settings
+from app.cv.preprocess import POSENET_INPUT_SIZE
+from app.recognition import artifact_cache
+from app.recognition.backends import (
+    CLASSIFIER_H5, FEATURE_DIM, POSENET_DIR, POSENET_SAVED, TM_DIR, TMBackend, _tf_available,
+)
+
+logger = logging.getLogger(__name__)
+
+# Eager runtime (Keras head load) – must be set before the first TF op
+try:
+    tf.config.threading.set_intra_op_parallelism_threads(resources.get_plan().tf_intra)
+    tf.config.threading.set_inter_op_parallelism_threads(resources.get_plan().tf_inter)
+except RuntimeError:
+    logger.warning("TF runtime already initialised – eager thread counts unchanged")
+
+_INPUT_SIZE = POSENET_INPUT_SIZE  # PoseNet MobileNetV1 input resolution
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# Loader helpers
+# ═══════════════════════════════════════════════════════════════════════════
+
+def _load_posenet_from_tfjs() -> tuple:
+    """Load PoseNet from raw TF.js graph model files (model.json + shards)."""
+    model_json_path = POSENET_DIR / "model.json"
+    with open(model_json_path) as f:
+        model_json = json.load(f)
+
+    topology = model_json["modelTopology"]
+    manifest = model_json["weightsManifest"][0]
+
+    # Parse GraphDef from JSON
+    graph_def = json_format.ParseDict(topology, graph_pb2.GraphDef())
+
+    # Load weight shards
+    weight_data = b"".join(
+        (POSENET_DIR / shard_path).read_bytes() for shard_path in manifest["paths"]
+    )
+
+    # Parse individual weight arrays (views into weight_data, no copies)
+    weights = {}
+    offset = 0
+    for spec in manifest["weights"]:
+        shape = spec["shape"]
+        n = int(np.prod(shape))
+        weights[spec["name"]] = np.frombuffer(
+            weight_data, dtype=np.float32, count=n, offset=offset
+        ).reshape(shape)
+        offset += n * 4
+
+    # Inject weights into Const nodes
+    for node in graph_def.node:
+        if node.op == "Const" and node.name in weights:
+            tensor = tf.make_tensor_proto(weights[node.name])
+            node.attr["value"].tensor.CopyFrom(tensor)
+
+    # Build graph
+    g = tf.compat.v1.Graph()
+    with g.as_default():
+        tf.graph_util.import_graph_def(graph_def, name="")
+
+    sess = tf.compat.v1.Session(graph=g, config=resources.tf_session_config())
+    inp = g.get_tensor_by_name("sub_2:0")
+    hm = g.get_tensor_by_name("MobilenetV1/heatmap_2/BiasAdd:0")
+    off = g.get_tensor_by_name("MobilenetV1/offset_2/BiasAdd:0")
+    return sess, inp, hm, off
+
+
+def _load_posenet_from_saved() -> tuple:
+    """Load PoseNet from a previously-exported SavedModel (faster)."""
+    g = tf.compat.v1.Graph()
+    sess = tf.compat.v1.Session(graph=g, config=resources.tf_session_config())
+    tf.compat.v1.saved_model.loader.load(
+        sess, [tf.saved_model.SERVING], str(POSENET_SAVED)
+    )
+    inp = g.get_tensor_by_name("sub_2:0")
+    hm = g.get_tensor_by_name("MobilenetV1/heatmap_2/BiasAdd:0")
+    off = g.get_tensor_by_name("MobilenetV1/offset_2/BiasAdd:0")
+    return sess, inp, hm, off
+
+
+def _load_classifier() -> tf.keras.Model:
+    classifier = tf.keras.models.load_model(str(CLASSIFIER_H5), compile=False)
+    logger.info("TM classifier loaded: %s", classifier.input_shape)
+    return classifier
+
+
+_HEAD_ACTIVATIONS = {
+    "linear": tf.identity,
+    "relu": tf.nn.relu,
+    "sigmoid": tf.sigmoid,
+    "softmax": tf.nn.softmax,
+    "tanh": tf.tanh,
+}
+
+
+def _head_layers(classifier: tf.keras.Model) -> Optional[list]:
+    """The Keras Dense→Dropout→Dense head as ``(kernel, bias, activation)``.
+
+    Dropout is the identity at inference and is skipped.  Returns None if
+    the head has a layer that can't be rebuilt as graph ops (the caller
+    then falls back to the Keras head).
+    """
+    layers = []
+    for layer in classifier.layers:
+        if isinstance(layer, (tf.keras.layers.InputLayer, tf.keras.layers.Dropout)):
+            continue
+        cfg = layer.get_config()
+        if not isinstance(layer, tf.keras.layers.Dense) or cfg["activation"] not in _HEAD_ACTIVATIONS:
+            logger.warning("TM head layer %s can't be fused – using Keras head", layer.name)
+            return None
+        weights = layer.get_weights()
+        layers.append((weights[0], weights[1] if cfg["use_bias"] else None, cfg["activation"]))
+    return layers
+
+
+def _build_fused(sess, inp, hm, off, classifier: tf.keras.Model) -> tuple:
+    """Re-import PoseNet into one graph: uint8 image → class probabilities.
+
+    Both loaders give a graph whose input is pinned to batch size 1
+    ``(1, ?, ?, 3)``.  The convolution stack itself is batch-agnostic, so
+    mapping a ``(None, 257, 257, 3)`` input onto ``sub_2`` lets the
+    micro-batcher run several frames in one ``session.run``.  Around it
+    the graph does what used to happen in NumPy / Keras:
+
+        uint8 → float [-1, 1] → PoseNet → sigmoid(heatmaps) ‖ offsets
+              → flatten (14739) → Dense → Dense → probabilities
+
+    Returns ``(session, input, heatmaps, offsets, features, probs)``;
+    ``probs`` is None when the head could not be fused.
+    """
+    graph_def = sess.graph.as_graph_def()
+    head = _head_layers(classifier)   # read weights eagerly, outside the graph
+    g = tf.compat.v1.Graph()
+    with g.as_default():
+        image_u8 = tf.compat.v1.placeholder(
+            tf.uint8, (None, _INPUT_SIZE, _INPUT_SIZE, 3), name="tm_input"
+        )
+        image = tf.cast(image_u8, tf.float32) / 127.5 - 1.0
+        hm_b, off_b = tf.graph_util.import_graph_def(
+            graph_def,
+            input_map={inp.name: image},
+            return_elements=[hm.name, off.name],
+            name="",
+        )
+        # Same sigmoid + channel-axis concat as _features_from_outputs
+        concat = tf.concat([tf.sigmoid(hm_b), off_b], axis=3)   # (B, 17, 17, 51)
+        features = tf.reshape(concat, (-1, FEATURE_DIM), name="tm_features")
+        probs = None
+        if head is not None:
+            probs = features
+            for kernel, bias, activation in head:
+                probs = tf.matmul(probs, tf.constant(kernel))
+                if bias is not None:
+                    probs = tf.nn.bias_add(probs, tf.constant(bias))
+                probs = _HEAD_ACTIVATIONS[activation](probs)
+            probs = tf.identity(probs, name="tm_probs")
+    sess.close()
+    return tf.compat.v1.Session(graph=g, config=resources.tf_session_config()), image_u8, hm_b, off_b, features, probs
+
+
+def features_from_outputs(heatmaps: np.ndarray, offsets: np.ndarray) -> np.ndarray:
+    """PoseNet outputs (B,17,17,17) + (B,17,17,34) → (B, 14739) TM features.
+
+    NumPy reference for the ops ``_build_fused`` puts in the graph.
+    """
+    # CRITICAL: PoseNet's baseModel.predict() applies sigmoid to the raw
+    # heatmap logits before returning them as `heatmapScores`.  Teachable
+    # Machine receives sigmoid-activated values — not raw logits — so the
+    # TM classifier was trained on sigmoid(heatmap) features.
+    #   JS:  heatmapScores = tf.sigmoid(namedResults.heatmap)
+    # See: tensorflow/tfjs-models  posenet/src/base_model.ts  predict()
+    heatmaps = 1.0 / (1.0 + np.exp(-heatmaps))   # sigmoid
+
+    # Teachable Machine concatenates 3D tensors along the CHANNEL axis
+    # (axis=2 per frame, axis=3 with the batch dim) BEFORE flattening.
+    # This produces a different element ordering than flattening each
+    # tensor independently then concatenating.
+    #
+    # TM JS: tf.concat([heatmapScores, offsets], axis=2)  →  [17,17,51]  →  flatten
+    # We must replicate the same order.
+    concat = np.concatenate([heatmaps, offsets], axis=3)  # (B, 17, 17, 51)
+    features = concat.reshape(concat.shape[0], -1)        # (B, 14739)
+    assert features.shape[1] == FEATURE_DIM, (
+        f"Expected {FEATURE_DIM} features, got {features.shape[1]}"
+    )
+    return features
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# Backend
+# ═══════════════════════════════════════════════════════════════════════════
+
+class TFBackend(TMBackend):
+    """PoseNet + Keras head fused into one TF graph.
+
+    With the graph cache on (``TM_GRAPH_CACHE``) a cache hit replaces
+    steps 1-3 of the cold build with one GraphDef import.
+    """
+
+    name = "tf"
+
+    def __init__(self, use_cache: Optional[bool] = None, cache_dir: Optional[Path] = None):
+        super().__init__()
+        self._classifier = None
+        self.from_cache = False
+        use_cache = settings.TM_GRAPH_CACHE if use_cache is None else use_cache
+        key = None
+        if use_cache:
+            t0 = time.perf_counter()
+            key = artifact_cache.cache_key(extra=tf.__version__)
+            self.load_times_ms["cache_key"] = (time.perf_counter() - t0) * 1000
+            manifest = artifact_cache.lookup(key, cache_dir)
+            if manifest is not None:
+                self._load_cached(key, manifest, cache_dir)
+                return
+        build_ms = self._build()
+        if key is not None:
+            self._store(key, build_ms, cache_dir)
+
+    def _build(self) -> float:
+        """Cold build from the model files; returns the build time in ms."""
+        t0 = time.perf_counter()
+
+        # 1. Load PoseNet backbone (prefer SavedModel if available)
+        if POSENET_SAVED.exists():
+            logger.info("Loading PoseNet from SavedModel...")
+            loaded = _load_posenet_from_saved()
+        else:
+            logger.info("Loading PoseNet from TF.js files...")
+            loaded = _load_posenet_from_tfjs()
+        t1 = time.perf_counter()
+        self.load_times_ms["posenet_load"] = (t1 - t0) * 1000
+
+        # 2. Load TM classifier head
+        self._classifier = _load_classifier()
+        t2 = time.perf_counter()
+        self.load_times_ms["classifier_load"] = (t2 - t1) * 1000
+
+        # 3. Fuse preprocessing, PoseNet, feature layout and head into one graph
+        (self.session, self.input, self.heatmaps, self.offsets,
+         self.features_t, self.probs_t) = _build_fused(*loaded, self._classifier)
+        t3 = time.perf_counter()
+        self.load_times_ms["graph_fuse"] = (t3 - t2) * 1000
+        return (t3 - t0) * 1000
+
+    def _tensors(self) -> dict:
+        return {
+            "input": self.input, "heatmaps": self.heatmaps, "offsets": self.offsets,
+            "features": self.features_t, "probs": self.probs_t,
+        }
+
+    def _store(self, key: str, build_ms: float, cache_dir: Optional[Path]) -> None:
+        t0 = time.perf_counter()
+        tensors = self._tensors()
+        graph_def = tf.compat.v1.graph_util.extract_sub_graph(
+            self.session.graph.as_graph_def(),
+            [t.op.name for t in tensors.values() if t is not None],
+        )
+        manifest = {
+            "tensors": {k: t.name if t is not None else None for k, t in tensors.items()},
+            "build_ms": round(build_ms, 1),
+            "tensorflow": tf.__version__,
+            "sources": [str(p.relative_to(TM_DIR)) for p in artifact_cache.source_files()],
+        }
+        if artifact_cache.store(key, graph_def.SerializeToString(), manifest, cache_dir):
+            logger.info("TM graph built in %.0f ms (cold start) and cached as %s", build_ms, key)
+        self.load_times_ms["graph_cache_store"] = (time.perf_counter() - t0) * 1000
+
+    def _load_cached(self, key: str, manifest: dict, cache_dir: Optional[Path]) -> None:
+        t0 = time.perf_counter()
+        graph_def = tf.compat.v1.GraphDef()
+        with artifact_cache.mapped(artifact_cache.graph_path(key, cache_dir)) as buf:
+            graph_def.ParseFromString(buf)
+        g = tf.compat.v1.Graph()
+        with g.as_default():
+            tf.graph_util.import_graph_def(graph_def, name="")
+        self.session = tf.compat.v1.Session(graph=g, config=resources.tf_session_config())
+
+        names = manifest["tensors"]
+        self.input, self.heatmaps, self.offsets, self.features_t, self.probs_t = (
+            g.get_tensor_by_name(names[k]) if names[k] else None
+            for k in ("input", "heatmaps", "offsets", "features", "probs")
+        )
+        self.from_cache = True
+        self.load_times_ms["graph_cache_load"] = (time.perf_counter() - t0) * 1000
+        warm_ms = self.load_times_ms["cache_key"] + self.load_times_ms["graph_cache_load"]
+        logger.info(
+            "TM graph loaded from cache %s in %.0f ms (cold build: %.0f ms, %.1fx faster)",
+            key, warm_ms, manifest["build_ms"], manifest["build_ms"] / max(warm_ms, 1e-3),
+        )
+
+    @property
+    def classifier(self) -> tf.keras.Model:
+        """Keras head; loaded on first use after a warm (cached) start."""
+        if self._classifier is None:
+            self._classifier = _load_classifier()
+        return self._classifier
+
+    @staticmethod
+    def available() -> bool:
+        return _tf_available()
+
+    def features(self, inputs_u8: np.ndarray) -> np.ndarray:
+        return self.session.run(self.features_t, feed_dict={self.input: inputs_u8})
+
+    def probs(self, inputs_u8: np.ndarray) -> np.ndarray:
+        if self.probs_t is None:
+            return self.classifier.predict_on_batch(self.features(inputs_u8))
+        return self.session.run(self.probs_t, feed_dict={self.input: inputs_u8})
+
+    def raw_outputs(self, inputs_u8: np.ndarray) -> tuple:
+        """Raw PoseNet (heatmaps, offsets) before sigmoid / concat."""
+        return tuple(self.session.run(
+            [self.heatmaps, self.offsets], feed_dict={self.input: inputs_u8}
+        ))
+
+    def reference_probs(self, inputs_u8: np.ndarray) -> np.ndarray:
+        """Unfused path: raw PoseNet outputs → NumPy features → Keras head.
+
+        What ``probs`` computed before the graph was fused; kept for
+        parity tests.
+        """
+        features = features_from_outputs(*self.raw_outputs(inputs_u8))
+        return np.asarray(self.classifier.predict_on_batch(features), dtype=np.float32)
@@ -0,0 +1,201 @@
+"""CPU budget for one worker process: thread pools and affinity.
+
+TensorFlow, TFLite, OpenCV and the stage executors each size their own
+thread pools from the machine's core count, so several uvicorn workers
+(or a busy executor on top of a multi-threaded TF session) oversubscribe
+the CPUs and inflate tail latency.  ``ResourcePlan`` derives every pool
+size from one declared budget, ``CPU_CORES_PER_WORKER``:
+
+    TF intra-op     cores / recognition workers   (inter-op 1)
+    TFLite threads  same as TF intra-op
+    OpenCV          1  (decode / preprocessing parallelise across frames
+                        in the decode pool instead)
+    executor        decode = cores, recognition = 1 (< 4 cores) or 2,
+                    landmarks = cores / 2, translate unchanged (I/O bound)
+    MediaPipe pool  2 × landmarks extractor instances
+    landmark models cores / landmarks threads per extraction (max 3: Hands,
+                    Pose and FaceMesh run concurrently; 1 = sequential)
+
+``TF_INTRA_OP_THREADS`` / ``TF_INTER_OP_THREADS`` / ``CV_THREADS``,
+``MEDIAPIPE_POOL_SIZE``, ``LANDMARK_THREADS`` and ``STAGE_CONCURRENCY`` override individual
+values.  ``CPU_AFFINITY`` pins
+the worker to a CPU list.  MediaPipe's legacy solutions do not expose
+their graph thread count; they inherit the affinity only.
+
+``apply()`` must run before TF / executor threads are created (startup);
+threads created afterwards inherit the affinity mask.  ``configure()``
+replaces the plan with explicit values (benchmarks).
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+from typing import Dict, List, Optional
+
+from app import settings
+
+logger = logging.getLogger(__name__)
+
+
+def parse_cpu_list(spec: str) -> List[int]:
+    """``"0-3,6"`` → ``[0, 1, 2, 3, 6]`` (bad entries are ignored)."""
+    cpus = set()
+    for part in spec.split(","):
+        part = part.strip()
+        if not part:
+            continue
+        try:
+            if "-" in part:
+                lo, hi = (int(x) for x in part.split("-", 1))
+                cpus.update(range(lo, hi + 1))
+            else:
+                cpus.add(int(part))
+        except ValueError:
+            logger.warning("Ignoring bad CPU_AFFINITY entry %r", part)
+    return sorted(cpus)
+
+
+def _available_cpus() -> List[int]:
+    try:
+        return sorted(os.sched_getaffinity(0))
+    except AttributeError:  # not Linux
+        return list(range(os.cpu_count() or 1))
+
+
+class ResourcePlan:
+    """Thread / pool sizes derived from the worker's core budget."""
+
+    __slots__ = ("affinity", "cores", "tf_intra", "tf_inter", "tflite_threads",
+                 "cv_threads", "mediapipe_pool", "landmark_threads", "stage_concurrency")
+
+    def __init__(
+        self,
+        cores: Optional[int] = None,
+        affinity: Optional[str] = None,
+        tf_intra: Optional[int] = None,
+        tf_inter: Optional[int] = None,
+        cv_threads: Optional[int] = None,
+        mediapipe_pool: Optional[int] = None,
+        landmark_threads: Optional[int] = None,
+    ):
+        spec = settings.CPU_AFFINITY if affinity is None else affinity
+        self.affinity: List[int] = parse_cpu_list(spec) if spec else []
+        budget = settings.CPU_CORES_PER_WORKER if cores is None else cores
+        if budget <= 0:
+            budget = len(self.affinity or _available_cpus())
+        self.cores = max(1, budget)
+
+        recognition = 1 if self.cores < 4 else 2
+        tf_intra = settings.TF_INTRA_OP_THREADS if tf_intra is None else tf_intra
+        tf_inter = settings.TF_INTER_OP_THREADS if tf_inter is None else tf_inter
+        cv_threads = settings.CV_THREADS if cv_threads is None else cv_threads
+        self.tf_intra = tf_intra if tf_intra > 0 else max(1, self.cores // recognition)
+        self.tf_inter = tf_inter if tf_inter > 0 else 1
+        self.tflite_threads = self.tf_intra
+        self.cv_threads = cv_threads if cv_threads > 0 else 1
+        # Each extractor's MediaPipe graphs also run internal threads
+        landmarks = max(1, self.cores // 2)
+        pool = settings.MEDIAPIPE_POOL_SIZE if mediapipe_pool is None else mediapipe_pool
+        self.mediapipe_pool = pool if pool > 0 else 2 * landmarks
+        threads = settings.LANDMARK_THREADS if landmark_threads is None else landmark_threads
+        self.landmark_threads = threads if threads > 0 else min(3, max(1, self.cores // landmarks))
+        self.stage_concurrency: Dict[str, int] = {
+            "decode": self.cores,
+            "landmarks": landmarks,
+            "recognition": recognition,
+        }
+
+    def as_dict(self) -> Dict:
+        return {
+            "cores": self.cores,
+            "affinity": self.affinity or None,
+            "tf_intra_op": self.tf_intra,
+            "tf_inter_op": self.tf_inter,
+            "tflite_threads": self.tflite_threads,
+            "opencv_threads": self.cv_threads,
+            "mediapipe_pool": self.mediapipe_pool,
+            "landmark_threads": self.landmark_threads,
+            "stage_concurrency": dict(self.stage_concurrency),
+        }
+
+
+_plan: Optional[ResourcePlan] = None
+
+
+def get_plan() -> ResourcePlan:
+    global _plan
+    if _plan is None:
+        _plan = ResourcePlan()
+    return _plan
+
+
+def configure(**overrides) -> ResourcePlan:
+    """Replace the worker's plan with ``ResourcePlan(**overrides)``.
+
+    For tools comparing budgets in one process (``bench_landmarks.py``);
+    pools and executors that already exist keep their size.
+    """
+    global _plan
+    _plan = ResourcePlan(**overrides)
+    return _plan
+
+
+def tf_session_config():
+    """``ConfigProto`` with the plan's TF thread counts (imports TF)."""
+    import tensorflow as tf
+
+    plan = get_plan()
+    return tf.compat.v1.ConfigProto(
+        intra_op_parallelism_threads=plan.tf_intra,
+        inter_op_parallelism_threads=plan.tf_inter,
+    )
+
+
+def apply() -> ResourcePlan:
+    """Pin the process and size OpenCV's pool; safe to call repeatedly."""
+    import cv2
+
+    plan = get_plan()
+    if plan.affinity and hasattr(os, "sched_setaffinity"):
+        try:
+            os.sched_setaffinity(0, plan.affinity)
+        except OSError as exc:
+            logger.warning("CPU_AFFINITY %s not applied: %s", plan.affinity, exc)
+    cv2.setNumThreads(plan.cv_threads)
+    return plan
+
+
+def topology_report(stage_limits: Optional[Dict[str, int]] = None) -> str:
+    """One-line summary of the effective thread topology."""
+    import cv2
+
+    plan = get_plan()
+    try:
+        pinned = sorted(os.sched_getaffinity(0))
+    except AttributeError:
+        pinned = []
+    limits = stage_limits or plan.stage_concurrency
+    pools = " ".join(f"{k}={v}" for k, v in sorted(limits.items()))
+    return (
+        f"cores={plan.cores} cpus={_format_cpus(pinned) if pinned else 'n/a'}"
+        f" | TF intra={plan.tf_intra} inter={plan.tf_inter}"
+        f" | TFLite threads={plan.tflite_threads}"
+        f" | OpenCV threads={cv2.getNumThreads()}"
+        f" | executor {pools}"
+        f" | MediaPipe pool={plan.mediapipe_pool} model threads={plan.landmark_threads}"
+    )
+
+
+def _format_cpus(cpus: List[int]) -> str:
+    """``[0, 1, 2, 5]`` → ``"0-2,5"``."""
+    out = []
+    start = prev = cpus[0]
+    for c in cpus[1:] + [None]:
+        if c is not None and c == prev + 1:
+            prev = c
+            continue
+        out.append(str(start) if start == prev else f"{start}-{prev}")
+        if c is not None:
+            start = prev = c
+    return ",".join(out)
@@ -0,0 +1,194 @@
+"""Binary WebSocket frame protocol (``binary-v1``).
+
+Clients that negotiate ``binary-v1`` send frames as a single binary
+WebSocket message instead of base64-in-JSON:
+
+    offset  size  field
+    0       1     version       (u8, = 1)
+    1       1     kind          (u8, 1 = JPEG frame)
+    2       1     style         (u8, 0 = concise, 1 = detailed)
+    3       1     reserved      (u8, = 0)
+    4       8     ts            (i64, ms since epoch)
+    12      2     session_len   (u16)
+    14      2     user_len      (u16)
+    16      ..    session       (utf-8, session_len bytes)
+    ..      ..    user          (utf-8, user_len bytes)
+    ..      ..    payload       (rest of the message, depends on kind)
+
+Payload for kind 1 (frame) is the raw JPEG bytes.
+
+Payload for kind 2 (landmarks) is client-side MediaPipe output:
+
+    0       1     n_hands       (u8, 0..2)
+    1       1     flags         (u8, bit0 = pose present, bit1 = uint16 quantized)
+    2       1     handedness    (u8, bit i set = hand i is "Right")
+    3       1     reserved
+    4       ..    hands         (n_hands × 21 × 3 values)
+    ..      ..    pose          (33 × 3 values, if bit0)
+
+Values are float32, or uint16 when quantized: ``q / 65535 * 2 - 0.5``
+(covers normalised coords in [-0.5, 1.5] at ~3e-5 resolution).
+
+All integers are little-endian.  The payload is returned as a
+``memoryview`` over the received buffer, so it can be handed straight to
+``np.frombuffer`` / ``cv2.imdecode`` without an intermediate copy.
+"""
+
+from __future__ import annotations
+
+import struct
+from dataclasses import dataclass
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+PROTOCOL_NAME = "binary-v1"
+VERSION = 1
+
+KIND_FRAME = 1
+KIND_LANDMARKS = 2
+
+N_HAND_POINTS = 21
+N_POSE_POINTS = 33
+
+_LM_HEADER = struct.Struct("<BBBx")
+_FLAG_POSE = 0x01
+_FLAG_QUANTIZED = 0x02
+_QUANT_LO = -0.5
+_QUANT_SPAN = 2.0
+
+_HEADER = struct.Struct("<BBBxqHH")
+HEADER_SIZE = _HEADER.size  # 16
+
+_STYLES = ("concise", "detailed")
+
+
+@dataclass(frozen=True)
+class BinaryMessage:
+    """A decoded ``binary-v1`` message (header fields + zero-copy payload)."""
+
+    kind: int
+    session: str
+    user: str
+    ts: int
+    style: str
+    payload: memoryview
+
+
+def decode_message(buf: bytes | bytearray | memoryview) -> BinaryMessage:
+    """Parse a ``binary-v1`` message.
+
+    Raises
+    ------
+    ValueError
+        If the buffer is truncated, the version is unknown or the style
+        byte is out of range.
+    """
+    view = memoryview(buf)
+    if len(view) < HEADER_SIZE:
+        raise ValueError(f"binary message too short ({len(view)} bytes)")
+
+    version, kind, style_idx, ts, session_len, user_len = _HEADER.unpack_from(view)
+    if version != VERSION:
+        raise ValueError(f"unsupported binary protocol version {version}")
+    if style_idx >= len(_STYLES):
+        raise ValueError(f"invalid style byte {style_idx}")
+
+    pos = HEADER_SIZE
+    end = pos + session_len + user_len
+    if len(view) < end:
+        raise ValueError("binary message header overruns buffer")
+    session = str(view[pos : pos + session_len], "utf-8")
+    user = str(view[pos + session_len : end], "utf-8")
+
+    return BinaryMessage(
+        kind=kind,
+        session=session,
+        user=user,
+        ts=ts,
+        style=_STYLES[style_idx],
+        payload=view[end:],
+    )
+
+
+def encode_message(
+    kind: int,
+    session: str,
+    user: str,
+    ts: int,
+    payload: bytes,
+    style: str = "concise",
+) -> bytes:
+    """Build a ``binary-v1`` message (used by tests and Python clients)."""
+    session_b = session.encode("utf-8")
+    user_b = user.encode("utf-8")
+    header = _HEADER.pack(
+        VERSION, kind, _STYLES.index(style), ts, len(session_b), len(user_b)
+    )
+    return b"".join((header, session_b, user_b, payload))
+
+
+def decode_landmarks(
+    payload: memoryview,
+) -> Tuple[Optional[np.ndarray], Optional[List[str]], Optional[np.ndarray]]:
+    """Parse a kind-2 payload → (hands (H,21,3), handedness, pose (33,3)).
+
+    Arrays are float32 views over the payload when it is float32-encoded
+    (no copy); quantized payloads are dequantized into new arrays.
+
+    Raises
+    ------
+    ValueError
+        On a truncated payload, too many hands or non-finite values.
+    """
+    if len(payload) < _LM_HEADER.size:
+        raise ValueError("landmark payload too short")
+    n_hands, flags, hand_bits = _LM_HEADER.unpack_from(payload)
+    if n_hands > 2:
+        raise ValueError(f"at most 2 hands supported, got {n_hands}")
+
+    quantized = bool(flags & _FLAG_QUANTIZED)
+    dtype = np.dtype("<u2") if quantized else np.dtype("<f4")
+    n_values = (n_hands * N_HAND_POINTS + (N_POSE_POINTS if flags & _FLAG_POSE else 0)) * 3
+    body = payload[_LM_HEADER.size:]
+    if len(body) != n_values * dtype.itemsize:
+        raise ValueError(
+            f"landmark payload size {len(body)} != expected {n_values * dtype.itemsize}"
+        )
+    values = np.frombuffer(body, dtype=dtype, count=n_values)
+    if quantized:
+        values = values.astype(np.float32) * np.float32(_QUANT_SPAN / 65535.0) + np.float32(_QUANT_LO)
+    elif not np.isfinite(values).all():
+        raise ValueError("non-finite landmark values")
+
+    hands = handedness = pose = None
+    split = n_hands * N_HAND_POINTS * 3
+    if n_hands:
+        hands = values[:split].reshape(n_hands, N_HAND_POINTS, 3)
+        handedness = ["Right" if hand_bits >> i & 1 else "Left" for i in range(n_hands)]
+    if flags & _FLAG_POSE:
+        pose = values[split:].reshape(N_POSE_POINTS, 3)
+    return hands, handedness, pose
+
+
+def encode_landmarks(
+    hands: Optional[np.ndarray],
+    handedness: Optional[List[str]] = None,
+    pose: Optional[np.ndarray] = None,
+    quantize: bool = False,
+) -> bytes:
+    """Build a kind-2 payload (the inverse of ``decode_landmarks``)."""
+    n_hands = 0 if hands is None else len(hands)
+    flags = (_FLAG_POSE if pose is not None else 0) | (_FLAG_QUANTIZED if quantize else 0)
+    hand_bits = 0
+    for i, label in enumerate(handedness or []):
+        if label == "Right":
+            hand_bits |= 1 << i
+    parts = [np.asarray(a, dtype=np.float32).reshape(-1) for a in (hands, pose) if a is not None]
+    values = np.concatenate(parts) if parts else np.zeros(0, dtype=np.float32)
+    if quantize:
+        q = np.clip((values - _QUANT_LO) / _QUANT_SPAN, 0.0, 1.0) * 65535.0
+        data = np.round(q).astype("<u2").tobytes()
+    else:
+        data = values.astype("<f4").tobytes()
+    return _LM_HEADER.pack(n_hands, flags, hand_bits) + data
@@ -1,5 +1,5 @@
-from pydantic import BaseModel
-from typing import Literal, Optional
+from pydantic import BaseModel, ConfigDict, field_validator
+from typing import List, Literal, Optional
 
 class FrameIn(BaseModel):
     type: Literal["frame"]
@@ -9,6 +9,49 @@ class FrameIn(BaseModel):
     image_jpeg_b64: str
     style: Optional[Literal["concise", "detailed"]] = "concise"
 
+class LandmarksIn(BaseModel):
+    """Client-side MediaPipe output; skips server-side image decode + vision."""
+    model_config = ConfigDict(allow_inf_nan=False)
+
+    type: Literal["landmarks"]
+    session: str
+    user: str
+    ts: int
+    hands: Optional[List[List[List[float]]]] = None      # [H≤2][21][3]
+    handedness: Optional[List[Literal["Left", "Right"]]] = None
+    pose: Optional[List[List[float]]] = None             # [33][3]
+    style: Optional[Literal["concise", "detailed"]] = "concise"
+
+    @field_validator("hands")
+    @classmethod
+    def _check_hands(cls, v):
+        if v is not None:
+            if len(v) > 2:
+                raise ValueError("at most 2 hands")
+            for hand in v:
+                if len(hand) != 21 or any(len(kp) != 3 for kp in hand):
+                    raise ValueError("each hand must be 21 × [x, y, z]")
+        return v
+
+    @field_validator("pose")
+    @classmethod
+    def _check_pose(cls, v):
+        if v is not None and (len(v) != 33 or any(len(kp) != 3 for kp in v)):
+            raise ValueError("pose must be 33 × [x, y, z]")
+        return v
+
+class HelloIn(BaseModel):
+    """Sent once after connect to negotiate the frame protocol."""
+    type: Literal["hello"]
+    protocols: List[str] = []
+
+class ConfigIn(BaseModel):
+    """Per-session options; may be sent at any time."""
+    type: Literal["config"]
+    session: str
+    user: str
+    landmark_mode: Optional[Literal["auto", "hands", "hands+shoulders", "full"]] = None
+
 class CaptionOut(BaseModel):
     type: Literal["caption"]
     session: str
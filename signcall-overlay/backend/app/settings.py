@@ -13,3 +13,113 @@ CONF_MED = float(os.getenv("CONF_MED", "0.55"))
 # Set DEBUG_TOKENS=1 in .env to bypass real CV/classifier and cycle
 # through all 4 tokens at low/med/high confidence for translator testing.
 DEBUG_TOKENS = os.getenv("DEBUG_TOKENS", "").strip().lower() in ("1", "true", "yes")
+
+# ── Executor layer (app/pipeline/executor.py) ──
+# Max concurrent jobs per pipeline stage, e.g. "landmarks=1,recognition=2".
+# Stages not listed are sized from the CPU budget (app/resources.py), then
+# fall back to executor.DEFAULT_STAGE_CONCURRENCY.
+STAGE_CONCURRENCY = os.getenv("STAGE_CONCURRENCY", "")
+
+# ── CPU resources (app/resources.py) ──
+# Cores this worker may use (0 = all CPUs available to the process).  TF
+# intra/inter-op threads, TFLite and OpenCV threads and the decode /
+# recognition executor sizes are derived from it; with N uvicorn workers
+# set it to cores / N.
+CPU_CORES_PER_WORKER = int(os.getenv("CPU_CORES_PER_WORKER", "0"))
+# Pin this worker to a CPU list, e.g. "0-3" or "0,2,4" (empty = no pinning).
+CPU_AFFINITY = os.getenv("CPU_AFFINITY", "")
+# Explicit thread counts (0 = derive from the core budget).
+TF_INTRA_OP_THREADS = int(os.getenv("TF_INTRA_OP_THREADS", "0"))
+TF_INTER_OP_THREADS = int(os.getenv("TF_INTER_OP_THREADS", "0"))
+CV_THREADS = int(os.getenv("CV_THREADS", "0"))
+# MediaPipe extractor instances (one per concurrently tracked session,
+# ~165 MB each; 0 = twice the landmarks stage concurrency).
+MEDIAPIPE_POOL_SIZE = int(os.getenv("MEDIAPIPE_POOL_SIZE", "0"))
+# Threads one extraction may use to run Hands / Pose / FaceMesh
+# concurrently (1 = sequential; 0 = derive from the core budget).
+LANDMARK_THREADS = int(os.getenv("LANDMARK_THREADS", "0"))
+
+# ── Landmark extraction (app/cv/landmark_stages.py) ──
+# MediaPipe models to run: "auto" (what the recognizers declare they read –
+# hands + shoulders), "hands", "hands+shoulders" or "full" (adds FaceMesh).
+# Sessions may override it with a "config" WebSocket message.
+LANDMARK_MODE = os.getenv("LANDMARK_MODE", "auto").strip().lower()
+# Run slow-changing groups on every Nth frame only, e.g. "pose=3,face=3"
+# (opt-in; "" = every model on every frame).  Hands always run every frame.
+LANDMARK_RATES = os.getenv("LANDMARK_RATES", "")
+# Values on the frames in between: "carry" (last measurement) or
+# "linear" (extrapolated from the last two measurements).
+LANDMARK_FILL = os.getenv("LANDMARK_FILL", "carry").strip().lower()
+# Run Hands on padded crops around the previous frame's hands / pose wrists
+# (full frame when the crops find nothing).  Padding is per side, as a
+# fraction of the hand size.
+HAND_ROI = os.getenv("HAND_ROI", "0").strip().lower() in ("1", "true", "yes")
+HAND_ROI_PADDING = float(os.getenv("HAND_ROI_PADDING", "0.5"))
+
+# ── Frame ingestion (app/pipeline/ingest.py) ──
+# Frames kept per connection while inference is busy (newest N win).
+INGEST_MAX_PENDING = int(os.getenv("INGEST_MAX_PENDING", "1"))
+# Drop frames whose client ts is older than this when dequeued (0 = never).
+INGEST_DEADLINE_MS = float(os.getenv("INGEST_DEADLINE_MS", "500"))
+
+# ── TM micro-batching (app/recognition/batcher.py) ──
+# Frames from all sessions are collected for up to TM_BATCH_WINDOW_MS or
+# until TM_BATCH_MAX frames are pending, then run as one PoseNet batch.
+# TM_BATCH_MAX=1 disables batching.
+TM_BATCH_MAX = int(os.getenv("TM_BATCH_MAX", "8"))
+TM_BATCH_WINDOW_MS = float(os.getenv("TM_BATCH_WINDOW_MS", "10"))
+
+# ── TM inference backend (app/recognition/tm_model.py) ──
+# "tf": fused TF graph (default).  "tflite": the TFLite models written by
+# export_tm_model.py / quantize_tm_model.py, run without importing
+# TensorFlow; TM_TFLITE_POSENET / TM_TFLITE_HEAD pick the float32 /
+# float16 / int8 variant of each (see the quantization report).
+TM_BACKEND = os.getenv("TM_BACKEND", "tf").strip().lower()
+TM_TFLITE_POSENET = os.getenv("TM_TFLITE_POSENET", "float32")
+TM_TFLITE_HEAD = os.getenv("TM_TFLITE_HEAD", "float32")
+# Cache the compiled TF graph, keyed by a hash of the model files, so
+# later starts skip the TF.js / HDF5 rebuild (app/recognition/artifact_cache.py).
+TM_GRAPH_CACHE = os.getenv("TM_GRAPH_CACHE", "1").strip().lower() in ("1", "true", "yes")
+TM_GRAPH_CACHE_DIR = os.getenv("TM_GRAPH_CACHE_DIR", "")  # empty = backend/tm_model/cache
+
+# ── Session lifecycle (app/pipeline/session.py) ──
+# Sessions with no frames for this long are freed (0 = never).
+SESSION_IDLE_TTL_S = float(os.getenv("SESSION_IDLE_TTL_S", "300"))
+# Global cap on per-session buffer memory (landmarks, PoseNet inputs,
+# cached TM probabilities); LRU sessions are evicted past it.
+SESSION_MEMORY_CAP_MB = float(os.getenv("SESSION_MEMORY_CAP_MB", "512"))
+# Preprocessed 257×257 PoseNet inputs kept per session (~198 KB each).
+# Raw decoded frames are dropped once this input is built.
+TM_INPUT_RING_LEN = int(os.getenv("TM_INPUT_RING_LEN", "1"))
+
+# ── Recognition scheduling (app/pipeline/scheduler.py) ──
+# "hop":   classify every RECOGNITION_HOP_FRAMES frames and at most once per
+#          RECOGNITION_HOP_MS while signing (1 / 0 = every frame).
+# "event": classify at motion onset/offset, plus every RECOGNITION_REFRESH_MS
+#          while signing continues.
+RECOGNITION_MODE = os.getenv("RECOGNITION_MODE", "hop")
+RECOGNITION_HOP_FRAMES = int(os.getenv("RECOGNITION_HOP_FRAMES", "1"))
+RECOGNITION_HOP_MS = float(os.getenv("RECOGNITION_HOP_MS", "0"))
+RECOGNITION_REFRESH_MS = float(os.getenv("RECOGNITION_REFRESH_MS", "1000"))
+
+# ── TM multi-frame fusion (app/recognition/fusion.py) ──
+# "last": classify only the newest frame (TM browser behaviour).
+# "mean" / "max" / "recency": run TM once per incoming frame, cache the
+# probabilities per session and fuse the window's rows; "recency" weights
+# a frame by TM_FUSION_DECAY ** age.  Ignored ("last") with CASCADE=1,
+# since caching runs TM on every frame.
+TM_FUSION = os.getenv("TM_FUSION", "last").strip().lower()
+TM_FUSION_DECAY = float(os.getenv("TM_FUSION_DECAY", "0.7"))
+
+# ── Recognition cascade (classifier._predict_cascade) ──
+# CASCADE=1 runs the landmark prototype classifier first and only calls
+# PoseNet + TM head when its confidence or top-2 distance margin is low.
+# Every CASCADE_AUDIT_EVERY-th accepted window also runs TM to measure
+# agreement (0 = never).
+CASCADE = os.getenv("CASCADE", "0").strip().lower() in ("1", "true", "yes")
+CASCADE_MIN_CONFIDENCE = float(os.getenv("CASCADE_MIN_CONFIDENCE", "0.80"))
+CASCADE_MIN_MARGIN = float(os.getenv("CASCADE_MIN_MARGIN", "0.10"))
+CASCADE_AUDIT_EVERY = int(os.getenv("CASCADE_AUDIT_EVERY", "20"))
+
+# Load + warm all models at startup (/readyz reports 503 until done).
+WARMUP = os.getenv("WARMUP", "1").strip().lower() in ("1", "true", "yes")
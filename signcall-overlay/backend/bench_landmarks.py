@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""Per-frame MediaPipe cost by landmark mode and model thread count.
+
+For every (mode, LANDMARK_THREADS) combination the frames are run through
+``extract_landmarks`` on a fresh extractor (tracking on, as in a session)
+and the wall time per frame plus each model's mean latency is reported.
+With threads > 1 the wall time approaches the slowest model instead of
+the sum; that needs more than one core.  ``--hand-roi 0,1`` repeats
+each row with and without ``HAND_ROI`` (crops only start once a hand or
+pose wrist was seen, so use recorded frames); each value runs in a fresh
+Python process with ``HAND_ROI`` set in its environment.
+
+Usage:
+    cd backend
+    python bench_landmarks.py --frames session.mp4
+    python bench_landmarks.py --frames recordings/ --modes full,auto --threads 1,3
+    python bench_landmarks.py --frames session.mp4 --modes auto --threads 1 --hand-roi 0,1
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import numpy as np
+
+from app import metrics, resources, settings
+from app.cv import landmark_stages, mediapipe_extractor
+from app.cv.recordings import load_frames
+from app.recognition import classifier  # noqa: F401  (declares its landmark needs)
+
+
+def _child(args) -> None:
+    """Run every (mode, threads) row at this process's ``HAND_ROI``."""
+    if not mediapipe_extractor.HAS_MEDIAPIPE:
+        sys.exit("MediaPipe is not installed")
+    frames = load_frames(args.frames, args.max_frames) if args.frames else []
+    noise = not frames
+    if noise:
+        rng = np.random.default_rng(0)
+        frames = list(rng.integers(0, 256, (30, 480, 640, 3), dtype=np.uint8))
+
+    latency = metrics.LANDMARK_MODEL_LATENCY
+    rows = []
+    for mode in (m.strip() for m in args.modes.split(",") if m.strip()):
+        for threads in (int(t) for t in args.threads.split(",") if t.strip()):
+            groups = landmark_stages.resolve(mode)
+            resources.configure(landmark_threads=threads)
+            key = f"bench-{mode}-{threads}"
+            mediapipe_extractor.extract_landmarks(frames[0], 0, session=key, groups=groups)
+            before = {g: (latency[g].sum, sum(latency[g].counts)) for g in landmark_stages.GROUPS}
+            roi_before = {k: c.value for k, c in metrics.HAND_ROI.items()}
+            times = []
+            for i, frame in enumerate(frames):
+                t0 = time.perf_counter()
+                mediapipe_extractor.extract_landmarks(frame, i, session=key, groups=groups)
+                times.append((time.perf_counter() - t0) * 1000)
+            mediapipe_extractor.release(key)
+            per_model = {}
+            for g in landmark_stages.GROUPS:
+                n = sum(latency[g].counts) - before[g][1]
+                per_model[g] = (latency[g].sum - before[g][0]) * 1000 / n if n else None
+            roi_counts = {k: c.value - roi_before[k] for k, c in metrics.HAND_ROI.items()}
+            total = sum(roi_counts.values())
+            rows.append({
+                "mode": mode, "threads": threads, "roi": int(settings.HAND_ROI),
+                "mean_ms": float(np.mean(times)), "p95_ms": float(np.percentile(times, 95)),
+                "models": per_model, "hit": roi_counts["hit"] / total if total else None,
+            })
+    print(json.dumps({"frames": len(frames), "noise": noise, "rows": rows}))
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    ap.add_argument("--frames", help="directory of images or a video file")
+    ap.add_argument("--max-frames", type=int, default=100)
+    ap.add_argument("--modes", default="full,auto,hands")
+    ap.add_argument("--threads", default="1,3")
+    ap.add_argument("--hand-roi", default=str(int(settings.HAND_ROI)))
+    ap.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    args = ap.parse_args()
+    if args.child:
+        _child(args)
+        return
+
+    results = []
+    for roi in (r.strip() for r in args.hand_roi.split(",") if r.strip()):
+        cmd = [sys.executable, os.path.abspath(__file__), "--child",
+               "--max-frames", str(args.max_frames), "--modes", args.modes, "--threads", args.threads]
+        if args.frames:
+            cmd += ["--frames", args.frames]
+        env = dict(os.environ, HAND_ROI=roi, TF_CPP_MIN_LOG_LEVEL="3")
+        proc = subprocess.run(cmd, env=env, capture_output=True, text=True)
+        lines = [l for l in proc.stdout.splitlines() if l.startswith("{")]
+        if proc.returncode != 0 or not lines:
+            sys.exit(f"HAND_ROI={roi}: failed\n{proc.stderr[-2000:]}")
+        results.append(json.loads(lines[-1]))
+    if not results:
+        return
+
+    if results[0]["noise"]:
+        print("⚠️  No recorded frames (--frames) – using noise; models find nothing, so "
+              "their cost is NOT representative")
+    print(f"{results[0]['frames']} frames, {len(resources._available_cpus())} CPU(s)\n")
+    print(f"{'mode':>16s} {'threads':>7s} {'roi':>3s}  {'ms/frame':>8s}  {'p95':>6s}  "
+          + "  ".join(f"{g:>6s}" for g in landmark_stages.GROUPS) + "  roi hit")
+    modes = [m.strip() for m in args.modes.split(",") if m.strip()]
+    rows = sorted((r for res in results for r in res["rows"]),
+                  key=lambda r: (modes.index(r["mode"]), r["threads"]))
+    for r in rows:
+        per_model = [f"{r['models'][g]:6.1f}" if r["models"][g] is not None else f"{'-':>6s}"
+                     for g in landmark_stages.GROUPS]
+        hit = f"{r['hit']:7.0%}" if r["hit"] is not None else f"{'-':>7s}"
+        print(f"{r['mode']:>16s} {r['threads']:>7d} {r['roi']:>3d}  {r['mean_ms']:>8.1f}  "
+              f"{r['p95_ms']:>6.1f}  " + "  ".join(per_model) + f"  {hit}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""Compare TM inference backends: startup time, RSS and per-frame latency.
+
+Each backend is measured in a fresh Python process (so imports and RSS
+are not shared):
+
+    startup   import tm_model + load models + first inference
+    rss       resident memory after warm-up
+    latency   mean / p95 ms for one frame (preprocessed 257×257 input)
+
+Usage:
+    cd backend
+    python export_tm_model.py            # once, for the tflite backend
+    python bench_tm_backends.py          # tf vs tflite
+    python bench_tm_backends.py --backends tf,tflite --frames 100
+"""
+
+import time
+
+_T0 = time.perf_counter()
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+
+def _rss_mb() -> float:
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    import resource  # peak RSS (KB on Linux, bytes on macOS)
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024 if sys.platform == "darwin" else 1024)
+
+
+def _child(n_frames: int) -> None:
+    import numpy as np
+
+    from app.recognition import tm_model
+
+    rng = np.random.default_rng(0)
+    inputs = rng.integers(0, 256, (n_frames, 257, 257, 3), dtype=np.uint8)
+    tm_model.input_probs([inputs[0]])
+    startup_ms = (time.perf_counter() - _T0) * 1000
+
+    times = []
+    for x in inputs:
+        t0 = time.perf_counter()
+        tm_model.input_probs([x])
+        times.append((time.perf_counter() - t0) * 1000)
+    print(json.dumps({
+        "backend": tm_model._backend.name,
+        "startup_ms": round(startup_ms, 1),
+        "rss_mb": round(_rss_mb(), 1),
+        "mean_ms": round(float(np.mean(times)), 2),
+        "p95_ms": round(float(np.percentile(times, 95)), 2),
+        "tensorflow_imported": "tensorflow" in sys.modules,
+    }))
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    ap.add_argument("--backends", default="tf,tflite")
+    ap.add_argument("--frames", type=int, default=50)
+    ap.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    args = ap.parse_args()
+    if args.child:
+        _child(args.frames)
+        return
+
+    rows = []
+    for name in (b.strip() for b in args.backends.split(",") if b.strip()):
+        env = dict(os.environ, TM_BACKEND=name, TF_CPP_MIN_LOG_LEVEL="3")
+        proc = subprocess.run(
+            [sys.executable, os.path.abspath(__file__), "--child", "--frames", str(args.frames)],
+            env=env, capture_output=True, text=True,
+        )
+        lines = [l for l in proc.stdout.splitlines() if l.startswith("{")]
+        if proc.returncode != 0 or not lines:
+            print(f"{name}: failed\n{proc.stderr[-2000:]}")
+            continue
+        row = json.loads(lines[-1])
+        row["requested"] = name
+        rows.append(row)
+
+    print(f"\n{'backend':>10s}  {'startup ms':>10s}  {'RSS MB':>8s}  {'mean ms':>8s}  "
+          f"{'p95 ms':>7s}  {'imports TF':>10s}")
+    for r in rows:
+        label = r["backend"] if r["backend"] == r["requested"] else f"{r['requested']}→{r['backend']}"
+        print(f"{label:>10s}  {r['startup_ms']:>10.0f}  {r['rss_mb']:>8.0f}  {r['mean_ms']:>8.2f}  "
+              f"{r['p95_ms']:>7.2f}  {str(r['tensorflow_imported']):>10s}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""One-time export of the TM pose model to TFLite (for TM_BACKEND=tflite).
+
+Converts the PoseNet graph (``tm_model/posenet_saved`` or the TF.js files;
+uint8 257×257 image → 14739 TM features) and ``tm_classifier.h5``
+(features → class probabilities) into
+``tm_model/quantized/{posenet,head}_<variant>.tflite``.  The server then
+runs them on the standalone LiteRT interpreter without importing
+TensorFlow (``pip install ai-edge-litert``).
+
+Usage:
+    cd backend
+    python export_tm_model.py                                  # float32
+    python export_tm_model.py --variants float32,float16
+    python export_tm_model.py --variants int8 --frames recordings/
+
+int8 needs recorded frames (image directory or video) for calibration;
+``quantize_tm_model.py`` also reports the accuracy of each variant.
+"""
+
+import argparse
+import os
+import sys
+import time
+
+os.environ["TF_CPP_MIN_LOG_LEVEL"] = "3"  # suppress TF warnings
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import numpy as np
+import tensorflow as tf
+
+from app.cv.preprocess import posenet_input
+from app.cv.recordings import load_frames
+from app.recognition.backends import QUANT_DIR, QUANT_VARIANTS, tflite_path
+from app.recognition.tf_graph import TFBackend
+
+def load_inputs(path, max_frames: int) -> np.ndarray:
+    """PoseNet inputs for *path* (random ones, with a warning, if None)."""
+    frames = load_frames(path, max_frames) if path else []
+    if frames:
+        print(f"Loaded {len(frames)} recorded frames from {path}")
+        return np.stack([posenet_input(f) for f in frames])
+    print("⚠️  No recorded frames (--frames) – using random inputs; int8 "
+          "calibration and agreement numbers are NOT representative")
+    rng = np.random.default_rng(0)
+    return rng.integers(0, 256, (32, 257, 257, 3), dtype=np.uint8)
+
+
+def _convert(variant: str, make_converter, representative) -> bytes:
+    conv = make_converter()
+    if variant == "float16":
+        conv.optimizations = [tf.lite.Optimize.DEFAULT]
+        conv.target_spec.supported_types = [tf.float16]
+    elif variant == "int8":
+        conv.optimizations = [tf.lite.Optimize.DEFAULT]
+        conv.representative_dataset = representative
+    return conv.convert()
+
+
+def export(backend: TFBackend, variants, calib_inputs: np.ndarray) -> dict:
+    """Write both models for every variant; returns {file name: bytes}."""
+    calib_feats = backend.features(calib_inputs)
+    models = {
+        "posenet": (
+            lambda: tf.compat.v1.lite.TFLiteConverter.from_session(
+                backend.session, [backend.input], [backend.features_t]),
+            lambda: ([x[None]] for x in calib_inputs),
+        ),
+        "head": (
+            lambda: tf.lite.TFLiteConverter.from_keras_model(backend.classifier),
+            lambda: ([f[None]] for f in calib_feats),
+        ),
+    }
+    QUANT_DIR.mkdir(parents=True, exist_ok=True)
+    sizes = {}
+    for name, (make_converter, representative) in models.items():
+        for v in variants:
+            t0 = time.perf_counter()
+            blob = _convert(v, make_converter, representative)
+            path = tflite_path(name, v)
+            path.write_bytes(blob)
+            sizes[path.name] = len(blob)
+            print(f"  wrote {path.name:24s} {len(blob) / 1e6:6.2f} MB  "
+                  f"({time.perf_counter() - t0:.1f}s)")
+    return sizes
+
+
+def parse_variants(spec: str) -> list:
+    """``--variants`` type: ``"float32,int8"`` → list, unknown names rejected."""
+    variants = [v.strip() for v in spec.split(",") if v.strip()]
+    bad = set(variants) - set(QUANT_VARIANTS)
+    if bad:
+        raise argparse.ArgumentTypeError(
+            f"unknown variant(s) {', '.join(sorted(bad))} (choose from {','.join(QUANT_VARIANTS)})")
+    return variants
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    ap.add_argument("--variants", type=parse_variants, default="float32",
+                    help=f"comma-separated subset of {','.join(QUANT_VARIANTS)}")
+    ap.add_argument("--frames", help="calibration frames for int8 (image dir or video)")
+    ap.add_argument("--max-frames", type=int, default=200)
+    args = ap.parse_args()
+    variants = args.variants
+
+    calib = load_inputs(args.frames, args.max_frames) if "int8" in variants else np.zeros(
+        (1, 257, 257, 3), dtype=np.uint8)
+    export(TFBackend(), variants, calib)
+    print(f"\nServe with TM_BACKEND=tflite (models in {QUANT_DIR})")
+
+
+if __name__ == "__main__":
+    main()
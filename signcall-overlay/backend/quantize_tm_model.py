@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""Post-training quantization of the TM pose model (PoseNet + head) to TFLite.
+
+Writes float32 / float16 / int8 TFLite variants of both models to
+``tm_model/quantized/`` and a report comparing every PoseNet × head
+combination against the float TF model:
+
+    * top-1 agreement with the TF model's predicted class,
+    * mean |Δp| of the predicted-class probability,
+    * per-frame latency and speedup over the fused TF graph.
+
+int8 variants are calibrated on recorded frames (half of them; the other
+half is used for the report).  Serve a variant with
+``TM_BACKEND=tflite TM_TFLITE_POSENET=<variant> TM_TFLITE_HEAD=<variant>``.
+
+Usage:
+    cd backend
+    python quantize_tm_model.py --frames recordings/            # image dir
+    python quantize_tm_model.py --frames session.mp4 --max-frames 400
+
+Without ``--frames`` random frames are used; the models are still written
+but agreement on noise says little about real accuracy.
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+
+os.environ["TF_CPP_MIN_LOG_LEVEL"] = "3"  # suppress TF warnings
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import numpy as np
+
+from app.recognition.backends import QUANT_DIR, QUANT_VARIANTS, TFLiteRunner, tflite_path
+from app.recognition.tf_graph import TFBackend
+from export_tm_model import export, load_inputs, parse_variants
+
+
+def time_per_frame(fn, inputs: np.ndarray, repeats: int) -> float:
+    """Mean ms per single-frame call over *inputs* (after one warm-up)."""
+    fn(inputs[:1])
+    t0 = time.perf_counter()
+    for _ in range(repeats):
+        for x in inputs:
+            fn(x[None])
+    return (time.perf_counter() - t0) * 1000 / (repeats * len(inputs))
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    ap.add_argument("--frames", help="directory of images or a video file")
+    ap.add_argument("--max-frames", type=int, default=200)
+    ap.add_argument("--repeats", type=int, default=3, help="latency passes over the eval set")
+    ap.add_argument("--variants", type=parse_variants, default=",".join(QUANT_VARIANTS),
+                    help=f"comma-separated subset of {','.join(QUANT_VARIANTS)}")
+    args = ap.parse_args()
+    variants = args.variants
+
+    inputs = load_inputs(args.frames, args.max_frames)
+    # Calibrate on one half, report on the other
+    calib = inputs[::2]
+    evals = inputs[1::2] if len(inputs) > 1 else inputs
+
+    backend = TFBackend()
+    ref_probs = backend.probs(evals)
+    ref_top1 = ref_probs.argmax(axis=1)
+    ref_ms = time_per_frame(backend.probs, evals, args.repeats)
+
+    sizes = export(backend, variants, calib)
+    runners = {
+        (name, v): TFLiteRunner(tflite_path(name, v))
+        for name in ("posenet", "head") for v in variants
+    }
+
+    rows = []
+    for pv in variants:
+        pose_feats = runners["posenet", pv](evals)
+        for hv in variants:
+            head = runners["head", hv]
+            probs = head(pose_feats)
+            top1 = probs.argmax(axis=1)
+            idx = np.arange(len(evals))
+            ms = time_per_frame(
+                lambda x: head(runners["posenet", pv](x)), evals, args.repeats)
+            rows.append({
+                "posenet": pv,
+                "head": hv,
+                "top1_agreement": float((top1 == ref_top1).mean()),
+                "mean_abs_dp": float(np.abs(probs[idx, ref_top1] - ref_probs[idx, ref_top1]).mean()),
+                "ms_per_frame": round(ms, 2),
+                "speedup": round(ref_ms / ms, 2),
+            })
+
+    report = {
+        "frames": args.frames or "random",
+        "n_calib": len(calib),
+        "n_eval": len(evals),
+        "reference": {"backend": "tf", "ms_per_frame": round(ref_ms, 2)},
+        "model_bytes": sizes,
+        "variants": rows,
+    }
+    report_path = QUANT_DIR / "report.json"
+    report_path.write_text(json.dumps(report, indent=2))
+
+    print(f"\nReference TF fused graph: {ref_ms:.2f} ms/frame  (eval frames: {len(evals)})")
+    print(f"{'posenet':>8s} {'head':>8s}  {'top-1 agree':>11s}  {'mean|Δp|':>8s}  "
+          f"{'ms/frame':>8s}  {'speedup':>7s}")
+    for r in rows:
+        print(f"{r['posenet']:>8s} {r['head']:>8s}  {r['top1_agreement']:>11.1%}  "
+              f"{r['mean_abs_dp']:>8.4f}  {r['ms_per_frame']:>8.2f}  {r['speedup']:>6.2f}x")
+    print(f"\nReport written to {report_path}")
+
+
+if __name__ == "__main__":
+    main()
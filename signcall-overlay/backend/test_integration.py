@@ -49,7 +49,7 @@ def _make_pose(shoulder_y=0.45):
 _frame_counter = 0
 
 
-def _fake_extract_landmarks(frame_bgr, ts: int) -> LandmarkFrame:
+def _fake_extract_landmarks(frame_bgr, ts: int, session=None, groups=None) -> LandmarkFrame:
     """Replaces the real MediaPipe extractor with synthetic HELLO gesture."""
     global _frame_counter
     t = (_frame_counter % 10) / 9.0  # 0→1 over each 10-frame window
@@ -79,7 +79,7 @@ async def test_orchestrator_pipeline():
     global _frame_counter
     _frame_counter = 0
     # Clear any stale per-session buffers
-    orchestrator._buffers.clear()
+    orchestrator._sessions.clear()
 
     session, user = "int_test", "user1"
     results = []
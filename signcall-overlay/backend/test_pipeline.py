@@ -0,0 +1,624 @@
+#!/usr/bin/env python3
+"""Unit tests for the pipeline plumbing (ingestion queue etc.).
+
+Run:  python test_pipeline.py   (from backend/)
+"""
+
+import os
+import sys
+import asyncio
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import numpy as np
+
+from app import metrics, resources, settings
+from app.cv.preprocess import POSENET_INPUT_SIZE, InputRing, posenet_input
+from app.cv.types import LandmarkFrame, LandmarkWindow
+from app.pipeline.ingest import FrameIngest, PendingFrame
+from app.pipeline.scheduler import RecognitionScheduler
+from app.pipeline.session import SessionRegistry, MAX_BUF_LEN
+
+
+def _pending(ts: int) -> PendingFrame:
+    return PendingFrame("s", "u", ts, "concise", ts, lambda d: d)
+
+
+def test_ingest_latest_frame_wins():
+    print("\n=== Test 1: latest-frame-wins ingestion ===")
+
+    async def run():
+        ingest = FrameIngest(max_pending=2, deadline_ms=0)
+        now = int(time.time() * 1000)
+        for i in range(5):
+            ingest.put(_pending(now + i))
+        got = [(await ingest.get()).ts - now for _ in range(2)]
+        return ingest, got
+
+    ingest, got = asyncio.run(run())
+    assert got == [3, 4], got
+    assert ingest.stats["received"] == 5
+    assert ingest.stats["dropped_overflow"] == 3
+    assert ingest.stats["processed"] == 2
+    print("  kept newest 2 of 5, dropped 3 ✓")
+
+
+def test_ingest_deadline():
+    print("\n=== Test 2: deadline-based dropping ===")
+
+    async def run():
+        ingest = FrameIngest(max_pending=4, deadline_ms=200)
+        now = int(time.time() * 1000)
+        ingest.put(_pending(now))          # establishes the clock offset
+        ingest.put(_pending(now - 1000))   # captured 1 s before → stale
+        first = await ingest.get()
+        fresh = _pending(now + 5)
+        ingest.put(fresh)
+        second = await ingest.get()
+        return ingest, first, second
+
+    ingest, first, second = asyncio.run(run())
+    assert first.ts == second.ts - 5
+    assert ingest.stats["dropped_stale"] == 1
+    print("  stale frame dropped, fresh frames delivered ✓")
+
+
+def test_session_lifecycle():
+    print("\n=== Test 3: session state lifecycle ===")
+    reg = SessionRegistry(idle_ttl_s=60, memory_cap_bytes=0)
+
+    a = reg.get("room", "alice")
+    assert reg.get("room", "alice") is a, "state must be looked up, not recreated"
+    per_session = a.nbytes
+    for i in range(MAX_BUF_LEN + 5):
+        reg.push(a, LandmarkFrame(ts=i))
+    assert len(a.landmarks) == MAX_BUF_LEN
+    assert [f.ts for f in a.landmarks] == list(range(5, MAX_BUF_LEN + 5))
+    assert a.nbytes == reg.total_bytes == per_session > 0, "footprint must stay fixed"
+    assert not hasattr(a, "frames"), "raw frames must not be retained"
+    print(f"  buffers bounded, fixed {per_session} bytes/session ✓")
+
+    assert reg.release(a.key) and a.key not in reg
+    assert reg.total_bytes == 0
+    print("  release on disconnect frees state ✓")
+
+    b = reg.get("room", "bob")
+    assert reg.evict_idle(now=b.last_seen + 30) == 0
+    assert reg.evict_idle(now=b.last_seen + 61) == 1 and len(reg) == 0
+    print("  idle TTL eviction ✓")
+
+    capped = SessionRegistry(idle_ttl_s=0, memory_cap_bytes=int(2.5 * per_session))
+    old = capped.get("room", "old")
+    capped.get("room", "mid")
+    capped.get("room", "old")          # touch → "mid" is now least recently used
+    capped.get("room", "new")
+    assert old.key in capped and "room:mid" not in capped and "room:new" in capped
+    assert capped.total_bytes == 2 * per_session
+    print("  memory cap evicts least-recently-used session ✓")
+
+
+def test_landmark_ring():
+    print("\n=== Test 4: landmark ring buffer ===")
+    state = SessionRegistry(idle_ttl_s=0, memory_cap_bytes=0).get("room", "ring")
+    hand = np.full((21, 3), 0.5, dtype=np.float32)
+    for i in range(MAX_BUF_LEN + 7):     # wrap around more than once
+        hands = [hand + i] if i % 2 else None
+        state.landmarks.append(LandmarkFrame(ts=i, hands=hands, handedness=["Right"]))
+
+    w = state.landmarks.window(10)
+    assert [f.ts for f in w.frames] == list(range(MAX_BUF_LEN - 3, MAX_BUF_LEN + 7))
+    assert (w.ts_start, w.ts_end) == (MAX_BUF_LEN - 3, MAX_BUF_LEN + 6)
+    assert w.hand_xyz.shape == (10, 2, 21, 3) and w.pose_mask.shape == (10,)
+    assert np.shares_memory(w.hand_xyz, state.landmarks._hand_xyz), "window must be a view"
+    for t, f in enumerate(w.frames):
+        assert w.hand_mask[t, 0] == (f.ts % 2 == 1) and not w.hand_mask[t, 1]
+        if f.hands:
+            assert np.allclose(w.hand_xyz[t, 0], hand + f.ts)
+            assert f.hands == [(hand + f.ts).tolist()]
+    print("  newest frames form a contiguous view after wrap-around ✓")
+
+    stacked = LandmarkWindow(frames=list(w.frames), ts_start=w.ts_start, ts_end=w.ts_end)
+    assert np.array_equal(stacked.hand_xyz, w.hand_xyz)
+    assert np.array_equal(stacked.hand_mask, w.hand_mask)
+    print("  list-built window stacks to the same arrays ✓")
+
+
+def test_input_ring():
+    print("\n=== Test 5: preprocessed PoseNet input ring ===")
+    ring = InputRing(3)
+    size = POSENET_INPUT_SIZE
+    assert ring.nbytes == 3 * size * size * 3 and ring.latest() is None
+    for i, shape in enumerate([(480, 640, 3), (720, 1280, 3), (640, 480, 3), (480, 640, 3)]):
+        frame = np.full(shape, i * 40, dtype=np.uint8)
+        slot = ring.next_slot()
+        assert posenet_input(frame, out=slot) is slot
+        latest = ring.commit()
+        assert latest.ctypes.data == slot.ctypes.data == ring.latest().ctypes.data
+    assert len(ring) == 3 and ring.nbytes == 3 * size * size * 3, "footprint must stay fixed"
+    assert ring.latest()[size // 2, size // 2, 0] == 120
+    assert ring.latest()[0, 0, 0] == 0, "letterbox padding must be black"
+    print("  inputs written in place, fixed footprint across resolutions ✓")
+
+    reg = SessionRegistry(idle_ttl_s=0, memory_cap_bytes=0)
+    state = reg.get("room", "alice")
+    report = reg.memory_report()
+    row = report["sessions"][state.key]
+    assert row["tm_inputs"] == state.tm_inputs.nbytes > 0
+    assert row["total"] == state.nbytes == report["total_bytes"]
+    print(f"  per-session report: {row} ✓")
+
+
+def test_recognition_scheduler():
+    print("\n=== Test 6: recognition scheduler ===")
+    # 8 fps stream: idle, 24 signing frames, idle
+    signing = [False] * 4 + [True] * 24 + [False] * 4
+    ts = [i * 125 for i in range(len(signing))]
+
+    def runs(sched):
+        return [i for i, (t, s) in enumerate(zip(ts, signing)) if sched.should_classify(t, s)]
+
+    assert runs(RecognitionScheduler("hop", hop_frames=1, hop_ms=0)) == list(range(4, 28))
+    print("  hop=1 classifies every signing frame (old behaviour) ✓")
+
+    hop4 = runs(RecognitionScheduler("hop", hop_frames=4, hop_ms=0))
+    assert hop4[0] == 4 and len(hop4) == 6, hop4
+    assert runs(RecognitionScheduler("hop", hop_frames=1, hop_ms=500)) == hop4
+    print("  hop=4 frames / 500 ms: 4x fewer runs, onset not delayed ✓")
+
+    assert runs(RecognitionScheduler("event", refresh_ms=1000)) == [4, 12, 20, 28]
+    print("  event mode: onset, 1 s refreshes, offset ✓")
+
+
+def test_resource_plan():
+    print("\n=== Test 7: CPU resource plan ===")
+    assert resources.parse_cpu_list("0-3, 6,x") == [0, 1, 2, 3, 6]
+    assert resources._format_cpus([0, 1, 2, 5, 7, 8]) == "0-2,5,7-8"
+
+    small = resources.ResourcePlan(cores=2, affinity="", tf_intra=0, tf_inter=0, cv_threads=0)
+    assert (small.tf_intra, small.tf_inter, small.cv_threads) == (2, 1, 1)
+    assert small.stage_concurrency == {"decode": 2, "landmarks": 1, "recognition": 1}
+    assert small.mediapipe_pool == 2 and small.landmark_threads == 2
+    one = resources.ResourcePlan(cores=1, affinity="", tf_intra=0, tf_inter=0, cv_threads=0)
+    assert one.landmark_threads == 1, "one core → models run sequentially"
+    big = resources.ResourcePlan(cores=8, affinity="", tf_intra=0, tf_inter=0, cv_threads=0)
+    assert big.stage_concurrency["recognition"] * big.tf_intra == 8, "TF threads must fit the budget"
+    assert big.stage_concurrency["landmarks"] == 4 and big.mediapipe_pool == 8
+    print(f"  8 cores → {big.as_dict()} ✓")
+
+    pinned = resources.ResourcePlan(cores=0, affinity="0", tf_intra=3, tf_inter=0, cv_threads=0)
+    assert pinned.cores == 1 and pinned.affinity == [0] and pinned.tf_intra == 3
+    print("  core budget from affinity, explicit overrides win ✓")
+
+
+def test_metrics_render():
+    print("\n=== Test 8: Prometheus metrics ===")
+    hist = metrics.Histogram("test_latency_seconds", "test", ["stage"], buckets=(0.01, 0.1))
+    child = hist.labels(stage="x")
+    for v in (0.005, 0.05, 0.5):
+        child.observe(v)
+    text = metrics.render()
+    assert 'test_latency_seconds_bucket{stage="x",le="0.01"} 1' in text
+    assert 'test_latency_seconds_bucket{stage="x",le="0.1"} 2' in text
+    assert 'test_latency_seconds_bucket{stage="x",le="+Inf"} 3' in text
+    assert 'test_latency_seconds_count{stage="x"} 3' in text
+    assert "# TYPE signcall_frames_received_total counter" in text
+    print("  cumulative buckets rendered ✓")
+
+
+class _FakeExtractor:
+    """Stands in for MediaPipe graphs; records resets and overlapping use."""
+
+    def __init__(self):
+        self.resets = 0
+        self.stops = 0
+        self.in_use = 0
+        self.needs_reset = False
+
+    def stop_threads(self):
+        self.stops += 1
+
+    def reset(self):
+        self.resets += 1
+        self.needs_reset = False
+
+
+def test_extractor_pool():
+    print("\n=== Test 9: MediaPipe extractor pool ===")
+    import threading
+    from app.cv.mediapipe_extractor import ExtractorPool
+
+    pool = ExtractorPool(2, factory=_FakeExtractor)
+    with pool.checkout("a") as a:
+        pass
+    with pool.checkout("a") as again:
+        assert again is a, "a session keeps its extractor"
+    with pool.checkout("b") as b:
+        assert b is not a
+    with pool.checkout("c") as c:
+        assert c is a and a.resets == 1, "LRU session's extractor is reset and reassigned"
+    assert len(pool) == 2
+    print("  sticky per session, LRU reassignment resets tracking ✓")
+
+    released = []
+    reg = SessionRegistry(idle_ttl_s=0, memory_cap_bytes=0, on_release=released.append)
+    reg.get("s", "b")
+    reg.release("s:b")
+    assert released == ["s:b"]
+    pool.release("b")
+    assert b.stops == 1, "released extractor's model threads are shut down"
+    with pool.checkout("d") as d:
+        assert d is b and b.resets == 1, "released extractor is reused after a reset"
+        pool.release("d")
+        assert d.stops == 1, "threads stay up while a frame is using them"
+    assert d.stops == 2, "…and are shut down when that frame is checked in"
+    print("  session release returns the extractor ✓")
+
+    pool = ExtractorPool(2, factory=_FakeExtractor)
+    overlap = []
+
+    def worker(key):
+        for _ in range(20):
+            with pool.checkout(key) as ext:
+                ext.in_use += 1
+                overlap.append(ext.in_use)
+                time.sleep(0.0005)
+                ext.in_use -= 1
+
+    threads = [threading.Thread(target=worker, args=(f"s{i}",)) for i in range(5)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert len(overlap) == 100 and max(overlap) == 1 and len(pool) == 2
+    print(f"  5 sessions × 20 frames on 2 instances, never shared concurrently ✓ ({pool.stats()})")
+
+
+def test_landmark_modes():
+    print("\n=== Test 10: Landmark stage selection ===")
+    from app.cv import landmark_stages, mediapipe_extractor
+    from app.recognition import classifier  # noqa: F401  (declares its needs)
+
+    assert landmark_stages.resolve("auto") == {"hands", "pose"}, "nothing reads the face"
+    assert landmark_stages.required_keypoints("pose") == {11, 12}
+    assert landmark_stages.resolve("hands") == {"hands"}
+    assert landmark_stages.resolve("full") == {"hands", "pose", "face"}
+    assert landmark_stages.resolve("bogus") == landmark_stages.MODES["full"]
+    print(f"  auto → {landmark_stages.describe(landmark_stages.resolve('auto'))} ✓")
+
+    if not mediapipe_extractor.HAS_MEDIAPIPE:
+        print("  MediaPipe not installed – extraction check skipped")
+        return
+    skipped = metrics.LANDMARK_MODEL_SKIPPED
+    before = {g: skipped[g].value for g in landmark_stages.GROUPS}
+    img = np.full((240, 320, 3), 127, dtype=np.uint8)
+    lf = mediapipe_extractor.extract_landmarks(img, 1, session="modes", groups=frozenset({"hands"}))
+    assert lf.pose is None and lf.face is None and lf.ts == 1
+    assert skipped["pose"].value == before["pose"] + 1
+    assert skipped["face"].value == before["face"] + 1
+    assert skipped["hands"].value == before["hands"]
+    mediapipe_extractor.release("modes")
+    print("  hands-only frame leaves pose / face None, skips counted ✓")
+
+    saved_mode = settings.LANDMARK_MODE
+    try:
+        settings.LANDMARK_MODE = "hands"
+        mediapipe_extractor._model_mean_s.clear()
+        mediapipe_extractor.warmup()
+    finally:
+        settings.LANDMARK_MODE = saved_mode
+    assert set(mediapipe_extractor._model_mean_s) == set(landmark_stages.GROUPS)
+    saved_s = metrics.LANDMARK_SKIPPED_SECONDS["face"].value
+    mediapipe_extractor.extract_landmarks(img, 2, session="modes", groups=frozenset({"hands"}))
+    mediapipe_extractor.release("modes")
+    assert metrics.LANDMARK_SKIPPED_SECONDS["face"].value > saved_s
+    print("  warm-up seeds a baseline for models the mode never runs ✓")
+
+
+def test_parallel_landmarks():
+    print("\n=== Test 11: Parallel landmark models ===")
+    from app.cv import landmark_stages, mediapipe_extractor
+
+    done = []
+
+    def failing(ext, img):
+        raise RuntimeError("bad frame")
+
+    def slow(ext, img):
+        time.sleep(0.05)
+        done.append(True)
+
+    saved = (mediapipe_extractor._STAGES, resources._plan)
+    mediapipe_extractor._STAGES = (("hands", failing), ("pose", slow), ("face", slow))
+    resources._plan = resources.ResourcePlan(landmark_threads=3)
+    ext = mediapipe_extractor.Extractor()
+    try:
+        mediapipe_extractor._run_models(ext, None, landmark_stages.MODES["full"])
+        raise AssertionError("the model error must propagate")
+    except RuntimeError:
+        assert done == [True, True], "all submitted models finished before the error surfaced"
+    finally:
+        mediapipe_extractor._STAGES, resources._plan = saved
+        ext.reset()
+    assert ext._threads is None, "reset shuts the model thread group down"
+    print("  a failing model waits for the others before the extractor is returned ✓")
+
+    if not mediapipe_extractor.HAS_MEDIAPIPE:
+        print("  MediaPipe not installed – skipped")
+        return
+    img = np.random.default_rng(11).integers(0, 256, (240, 320, 3), dtype=np.uint8)
+    full = landmark_stages.MODES["full"]
+    saved_plan = resources._plan
+    frames, latency = {}, metrics.LANDMARK_MODEL_LATENCY
+    try:
+        for threads in (1, 3):
+            resources._plan = resources.ResourcePlan(landmark_threads=threads)
+            critical = sum(c.value for c in metrics.LANDMARK_CRITICAL_PATH.values())
+            counts = {g: sum(latency[g].counts) for g in full}
+            key = f"parallel-{threads}"
+            frames[threads] = mediapipe_extractor.extract_landmarks(img, 1, session=key, groups=full)
+            mediapipe_extractor.release(key)
+            assert all(sum(latency[g].counts) == counts[g] + 1 for g in full), "per-model latency"
+            ran_parallel = sum(c.value for c in metrics.LANDMARK_CRITICAL_PATH.values()) > critical
+            assert ran_parallel == (threads > 1)
+    finally:
+        resources._plan = saved_plan
+    a, b = frames[1], frames[3]
+    assert (a.hand_mask == b.hand_mask).all() and a.pose_mask == b.pose_mask and a.face_mask == b.face_mask
+    assert np.allclose(a.xyz, b.xyz)
+    print("  3 models on the extractor's thread group = sequential result ✓")
+
+
+def test_landmark_rates():
+    print("\n=== Test 12: Rate-limited landmark groups ===")
+    from app.cv import landmark_stages, mediapipe_extractor
+    from app.cv.types import LandmarkRing
+
+    assert landmark_stages.parse_rates("pose=3, face=5") == {"pose": 3, "face": 5}
+    assert landmark_stages.parse_rates("hands=2,pose=x,legs=2,face=1") == {"face": 1}
+    print("  LANDMARK_RATES parsed, hands never rate-limited ✓")
+
+    calls = {"hands": 0, "pose": 0}
+
+    def hands(ext, img):
+        calls["hands"] += 1
+        return None, None
+
+    def pose(ext, img):
+        calls["pose"] += 1
+        return np.full((33, 3), ext.frame_no, dtype=np.float32)
+
+    saved = (mediapipe_extractor._STAGES, landmark_stages._rates,
+             settings.LANDMARK_FILL, resources._plan)
+    mediapipe_extractor._STAGES = (("hands", hands), ("pose", pose))
+    landmark_stages._rates = {"pose": 3}
+    resources._plan = resources.ResourcePlan(landmark_threads=1)
+    groups = frozenset({"hands", "pose"})
+    reused_before = metrics.LANDMARK_MODEL_REUSED["pose"].value
+    try:
+        ext = mediapipe_extractor.Extractor()
+        settings.LANDMARK_FILL = "carry"
+        seen = [mediapipe_extractor._run_models(ext, None, groups) for _ in range(6)]
+        assert calls == {"hands": 6, "pose": 2}
+        assert [bool(r) for _, r in seen] == [False, True, True, False, True, True]
+        assert [float(out["pose"][0, 0]) for out, _ in seen] == [1, 1, 1, 4, 4, 4]
+        assert metrics.LANDMARK_MODEL_REUSED["pose"].value == reused_before + 4
+        print("  pose measured on frames 1 and 4, carried in between ✓")
+
+        settings.LANDMARK_FILL = "linear"
+        out, _ = mediapipe_extractor._run_models(ext, None, groups)   # frame 7: measured
+        out, reused = mediapipe_extractor._run_models(ext, None, groups)
+        assert reused == {"pose"} and float(out["pose"][0, 0]) == 8.0
+        print("  linear fill extrapolates from the last two measurements ✓")
+
+        ext.reset()
+        _, reused = mediapipe_extractor._run_models(ext, None, groups)
+        assert not reused and ext.frame_no == 1
+        print("  reset() drops the history (next frame measured) ✓")
+    finally:
+        (mediapipe_extractor._STAGES, landmark_stages._rates,
+         settings.LANDMARK_FILL, resources._plan) = saved
+
+    ring = LandmarkRing(4)
+    for ts, fresh in enumerate((True, False, False, True)):
+        f = LandmarkFrame(ts=ts, pose=np.zeros((33, 3)))
+        f.pose_fresh = fresh
+        ring.append(f)
+    assert ring.window(4).pose_fresh.tolist() == [True, False, False, True]
+    print("  LandmarkWindow.pose_fresh flags carried frames ✓")
+
+
+def test_hand_roi():
+    print("\n=== Test 13: Pose-guided hand ROI ===")
+    from types import SimpleNamespace
+    from app.cv import mediapipe_extractor
+
+    pose = np.full((33, 3), 0.5, dtype=np.float32)
+    pose[13, :2], pose[15, :2] = (0.25, 0.8), (0.25, 0.5)       # left elbow, wrist
+    pose[[17, 19, 21], :2] = (0.25, 0.45)
+    pose[16, :2] = (1.2, 0.5)                                    # right wrist off-screen
+    rects = mediapipe_extractor._hand_rois(None, pose, 640, 480)
+    assert len(rects) == 1
+    x0, y0, x1, y1 = rects[0]
+    assert x0 <= 160 < x1 and y0 <= 240 < y1 and x1 - x0 >= 144   # ≥ forearm, padded
+    hand = np.zeros((1, 21, 3), dtype=np.float32)
+    hand[0, :, :2] = (0.25, 0.5)
+    assert len(mediapipe_extractor._hand_rois(hand, pose, 640, 480)) == 1
+    print("  crops around the previous hand / uncovered visible wrists ✓")
+
+    prev = [np.array([500.0, 200.0]), None]
+    assert mediapipe_extractor._assign_slots(prev, [np.array([100.0, 200.0]),
+                                                    np.array([490.0, 210.0])]) == [1, 0]
+    print("  crops keep the slot whose hand they follow ✓")
+
+    class FakeHands:
+        def __init__(self, found):
+            self.found, self.shapes, self.resets = found, [], 0
+
+        def process(self, img):
+            self.shapes.append(img.shape)
+            if not self.found:
+                return SimpleNamespace(multi_hand_landmarks=None, multi_handedness=None)
+            lms = [SimpleNamespace(x=0.5, y=0.5, z=0.1)] * 21
+            return SimpleNamespace(
+                multi_hand_landmarks=[SimpleNamespace(landmark=lms)],
+                multi_handedness=[SimpleNamespace(classification=[SimpleNamespace(label="Left")])],
+            )
+
+        def reset(self):
+            self.resets += 1
+
+    img = np.zeros((480, 640, 3), dtype=np.uint8)
+    ext = mediapipe_extractor.Extractor()
+    graphs = dict(hands=FakeHands(False), hands_roi_0=FakeHands(True), hands_roi_1=FakeHands(True))
+    ext._graphs.update(graphs)
+    saved = settings.HAND_ROI
+    before = {k: c.value for k, c in metrics.HAND_ROI.items()}
+    try:
+        settings.HAND_ROI = True
+        hands, handedness = mediapipe_extractor._extract_hands(ext, img)   # no source yet
+        assert hands is None and graphs["hands"].shapes == [(480, 640, 3)]
+
+        ext.roi_source = (None, pose)
+        hands, handedness = mediapipe_extractor._extract_hands(ext, img)
+        assert graphs["hands_roi_0"].shapes == [(y1 - y0, x1 - x0, 3)]
+        assert np.allclose(hands[0, 0], [(x0 + x1) / 2 / 640, (y0 + y1) / 2 / 480,
+                                         0.1 * (x1 - x0) / 640], atol=1e-3)
+        assert handedness == ["Left"] and not graphs["hands_roi_1"].shapes
+        print("  crop landmarks mapped back to full-frame coordinates ✓")
+
+        graphs["hands_roi_0"].found = False
+        mediapipe_extractor._extract_hands(ext, img)
+        assert len(graphs["hands"].shapes) == 2
+        print("  empty crops fall back to the full frame ✓")
+
+        for _ in range(mediapipe_extractor._ROI_BACKOFF_FRAMES):
+            mediapipe_extractor._extract_hands(ext, img)
+        assert len(graphs["hands_roi_0"].shapes) == 2 and len(graphs["hands"].shapes) == 7
+        print("  full frame only for a few frames after a miss ✓")
+
+        ext.roi_source = (None, None)
+        mediapipe_extractor._extract_hands(ext, img)
+        assert graphs["hands_roi_0"].resets == 1 and ext.roi_slots == [None, None]
+        print("  slots without a crop are reset ✓")
+    finally:
+        settings.HAND_ROI = saved
+    assert {k: c.value - before[k] for k, c in metrics.HAND_ROI.items()} == {
+        "hit": 1, "miss": 1, "none": 2, "backoff": 5}
+    ext.reset()
+    assert ext.roi_source == (None, None) and ext.roi_backoff == 0
+    print("  hit / miss / none / backoff counted ✓")
+
+
+def test_health_endpoints():
+    print("\n=== Test 14: Health / readiness endpoints ===")
+    import logging
+    from fastapi.testclient import TestClient
+
+    level = logging.getLogger().level
+    from app import main as app_main
+    from app.cv import mediapipe_extractor
+    from app.recognition import classifier
+
+    logging.getLogger().setLevel(level)   # app.main configures DEBUG logging
+    client = TestClient(app_main.app)     # no context manager → no startup warm-up
+    state = app_main.app.state
+    saved = (mediapipe_extractor.warmup, classifier._check_tm_available)
+
+    def broken():
+        raise RuntimeError("graph load failed")
+
+    try:
+        state.ready, state.warmup_error = False, None
+        assert client.get("/healthz").json() == {"status": "ok"}
+        r = client.get("/readyz")
+        assert r.status_code == 503 and r.json()["status"] == "warming"
+        print("  /healthz ok, /readyz 503 while warming ✓")
+
+        mediapipe_extractor.warmup = broken
+        asyncio.run(app_main._warm_up())
+        r = client.get("/readyz")
+        assert r.status_code == 503 and r.json()["status"] == "failed"
+        assert "graph load failed" in r.json()["error"]
+        assert client.get("/healthz").status_code == 200
+        print("  failed warm-up leaves the worker unready ✓")
+
+        if mediapipe_extractor.HAS_MEDIAPIPE:
+            mediapipe_extractor.warmup = saved[0]
+            stages = mediapipe_extractor._STAGES
+            mediapipe_extractor._STAGES = (("hands", lambda ext, img: broken()),) + stages[1:]
+            try:
+                state.warmup_error = None
+                asyncio.run(app_main._warm_up())
+            finally:
+                mediapipe_extractor._STAGES = stages
+            r = client.get("/readyz")
+            assert r.status_code == 503 and r.json()["status"] == "failed"
+            assert "MediaPipe warm-up failed for hands" in r.json()["error"]
+            print("  a failing MediaPipe graph fails the warm-up too ✓")
+
+        state.warmup_error = None
+        mediapipe_extractor.warmup = lambda: {"mediapipe_hands": 1.0}
+        classifier._check_tm_available = lambda: False
+        asyncio.run(app_main._warm_up())
+        r = client.get("/readyz")
+        assert r.status_code == 200 and r.json()["status"] == "ready"
+        assert r.json()["components_ms"]["mediapipe_hands"] == 1.0
+        print("  successful warm-up → 200 with component times ✓")
+    finally:
+        mediapipe_extractor.warmup, classifier._check_tm_available = saved
+        state.ready, state.warmup_error = False, None
+
+
+def test_stage_executor():
+    print("\n=== Test 15: Stage executor configuration ===")
+    from app.pipeline import executor
+
+    parse = executor._parse_concurrency
+    assert parse("decode=2, landmarks=0") == {"decode": 2, "landmarks": 1}
+    assert parse("bogus,recognition=x,,translate=3") == {"translate": 3}
+    assert parse("") == {}
+    print("  STAGE_CONCURRENCY parsed, bad entries ignored, limits ≥ 1 ✓")
+
+    ex = executor.StageExecutor(limits={"decode": 3})
+    assert ex.limits["decode"] == 3
+    assert ex.limits["translate"] == executor.DEFAULT_STAGE_CONCURRENCY["translate"]
+    print("  explicit limits override the defaults ✓")
+
+    saved = (executor._executor, settings.STAGE_CONCURRENCY, resources._plan)
+    try:
+        executor._executor = None
+        resources._plan = resources.ResourcePlan(
+            cores=2, affinity="", tf_intra=0, tf_inter=0, cv_threads=0)
+        settings.STAGE_CONCURRENCY = "decode=5"
+        ex3 = executor.get_executor()
+        assert ex3.limits["decode"] == 5, "STAGE_CONCURRENCY overrides the CPU plan"
+        assert ex3.limits["recognition"] == 1
+        assert asyncio.run(ex3.run("decode", sum, [1, 2, 3])) == 6
+        ex3.shutdown()
+    finally:
+        executor._executor, settings.STAGE_CONCURRENCY, resources._plan = saved
+    print("  get_executor merges plan + STAGE_CONCURRENCY, runs on thread pools ✓")
+
+
+def main():
+    test_ingest_latest_frame_wins()
+    test_ingest_deadline()
+    test_session_lifecycle()
+    test_landmark_ring()
+    test_input_ring()
+    test_recognition_scheduler()
+    test_resource_plan()
+    test_metrics_render()
+    test_extractor_pool()
+    test_landmark_modes()
+    test_parallel_landmarks()
+    test_landmark_rates()
+    test_hand_roi()
+    test_health_endpoints()
+    test_stage_executor()
+    print("\n✓ Pipeline tests passed")
+
+
+if __name__ == "__main__":
+    main()
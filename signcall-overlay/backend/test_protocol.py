@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""Tests for the binary-v1 WebSocket frame protocol.
+
+Run:  python test_protocol.py   (from backend/)
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import cv2
+import numpy as np
+
+from app.schemas import binary
+from app.cv.preprocess import jpeg_to_bgr
+
+
+def _jpeg(h=48, w=64) -> bytes:
+    img = np.full((h, w, 3), 128, dtype=np.uint8)
+    ok, enc = cv2.imencode(".jpg", img)
+    assert ok
+    return enc.tobytes()
+
+
+def test_round_trip():
+    print("\n=== Test 1: binary-v1 round trip ===")
+    jpeg = _jpeg()
+    buf = binary.encode_message(
+        binary.KIND_FRAME, "room-1", "alice", 1730000000123, jpeg, style="detailed"
+    )
+    assert len(buf) == binary.HEADER_SIZE + len("room-1") + len("alice") + len(jpeg)
+
+    msg = binary.decode_message(buf)
+    assert msg.kind == binary.KIND_FRAME
+    assert (msg.session, msg.user, msg.ts, msg.style) == (
+        "room-1", "alice", 1730000000123, "detailed",
+    )
+    assert bytes(msg.payload) == jpeg
+    # Payload is a view into the received buffer, not a copy
+    assert msg.payload.obj is buf
+    print("  header + payload decoded ✓")
+
+    img = jpeg_to_bgr(msg.payload)
+    assert img is not None and img.shape == (48, 64, 3)
+    print("  JPEG decoded straight from the payload view ✓")
+
+
+def test_malformed():
+    print("\n=== Test 2: malformed messages ===")
+    good = binary.encode_message(binary.KIND_FRAME, "s", "u", 1, b"\xff\xd8")
+    for bad in (good[:10], b"\x02" + good[1:], good[:binary.HEADER_SIZE + 1]):
+        try:
+            binary.decode_message(bad)
+        except ValueError:
+            continue
+        raise AssertionError(f"expected ValueError for {bad!r}")
+    assert jpeg_to_bgr(memoryview(b"")) is None
+    print("  truncated / wrong-version messages rejected ✓")
+
+
+def test_landmarks_payload():
+    print("\n=== Test 3: landmark payload (kind 2) ===")
+    rng = np.random.default_rng(0)
+    hands = rng.uniform(0, 1, (2, 21, 3)).astype(np.float32)
+    pose = rng.uniform(0, 1, (33, 3)).astype(np.float32)
+
+    payload = binary.encode_landmarks(hands, ["Left", "Right"], pose)
+    buf = binary.encode_message(binary.KIND_LANDMARKS, "s", "u", 5, payload)
+    msg = binary.decode_message(buf)
+    h, hd, p = binary.decode_landmarks(msg.payload)
+    assert np.array_equal(h, hands) and np.array_equal(p, pose)
+    assert hd == ["Left", "Right"]
+    print("  float32 hands + pose round trip exactly ✓")
+
+    from app.api.ws import _binary_to_landmarks
+    lf = _binary_to_landmarks(msg.payload, 5)
+    assert lf.ts == 5 and lf.n_hands == 2 and lf.pose_mask and lf.handedness == ["Left", "Right"]
+    assert np.array_equal(lf.hand_xyz, hands) and np.array_equal(lf.pose_xyz, pose)
+    assert not np.shares_memory(lf.xyz, np.frombuffer(msg.payload, dtype=np.uint8))
+    empty = _binary_to_landmarks(memoryview(binary.encode_landmarks(None)), 6)
+    assert empty.hands is None and empty.pose is None
+    print("  payload arrays go straight into the LandmarkFrame block ✓")
+
+    h, hd, p = binary.decode_landmarks(
+        memoryview(binary.encode_landmarks(hands[:1], ["Right"], None, quantize=True))
+    )
+    assert h.shape == (1, 21, 3) and hd == ["Right"] and p is None
+    assert np.abs(h - hands[:1]).max() < 1e-4
+    print("  uint16 quantized payload within 1e-4 ✓")
+
+    h, hd, p = binary.decode_landmarks(memoryview(binary.encode_landmarks(None)))
+    assert h is None and hd is None and p is None
+    for bad in (payload[:3], payload[:-4], b"\x03\x00\x00\x00"):
+        try:
+            binary.decode_landmarks(memoryview(bad))
+        except ValueError:
+            continue
+        raise AssertionError(f"expected ValueError for {len(bad)}-byte payload")
+    nan = binary.encode_landmarks(np.full((1, 21, 3), np.nan, dtype=np.float32))
+    try:
+        binary.decode_landmarks(memoryview(nan))
+        raise AssertionError("expected ValueError for NaN landmarks")
+    except ValueError:
+        pass
+    print("  empty / truncated / NaN payloads handled ✓")
+
+
+def main():
+    test_round_trip()
+    test_malformed()
+    test_landmarks_payload()
+    print("\n✓ Protocol tests passed")
+
+
+if __name__ == "__main__":
+    main()
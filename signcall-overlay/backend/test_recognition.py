@@ -10,6 +10,8 @@ Run:  python test_recognition.py   (from backend/)
 
 import os
 import sys
+import asyncio
+from typing import Optional
 
 # Ensure the backend package is importable regardless of cwd
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
@@ -17,7 +19,14 @@ sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 import numpy as np
 from app.cv.types import LandmarkFrame, LandmarkWindow
 from app.recognition.detector import is_signing
-from app.recognition.classifier import predict, extract_features, _ema_state
+from app.recognition.classifier import (
+    FINGERTIPS, L_SHOULDER, MCP_JOINTS, R_SHOULDER, WRIST,
+    predict, extract_features, extract_features_batch, _ema_state,
+)
+from app import metrics, settings
+from app.recognition import classifier, fusion
+from app.recognition.fusion import ProbRing, fuse_probs
+from app.recognition.incremental import IncrementalFeatures
 from app.recognition.smoothing import smooth, reset_history
 
 
@@ -286,6 +295,490 @@ def test_member4_contract():
     print("✓ Member 4 contract tests passed")
 
 
+def _random_window(rng, num_frames: int) -> LandmarkWindow:
+    """Random mix of 0/1/2 hands, with and without pose."""
+    frames = []
+    for i in range(num_frames):
+        n_hands = rng.choice([0, 1, 2], p=[0.2, 0.3, 0.5])
+        hands = [rng.uniform(0, 1, (21, 3)).tolist() for _ in range(n_hands)] or None
+        pose = _make_pose(rng.uniform(0.3, 0.6)) if rng.random() < 0.7 else None
+        frames.append(LandmarkFrame(ts=i * 100, hands=hands, pose=pose))
+    return LandmarkWindow(frames=frames, ts_start=0, ts_end=(num_frames - 1) * 100)
+
+
+# ── per-frame reference implementation (parity oracle) ─────────────────
+
+def _kp_xy(hand: list, idx: int) -> Optional[np.ndarray]:
+    """Return [x, y] for a keypoint index, or None."""
+    try:
+        kp = hand[idx]
+        return np.array([kp[0], kp[1]], dtype=np.float64)
+    except (IndexError, TypeError):
+        return None
+
+
+def _avg_fingertip_spread(hand: list) -> float:
+    """Average distance from each fingertip to wrist, normalised ~0-1."""
+    wrist = _kp_xy(hand, WRIST)
+    if wrist is None:
+        return 0.0
+    dists: list[float] = []
+    for tip_idx in FINGERTIPS:
+        tip = _kp_xy(hand, tip_idx)
+        if tip is not None:
+            dists.append(float(np.linalg.norm(tip - wrist)))
+    return float(np.mean(dists)) if dists else 0.0
+
+
+def _finger_curl(hand: list) -> float:
+    """Average finger curl (0 = straight / extended, 1 = fully curled).
+
+    Measured as  1 - (tip_to_mcp / max_finger_len)  per finger.
+    max_finger_len is the sum of bone lengths MCP→PIP→DIP→TIP when the finger
+    is fully extended.  When curled the tip folds back towards the MCP, so
+    tip_to_mcp shrinks.  This avoids the wrist-reference problem where the
+    tip is always further from the wrist than the MCP.
+    """
+    curls: list[float] = []
+    # Each finger is 4 consecutive keypoints: MCP, PIP, DIP, TIP
+    # Index: 5-8, Middle: 9-12, Ring: 13-16, Pinky: 17-20
+    for base in [5, 9, 13, 17]:
+        pts = []
+        for j in range(4):
+            p = _kp_xy(hand, base + j)
+            if p is None:
+                break
+            pts.append(p)
+        if len(pts) < 4:
+            continue
+        # max_len = sum of bone lengths (fully extended straight line)
+        max_len = sum(
+            float(np.linalg.norm(pts[i + 1] - pts[i])) for i in range(3)
+        )
+        if max_len < 1e-6:
+            continue
+        # tip_to_mcp = straight-line distance MCP→TIP
+        tip_to_mcp = float(np.linalg.norm(pts[3] - pts[0]))
+        # When straight: tip_to_mcp ≈ max_len → curl ≈ 0
+        # When curled:   tip_to_mcp << max_len → curl → 1
+        curls.append(np.clip(1.0 - tip_to_mcp / max_len, 0.0, 1.0))
+    return float(np.mean(curls)) if curls else 0.5
+
+
+def _palm_centre(hand: list) -> Optional[np.ndarray]:
+    """Return [x, y] of the palm centre (avg of wrist + 4 MCP joints).
+
+    More stable than wrist alone because it averages out tracking jitter.
+    """
+    pts: list[np.ndarray] = []
+    for idx in [WRIST] + MCP_JOINTS:
+        p = _kp_xy(hand, idx)
+        if p is not None:
+            pts.append(p)
+    if not pts:
+        return None
+    return np.mean(pts, axis=0)
+
+
+def _shoulder_midpoint_y(frame: "LandmarkFrame") -> Optional[float]:
+    """Return Y of the midpoint between left and right shoulder, or None."""
+    if frame.pose is None or len(frame.pose) < 13:
+        return None
+    try:
+        ly = frame.pose[L_SHOULDER][1]
+        ry = frame.pose[R_SHOULDER][1]
+        return (ly + ry) / 2.0
+    except (IndexError, TypeError):
+        return None
+
+
+def _extract_features_loop(window: "LandmarkWindow") -> np.ndarray:
+    """Per-frame reference implementation of ``extract_features``.
+
+    The original loop the vectorized version replaced; parity oracle only.
+    """
+    N_FEAT = 7
+    if not window or not window.frames:
+        return np.zeros(N_FEAT)
+
+    frames_with_hands = [
+        f for f in window.frames
+        if f.hands is not None and len(f.hands) >= 1
+    ]
+    if not frames_with_hands:
+        return np.zeros(N_FEAT)
+
+    # ── Feature 0: inter-hand distance (wrist-to-wrist, avg over window) ──
+    inter_dists: list[float] = []
+    for f in frames_with_hands:
+        if len(f.hands) >= 2:
+            w0 = _kp_xy(f.hands[0], WRIST)
+            w1 = _kp_xy(f.hands[1], WRIST)
+            if w0 is not None and w1 is not None:
+                inter_dists.append(float(np.linalg.norm(w1 - w0)))
+    feat_inter_hand = float(np.mean(inter_dists)) if inter_dists else 0.0
+    feat_inter_hand = np.clip(feat_inter_hand, 0.0, 1.0)
+
+    # ── Feature 1: hand height relative to shoulders ──────────────────────
+    # lower value = hands above shoulders, higher = below
+    rel_heights: list[float] = []
+    for f in frames_with_hands:
+        shoulder_y = _shoulder_midpoint_y(f)
+        for hand in f.hands[:2]:
+            wrist = _kp_xy(hand, WRIST)
+            if wrist is not None:
+                if shoulder_y is not None:
+                    # positive = hands below shoulder
+                    rel_heights.append(wrist[1] - shoulder_y + 0.5)
+                else:
+                    # fallback: raw Y (0 = top of frame, 1 = bottom)
+                    rel_heights.append(wrist[1])
+    feat_hand_height = float(np.mean(rel_heights)) if rel_heights else 0.5
+    feat_hand_height = np.clip(feat_hand_height, 0.0, 1.0)
+
+    # ── Feature 2: fingertip spread (open hand vs fist) ───────────────────
+    spreads: list[float] = []
+    for f in frames_with_hands:
+        for hand in f.hands[:2]:
+            spreads.append(_avg_fingertip_spread(hand))
+    feat_spread = float(np.mean(spreads)) if spreads else 0.0
+    # Spread is already in 0-~0.4 range for normalised coords; rescale
+    feat_spread = np.clip(feat_spread / 0.35, 0.0, 1.0)
+
+    # ── Feature 3 & 4: motion magnitude & speed ──────────────────────────
+    # Use palm centre (avg wrist+MCPs) for more stable tracking than wrist alone
+    displacements: list[float] = []
+    dy_fracs: list[float] = []
+    for i in range(len(frames_with_hands) - 1):
+        curr_hands = frames_with_hands[i].hands
+        next_hands = frames_with_hands[i + 1].hands
+        for h_idx in range(min(len(curr_hands), len(next_hands))):
+            cp = _palm_centre(curr_hands[h_idx])
+            np_ = _palm_centre(next_hands[h_idx])
+            if cp is not None and np_ is not None:
+                diff = np_ - cp
+                d = float(np.linalg.norm(diff))
+                displacements.append(d)
+                if d > 1e-6:
+                    dy_fracs.append(abs(diff[1]) / d)
+
+    total_motion = sum(displacements)
+    feat_motion = np.clip(total_motion / 1.2, 0.0, 1.0)   # wider range for real data
+
+    n_steps = max(1, len(displacements))
+    feat_speed = np.clip((total_motion / n_steps) / 0.15, 0.0, 1.0)
+
+    # ── Feature 5: vertical-motion fraction ───────────────────────────────
+    feat_vert = float(np.mean(dy_fracs)) if dy_fracs else 0.5
+
+    # ── Feature 6: finger curl (replaces noisy symmetry metric) ───────────
+    curls: list[float] = []
+    for f in frames_with_hands:
+        for hand in f.hands[:2]:
+            curls.append(_finger_curl(hand))
+    feat_curl = float(np.mean(curls)) if curls else 0.5
+
+    return np.array([
+        feat_inter_hand,
+        feat_hand_height,
+        feat_spread,
+        feat_motion,
+        feat_speed,
+        feat_vert,
+        feat_curl,
+    ])
+
+
+def test_vectorized_parity():
+    """Array-based features must match the per-frame reference loop."""
+    print("\n=== Test 7: Vectorized Feature Parity ===")
+
+    rng = np.random.default_rng(7)
+    windows = [create_mock_window(tok) for tok in ["HELLO", "THANKS", "REPEAT", "SLOW"]]
+    windows += [_make_idle_window(), LandmarkWindow(frames=[], ts_start=0, ts_end=0)]
+    windows += [_random_window(rng, int(rng.integers(1, 16))) for _ in range(200)]
+
+    for w in windows:
+        ref = _extract_features_loop(w)
+        got = extract_features(w)
+        assert np.allclose(got, ref, rtol=1e-12, atol=1e-12), f"{got} ≠ {ref}"
+    print(f"  {len(windows)} windows match the reference loop ✓")
+
+    batch = extract_features_batch(windows)
+    assert batch.shape == (len(windows), 7)
+    assert np.allclose(batch, [_extract_features_loop(w) for w in windows], rtol=1e-12, atol=1e-12)
+    print("  batched (padded) windows match too ✓")
+
+    print("✓ Vectorized parity tests passed")
+
+
+def test_incremental_features():
+    """O(1) sliding-window features must track the full-window recompute."""
+    print("\n=== Test 8: Incremental Window Features ===")
+
+    rng = np.random.default_rng(11)
+    gestures = [create_mock_window(tok).frames for tok in ["HELLO", "REPEAT", "SLOW"]]
+    stream = [f for frames in gestures for f in frames]
+    stream += _random_window(rng, 200).frames
+    stream += _make_idle_window(12).frames
+
+    for size in (10, 30):
+        inc = IncrementalFeatures(size)
+        for i, frame in enumerate(stream):
+            inc.push(frame)
+            frames = stream[max(0, i + 1 - size): i + 1]
+            window = LandmarkWindow(frames=frames, ts_start=frames[0].ts, ts_end=frames[-1].ts)
+            ref = extract_features(window)
+            assert np.allclose(inc.vector(), ref, rtol=1e-9, atol=1e-9), \
+                f"step {i}: {inc.vector()} ≠ {ref}"
+            assert inc.is_signing() == is_signing(window), f"step {i}: is_signing differs"
+        print(f"  window={size:2d}: {len(stream)} slides match full recompute ✓")
+
+    print("✓ Incremental feature tests passed")
+
+
+def test_cascade():
+    """Prototype first; TM only when the cheap stage is unsure."""
+    print("\n=== Test 9: Recognition Cascade ===")
+
+    tm_calls = []
+
+    async def fake_tm(frames_bgr, ts, state=None):
+        tm_calls.append(ts)
+        return {"token": "THANKS", "confidence": 0.9, "top2": ["THANKS", "HELLO"], "ts": ts}
+
+    saved = (classifier._tm_available, classifier._predict_tm_async, settings.CASCADE,
+             settings.CASCADE_MIN_CONFIDENCE, settings.CASCADE_AUDIT_EVERY)
+    classifier._tm_available = True
+    classifier._predict_tm_async = fake_tm
+    settings.CASCADE, settings.CASCADE_AUDIT_EVERY = True, 0
+    frames = [np.zeros((4, 4, 3), dtype=np.uint8)]
+    try:
+        before = (metrics.CASCADE_PROTOTYPE.value, metrics.CASCADE_POSENET.value,
+                  metrics.CASCADE_DISAGREE.value)
+
+        settings.CASCADE_MIN_CONFIDENCE = 0.5
+        _ema_state.clear()
+        pred = asyncio.run(classifier.predict_with_tm_async(
+            create_mock_window("HELLO"), frames, session_id="cascade", ts=1))
+        assert pred["token"] == "HELLO" and not tm_calls
+        print("  confident prototype accepted, PoseNet skipped ✓")
+
+        settings.CASCADE_MIN_CONFIDENCE = 1.01   # nothing is confident enough
+        _ema_state.clear()
+        pred = asyncio.run(classifier.predict_with_tm_async(
+            create_mock_window("HELLO"), frames, session_id="cascade", ts=2))
+        assert pred["token"] == "THANKS" and tm_calls == [2]
+        print("  unsure prototype escalated to TM ✓")
+
+        after = (metrics.CASCADE_PROTOTYPE.value, metrics.CASCADE_POSENET.value,
+                 metrics.CASCADE_DISAGREE.value)
+        assert [a - b for a, b in zip(after, before)] == [1, 1, 1]
+        print("  per-stage decisions + agreement counted ✓")
+    finally:
+        (classifier._tm_available, classifier._predict_tm_async, settings.CASCADE,
+         settings.CASCADE_MIN_CONFIDENCE, settings.CASCADE_AUDIT_EVERY) = saved
+
+    print("✓ Cascade tests passed")
+
+
+def test_prob_fusion():
+    """Per-frame probability cache + window fusion."""
+    print("\n=== Test 10: TM Probability Fusion ===")
+
+    ring = ProbRing(4)
+    rows = np.eye(3, dtype=np.float32)[[0, 0, 1, 2, 2, 2]]   # 6 frames, classes 0,0,1,2,2,2
+    for r in rows:
+        ring.append(r)
+    latest = ring.latest()
+    assert np.array_equal(latest, rows[-4:]), "ring must keep the newest rows in order"
+    assert np.shares_memory(latest, ring._probs) and ring.nbytes == 2 * 4 * 3 * 4
+    print("  ring keeps newest rows as a contiguous view ✓")
+
+    assert np.allclose(fuse_probs(latest, "mean"), [0.0, 0.25, 0.75])
+    assert np.allclose(fuse_probs(latest, "max"), [0.0, 0.5, 0.5])
+    assert np.allclose(fuse_probs(latest, "last"), [0.0, 0.0, 1.0])
+    rec = fuse_probs(latest, "recency", decay=0.5)
+    assert np.isclose(rec.sum(), 1.0) and rec[2] > 0.75 > rec[1] > 0
+    print("  mean / max / last / recency fusion ✓")
+
+    saved = (settings.TM_FUSION, settings.CASCADE)
+    try:
+        settings.TM_FUSION, settings.CASCADE = "mean", False
+        assert fusion.active_method() == "mean"
+        settings.CASCADE = True
+        assert fusion.active_method() == "last"
+    finally:
+        settings.TM_FUSION, settings.CASCADE = saved
+    print("  fusion disabled while CASCADE=1 (no per-frame TM pass) ✓")
+
+    print("✓ Fusion tests passed")
+
+
+def test_fused_tm_graph():
+    """Fused PoseNet + sigmoid + concat + head graph vs the step-by-step path."""
+    print("\n=== Test 11: Fused TM Graph Parity ===")
+    if not classifier._check_tm_available():
+        print("  TM model files not present – skipped")
+        return
+    from app.recognition import tm_model
+    from app.recognition.tf_graph import TFBackend, features_from_outputs
+
+    tm_model._ensure_loaded()
+    backend = tm_model._backend
+    if not isinstance(backend, TFBackend):
+        print(f"  TM_BACKEND={backend.name} – fused TF graph not loaded, skipped")
+        return
+
+    rng = np.random.default_rng(11)
+    inputs = rng.integers(0, 256, (4, 257, 257, 3), dtype=np.uint8)
+    inputs[0] = 0                                   # black (padding-only) frame
+    fused = tm_model.input_probs(list(inputs))
+    ref = backend.reference_probs(inputs)
+    assert backend.probs_t is not None, "head must be fused into the graph"
+    assert fused.shape == ref.shape == (4, len(tm_model._tokens))
+    assert np.allclose(fused, ref, atol=1e-5), f"max diff {np.abs(fused - ref).max():.2e}"
+    assert np.array_equal(fused.argmax(axis=1), ref.argmax(axis=1))
+    print(f"  probabilities match (max diff {np.abs(fused - ref).max():.1e}) ✓")
+
+    feats = tm_model._posenet_features(inputs)
+    assert np.allclose(feats, features_from_outputs(*backend.raw_outputs(inputs)), atol=1e-6)
+    print("  in-graph sigmoid + channel concat match NumPy features ✓")
+
+    print("✓ Fused graph tests passed")
+
+
+def test_graph_cache():
+    """Cold build writes the cache, warm start loads it, source edits rebuild."""
+    print("\n=== Test 12: TM Graph Artifact Cache ===")
+    if not classifier._check_tm_available():
+        print("  TM model files not present – skipped")
+        return
+    import shutil
+    import tempfile
+    from pathlib import Path
+    from app.recognition import artifact_cache
+    from app.recognition.backends import METADATA_JSON
+    from app.recognition.tf_graph import TFBackend
+
+    tmp = Path(tempfile.mkdtemp(prefix="tm_cache_"))
+    try:
+        cold = TFBackend(use_cache=True, cache_dir=tmp)
+        assert not cold.from_cache and "graph_cache_store" in cold.load_times_ms
+        entries = [p for p in tmp.iterdir() if p.is_dir()]
+        assert len(entries) == 1 and (entries[0] / artifact_cache.GRAPH_FILE).exists()
+        print(f"  cold build cached as {entries[0].name} ✓")
+
+        warm = TFBackend(use_cache=True, cache_dir=tmp)
+        assert warm.from_cache and "posenet_load" not in warm.load_times_ms
+        rng = np.random.default_rng(12)
+        inputs = rng.integers(0, 256, (3, 257, 257, 3), dtype=np.uint8)
+        assert np.array_equal(warm.probs(inputs), cold.probs(inputs))
+        assert np.array_equal(warm.features(inputs), cold.features(inputs))
+        print(f"  warm start reuses it (cold {sum(cold.load_times_ms.values()):.0f} ms, "
+              f"warm {sum(warm.load_times_ms.values()):.0f} ms), identical outputs ✓")
+
+        # Any changed source byte gives a new key
+        meta = tmp / METADATA_JSON.name
+        shutil.copy(METADATA_JSON, meta)
+        key = artifact_cache.cache_key([meta])
+        assert artifact_cache.cache_key([meta]) == key
+        meta.write_bytes(meta.read_bytes() + b" ")
+        assert artifact_cache.cache_key([meta]) != key
+        assert artifact_cache.lookup("0" * 16, tmp) is None
+        print("  source edit changes the key, unknown key misses ✓")
+
+        saved_dir = tmp / "posenet_saved"
+        (saved_dir / "variables").mkdir(parents=True)
+        shutil.copy(artifact_cache.POSENET_SAVED / "saved_model.pb", saved_dir)
+        weights = saved_dir / "variables" / "variables.data-00000-of-00001"
+        weights.write_bytes(b"\x00" * 16)
+        orig_saved = artifact_cache.POSENET_SAVED
+        artifact_cache.POSENET_SAVED = saved_dir
+        try:
+            assert weights in artifact_cache.source_files()
+            key = artifact_cache.cache_key()
+            weights.write_bytes(b"\x01" * 16)
+            assert artifact_cache.cache_key() != key
+        finally:
+            artifact_cache.POSENET_SAVED = orig_saved
+        print("  SavedModel variables/ are part of the key ✓")
+    finally:
+        shutil.rmtree(tmp, ignore_errors=True)
+
+    print("✓ Graph cache tests passed")
+
+
+def test_batcher():
+    """Cross-session micro-batcher: routing, flush triggers, errors, parity."""
+    print("\n=== Test 13: TM Micro-Batcher ===")
+    import time
+    from app.recognition.batcher import InferenceBatcher
+
+    sizes = []
+
+    def times_ten(items):
+        sizes.append(len(items))
+        return [x * 10 for x in items]
+
+    async def run(batcher, items, delay=0.0):
+        async def one(x):
+            await asyncio.sleep(delay * x)
+            return await batcher.submit(x)
+        return await asyncio.gather(*(one(x) for x in items))
+
+    batcher = InferenceBatcher(times_ten, max_batch=3, window_ms=10_000)
+    t0 = time.perf_counter()
+    assert asyncio.run(run(batcher, [1, 2, 3])) == [10, 20, 30]
+    assert sizes == [3] and time.perf_counter() - t0 < 1.0
+    print("  full batch flushes at max_batch without waiting for the window ✓")
+
+    sizes.clear()
+    batcher = InferenceBatcher(times_ten, max_batch=8, window_ms=20)
+    t0 = time.perf_counter()
+    assert asyncio.run(run(batcher, [4, 5])) == [40, 50]
+    assert sizes == [2] and time.perf_counter() - t0 >= 0.02
+    print("  partial batch flushes when the window expires ✓")
+
+    sizes.clear()
+    batcher = InferenceBatcher(times_ten, max_batch=3, window_ms=20)
+    assert asyncio.run(run(batcher, list(range(7)))) == [x * 10 for x in range(7)]
+    assert sizes == [3, 3, 1] and batcher.batches == 3 and batcher.items == 7
+    assert not batcher._tasks and batcher._timer is None
+    print("  each submitter gets its own result across batches; tasks released ✓")
+
+    def broken(items):
+        raise ValueError("model down")
+
+    batcher = InferenceBatcher(broken, max_batch=2, window_ms=5)
+
+    async def failing():
+        return await asyncio.gather(batcher.submit(1), batcher.submit(2), return_exceptions=True)
+
+    assert all(isinstance(r, ValueError) for r in asyncio.run(failing()))
+    print("  inference errors reach every submitter ✓")
+
+    if not classifier._check_tm_available():
+        print("  TM model files not present – parity check skipped")
+        return
+    from app.recognition import tm_model
+
+    rng = np.random.default_rng(13)
+    inputs = list(rng.integers(0, 256, (5, 257, 257, 3), dtype=np.uint8))
+    batcher = InferenceBatcher(tm_model.input_probs, max_batch=4, window_ms=5)
+
+    async def batched():
+        return await asyncio.gather(*(batcher.submit(x) for x in inputs))
+
+    got = asyncio.run(batched())
+    ref = [tm_model.input_probs([x])[0] for x in inputs]
+    assert batcher.batches == 2
+    assert all(np.allclose(g, r, atol=1e-5) for g, r in zip(got, ref))
+    print("  batched TM probabilities match unbatched ones ✓")
+
+    print("✓ Batcher tests passed")
+
+
 # ── main ──────────────────────────────────────────────────────────────────
 
 def main():
@@ -299,6 +792,13 @@ def main():
         test_feature_separation()
         test_smoothing()
         test_member4_contract()
+        test_vectorized_parity()
+        test_incremental_features()
+        test_cascade()
+        test_prob_fusion()
+        test_fused_tm_graph()
+        test_graph_cache()
+        test_batcher()
 
         print("\n" + "=" * 55)
         print("✓ All tests passed!")
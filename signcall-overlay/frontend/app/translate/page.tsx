@@ -14,7 +14,15 @@ export default function TranslatePage() {
   const [isLoadingCamera, setIsLoadingCamera] = useState(false);
   const [captionSize, setCaptionSize] = useState(24);
 
-  const { connection, latestCaption, connect, disconnect, sendFrame } = useSignBridgeWS();
+  const {
+    connection,
+    latestCaption,
+    connect,
+    disconnect,
+    binaryFrames,
+    sendFrame,
+    sendFrameBytes,
+  } = useSignBridgeWS();
 
   // Frame capture loop: capture JPEG from video at ~8 FPS and send to backend
   useEffect(() => {
@@ -33,9 +41,20 @@ export default function TranslatePage() {
         const ctx = canvas.getContext("2d");
         if (ctx) {
           ctx.drawImage(v, 0, 0, canvas.width, canvas.height);
-          const dataUrl = canvas.toDataURL("image/jpeg", 0.7);
-          const b64 = dataUrl.split(",")[1] || "";
-          if (b64) sendFrame(b64);
+          if (binaryFrames) {
+            // binary-v1: raw JPEG bytes, no base64 / JSON overhead
+            canvas.toBlob(
+              (blob) => {
+                if (blob) blob.arrayBuffer().then((buf) => sendFrameBytes(buf));
+              },
+              "image/jpeg",
+              0.7,
+            );
+          } else {
+            const dataUrl = canvas.toDataURL("image/jpeg", 0.7);
+            const b64 = dataUrl.split(",")[1] || "";
+            if (b64) sendFrame(b64);
+          }
         }
       }
       setTimeout(tick, intervalMs);
@@ -43,7 +62,7 @@ export default function TranslatePage() {
 
     tick();
     return () => { alive = false; };
-  }, [isRecording, connection.status, sendFrame]);
+  }, [isRecording, connection.status, binaryFrames, sendFrame, sendFrameBytes]);
 
   // Start camera stream
   const getCamera = async () => {
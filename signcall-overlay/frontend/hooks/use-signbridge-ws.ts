@@ -20,6 +20,45 @@ export interface ConnectionState {
 const WS_URL =
   process.env.NEXT_PUBLIC_WS_URL || "ws://localhost:8000/ws";
 
+// binary-v1 frame protocol — must match backend/app/schemas/binary.py
+const BINARY_PROTOCOL = "binary-v1";
+const BINARY_VERSION = 1;
+const KIND_FRAME = 1;
+const HEADER_SIZE = 16;
+const textEncoder = new TextEncoder();
+
+function encodeBinaryFrame(
+  session: string,
+  user: string,
+  ts: number,
+  style: "concise" | "detailed",
+  jpeg: ArrayBuffer,
+): ArrayBuffer {
+  const sessionBytes = textEncoder.encode(session);
+  const userBytes = textEncoder.encode(user);
+  const buf = new ArrayBuffer(
+    HEADER_SIZE + sessionBytes.length + userBytes.length + jpeg.byteLength,
+  );
+  const view = new DataView(buf);
+  view.setUint8(0, BINARY_VERSION);
+  view.setUint8(1, KIND_FRAME);
+  view.setUint8(2, style === "detailed" ? 1 : 0);
+  view.setUint8(3, 0);
+  // i64 little-endian ts, written as two 32-bit halves (ms fits in 53 bits)
+  view.setUint32(4, ts % 2 ** 32, true);
+  view.setInt32(8, Math.floor(ts / 2 ** 32), true);
+  view.setUint16(12, sessionBytes.length, true);
+  view.setUint16(14, userBytes.length, true);
+  const bytes = new Uint8Array(buf);
+  bytes.set(sessionBytes, HEADER_SIZE);
+  bytes.set(userBytes, HEADER_SIZE + sessionBytes.length);
+  bytes.set(
+    new Uint8Array(jpeg),
+    HEADER_SIZE + sessionBytes.length + userBytes.length,
+  );
+  return buf;
+}
+
 export function useSignBridgeWS() {
   const wsRef = useRef<WebSocket | null>(null);
   const [connection, setConnection] = useState<ConnectionState>({
@@ -29,6 +68,7 @@ export function useSignBridgeWS() {
   const [latestCaption, setLatestCaption] = useState<CaptionMessage | null>(
     null,
   );
+  const [binaryFrames, setBinaryFrames] = useState(false);
 
   const connect = useCallback(() => {
     if (wsRef.current?.readyState === WebSocket.OPEN) return;
@@ -39,14 +79,19 @@ export function useSignBridgeWS() {
       const ws = new WebSocket(WS_URL);
       wsRef.current = ws;
 
+      ws.binaryType = "arraybuffer";
+
       ws.onopen = () => {
         setConnection({ status: "connected" });
+        ws.send(JSON.stringify({ type: "hello", protocols: [BINARY_PROTOCOL] }));
       };
 
       ws.onmessage = (event) => {
         try {
           const data = JSON.parse(event.data);
-          if (data.type === "caption") {
+          if (data.type === "hello") {
+            setBinaryFrames(data.protocol === BINARY_PROTOCOL);
+          } else if (data.type === "caption") {
             const caption: CaptionMessage = {
               type: "caption",
               caption: data.caption || "",
@@ -70,6 +115,7 @@ export function useSignBridgeWS() {
 
       ws.onclose = () => {
         setConnection({ status: "disconnected" });
+        setBinaryFrames(false);
         wsRef.current = null;
       };
     } catch {
@@ -101,6 +147,44 @@ export function useSignBridgeWS() {
     }
   }, []);
 
+  const sendFrameBytes = useCallback(
+    (jpeg: ArrayBuffer, style: "concise" | "detailed" = "concise") => {
+      if (wsRef.current?.readyState === WebSocket.OPEN) {
+        wsRef.current.send(
+          encodeBinaryFrame("room1", "signerA", Date.now(), style, jpeg),
+        );
+      }
+    },
+    [],
+  );
+
+  // For clients that run MediaPipe in the browser: the server skips
+  // image decode and its own landmark extraction.
+  const sendLandmarks = useCallback(
+    (
+      hands: number[][][] | null,
+      handedness: ("Left" | "Right")[] | null,
+      pose: number[][] | null,
+      style: "concise" | "detailed" = "concise",
+    ) => {
+      if (wsRef.current?.readyState === WebSocket.OPEN) {
+        wsRef.current.send(
+          JSON.stringify({
+            type: "landmarks",
+            session: "room1",
+            user: "signerA",
+            ts: Date.now(),
+            hands,
+            handedness,
+            pose,
+            style,
+          }),
+        );
+      }
+    },
+    [],
+  );
+
   const sendCorrection = useCallback(
     (incorrectToken: string, correctToken: string) => {
       if (wsRef.current?.readyState === WebSocket.OPEN) {
@@ -131,7 +215,10 @@ export function useSignBridgeWS() {
     latestCaption,
     connect,
     disconnect,
+    binaryFrames,
     sendFrame,
+    sendFrameBytes,
+    sendLandmarks,
     sendCorrection,
   };
 }